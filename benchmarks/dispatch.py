@@ -0,0 +1,94 @@
+# Usage: python -m benchmarks.dispatch
+# Runs examples/for_while_loop.nkt style loops with the visit method looked up by name on
+# every node, the way Interpreter.visit used to, and with the dispatch table. Reports the
+# time per visited node of the whole run and of finding the method alone.
+from time import perf_counter
+from components.wrapper import parse, global_symbol_table
+from components.resolver import Resolver
+from components.interpreter import Interpreter, debug_message
+from components.context import Context
+
+REPEATS = 5
+
+SCRIPT = """
+var i = 0
+var numbers = for i = 0 ; 5000 { i += 1 }
+
+i = 0
+numbers = []
+
+while i < 200 {
+    i += 1
+    ListAppend(numbers, i)
+}
+"""
+
+class NameDispatchInterpreter(Interpreter):
+    def evaluate(self, node, context):
+        method_name = f'visit_{type(node).__name__}'
+        debug_message.set_message(f"VISIT: {method_name}")
+        method = getattr(self, method_name, self.no_visit_method)
+
+        return method(node, context)
+
+class RecordingInterpreter(Interpreter):
+    visited = []
+
+    def evaluate(self, node, context):
+        RecordingInterpreter.visited.append(node)
+        return super().evaluate(node, context)
+
+def find_by_name(interpreter: Interpreter, nodes: list):
+    for node in nodes:
+        method_name = f'visit_{type(node).__name__}'
+        debug_message.set_message(f"VISIT: {method_name}")
+        getattr(interpreter, method_name, interpreter.no_visit_method)
+
+def find_in_table(interpreter: Interpreter, nodes: list):
+    dispatch = interpreter.dispatch
+    for node in nodes:
+        dispatch.get(type(node))
+
+def run(interpreter: Interpreter):
+    node, error = parse("<bench>", SCRIPT)
+    if error: raise Exception(error.as_string())
+
+    context = Context("<Bench>")
+    context.symbol_table = global_symbol_table.copy()
+    Resolver().resolve(node, context.symbol_table)
+
+    start = perf_counter()
+    res = interpreter.visit(node, context)
+    elapsed = perf_counter() - start
+
+    if res.error: raise Exception(res.error.as_string())
+    return elapsed
+
+def bench(interpreter: Interpreter) -> float:
+    return min(run(interpreter) for _ in range(REPEATS))
+
+def bench_find(find, interpreter: Interpreter, nodes: list) -> float:
+    best = None
+
+    for _ in range(REPEATS):
+        start = perf_counter()
+        find(interpreter, nodes)
+        elapsed = perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    return best
+
+def main():
+    run(RecordingInterpreter())
+    nodes = RecordingInterpreter.visited
+
+    print(f"{len(nodes)} nodes visited per run")
+    print(f"{'dispatch':>10} {'run ms':>8} {'ns/node':>8} {'find ns/node':>13}")
+
+    for name, interpreter, find in (("by name", NameDispatchInterpreter(), find_by_name), ("table", Interpreter(), find_in_table)):
+        elapsed = bench(interpreter)
+        find_elapsed = bench_find(find, interpreter, nodes)
+        print(f"{name:>10} {elapsed * 1e3:>8.1f} {elapsed / len(nodes) * 1e9:>8.0f} {find_elapsed / len(nodes) * 1e9:>13.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# Usage: python -m benchmarks.engines
+# Runs the same CPU-bound scripts on every engine and reports the best time of each,
+# every engine must print the same result.
+from time import perf_counter
+from components.wrapper import run
+
+ENGINES = ("tree", "vm", "closure")
+REPEATS = 3
+
+SCRIPTS = {
+    "loop": """
+var total = 0
+for i = 0 ; 20000 {
+    total += i * 2
+}
+total
+""",
+    "calls": """
+func Fib(n) {
+    if n < 2 { return n }
+    return Fib(n - 1) + Fib(n - 2)
+}
+Fib(16)
+""",
+    "while": """
+var i = 0
+var evens = 0
+while i < 10000 {
+    i += 1
+    if i % 2 == 0 { continue }
+    evens += 1
+}
+evens
+""",
+}
+
+def bench(script: str, engine: str):
+    best = None
+    result = None
+
+    for _ in range(REPEATS):
+        start = perf_counter()
+        value, error, _ = run("<bench>", script, "<Bench>", isolated_symbol_table=True, engine=engine)
+        elapsed = perf_counter() - start
+
+        if error: raise Exception(error.as_string())
+        result = repr(value)
+        best = elapsed if best is None else min(best, elapsed)
+
+    return best, result
+
+def main():
+    print(f"{'script':>8} " + " ".join(f"{engine + ' ms':>10}" for engine in ENGINES) + f" {'result':>10}")
+
+    for name, script in SCRIPTS.items():
+        timings = [bench(script, engine) for engine in ENGINES]
+        results = {result for _, result in timings}
+
+        if len(results) != 1:
+            raise Exception(f"Engines disagree on '{name}': {results}")
+
+        print(f"{name:>8} " + " ".join(f"{elapsed * 1e3:>10.1f}" for elapsed, _ in timings) + f" {results.pop():>10}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# Usage: python -m benchmarks.generators
+# Runs the same filter-and-map pipeline over generated records on every engine, once with generator
+# functions passing one record at a time and once with functions building and returning lists.
+# The peak memory of the generators stays the same however many records go through them.
+from tracemalloc import start as trace_start, stop as trace_stop, get_traced_memory
+from components.wrapper import run
+from benchmarks.engines import ENGINES, bench
+
+RECORDS = 20000
+
+SCRIPTS = {
+    "generators": f"""
+func Records(n) {{
+    for i = 0 ; n {{ yield i * 3 }}
+}}
+func Valid(records) {{
+    for r in records {{
+        if r % 2 == 0 {{ yield r }}
+    }}
+}}
+var total = 0
+for r in Valid(Records({RECORDS})) {{
+    total += r
+}}
+total
+""",
+    "lists": f"""
+func Records(n) {{
+    var out = []
+    for i = 0 ; n {{ ListAppend(out, i * 3) }}
+    return out
+}}
+func Valid(records) {{
+    var out = []
+    for r in records {{
+        if r % 2 == 0 {{ ListAppend(out, r) }}
+    }}
+    return out
+}}
+var total = 0
+for r in Valid(Records({RECORDS})) {{
+    total += r
+}}
+total
+""",
+}
+
+def peak_memory(script: str):
+    trace_start()
+    value, error, _ = run("<bench>", script, "<Bench>", isolated_symbol_table=True, engine="tree")
+    _, peak = get_traced_memory()
+    trace_stop()
+
+    if error: raise Exception(error.as_string())
+    return peak
+
+def main():
+    print(f"{'script':>10} " + " ".join(f"{engine + ' ms':>10}" for engine in ENGINES) + f" {'peak KB':>10} {'result':>16}")
+
+    for name, script in SCRIPTS.items():
+        timings = [bench(script, engine) for engine in ENGINES]
+        results = {result for _, result in timings}
+
+        if len(results) != 1:
+            raise Exception(f"Engines disagree on '{name}': {results}")
+
+        print(f"{name:>10} " + " ".join(f"{elapsed * 1e3:>10.1f}" for elapsed, _ in timings) + f" {peak_memory(script) / 1024:>10.0f} {results.pop():>16}")
+
+if __name__ == "__main__":
+    main()
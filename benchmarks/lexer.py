@@ -0,0 +1,54 @@
+# Usage: python -m benchmarks.lexer
+# Lexes large generated scripts, tens of thousands of lines like the generated ones we run,
+# and reports the best throughput of each in MB/s.
+from time import perf_counter
+from components.lexer import Lexer
+
+REPEATS = 3
+LINES = 50000
+
+def code_line(i: int) -> str:
+    return [
+        f"var value_{i} = {i} * 2 + {i}.5 / (3 - value_{i - 1})",
+        f"func Function_{i}(a, b) -> a ** b %= {i}",
+        f"if value_{i} >= {i} && value_{i} != 0 {{ Print(value_{i}) }} else if value_{i} <= 1 {{ continue }}",
+        f"for i = 0 ; {i} {{ ListAppend(numbers, [i, i -> {i}]) }}",
+    ][i % 4]
+
+def string_line(i: int) -> str:
+    return f'Print("Line {i} of the script\\twith an \\"escaped\\" string\\n")'
+
+def comment_line(i: int) -> str:
+    return f"# Comment {i}, skipped up to the end of the line" if i % 10 else f"### Block\ncomment {i} ###"
+
+SOURCES = {
+    "code": code_line,
+    "strings": string_line,
+    "comments": comment_line,
+}
+
+def bench(text: str):
+    best = None
+
+    for _ in range(REPEATS):
+        start = perf_counter()
+        tokens, error = Lexer("<bench>", text, False).make_tokens()
+        elapsed = perf_counter() - start
+
+        if error: raise Exception(error.as_string())
+        best = elapsed if best is None else min(best, elapsed)
+
+    return best, len(tokens)
+
+def main():
+    print(f"{'source':>10} {'MB':>6} {'tokens':>8} {'ms':>8} {'MB/s':>6}")
+
+    for name, line in SOURCES.items():
+        text = "\n".join(line(i) for i in range(1, LINES + 1))
+        megabytes = len(text.encode("utf-8")) / 1e6
+
+        elapsed, token_count = bench(text)
+        print(f"{name:>10} {megabytes:>6.2f} {token_count:>8} {elapsed * 1e3:>8.0f} {megabytes / elapsed:>6.2f}")
+
+if __name__ == "__main__":
+    main()
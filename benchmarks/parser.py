@@ -0,0 +1,63 @@
+# Usage: python -m benchmarks.parser
+# Parses generated scripts of growing length and reports the best parse time of each, the time
+# per line should stay the same as scripts get longer since every token is only parsed once.
+from time import perf_counter
+from components.lexer import Lexer
+from components.parser import Parser
+
+REPEATS = 3
+LINE_COUNTS = (2500, 5000, 10000, 20000)
+
+def code_block(i: int) -> str:
+    return f"""func Function_{i}(a, b: Int = 2) {{
+    var value = a * {i} + b
+    if value > {i} && not b {{
+        value -= 1
+    }} else if value == 0 {{ return null }} else {{
+        value += 1
+    }}
+    for j = 0 ; b {{ value += j }}
+    return value
+}}
+var list_{i} = [Function_{i}({i}, 2), "item {i}", {i}.5]
+list_{i} = list_{i} + (-{i} ** 2) / 3"""
+
+def script(line_count: int) -> str:
+    blocks = []
+    lines = 0
+
+    while lines < line_count:
+        block = code_block(len(blocks))
+        blocks.append(block)
+        lines += block.count("\n") + 1
+
+    return "\n".join(blocks)
+
+def bench(text: str):
+    best = None
+
+    for _ in range(REPEATS):
+        tokens, error = Lexer("<bench>", text, False).make_tokens()
+        if error: raise Exception(error.as_string())
+
+        start = perf_counter()
+        ast = Parser(tokens).parse()
+        elapsed = perf_counter() - start
+
+        if ast.error: raise Exception(ast.error.as_string())
+        best = elapsed if best is None else min(best, elapsed)
+
+    return best, len(tokens)
+
+def main():
+    print(f"{'lines':>8} {'tokens':>8} {'ms':>8} {'us/line':>8}")
+
+    for line_count in LINE_COUNTS:
+        text = script(line_count)
+        lines = text.count("\n") + 1
+
+        elapsed, token_count = bench(text)
+        print(f"{lines:>8} {token_count:>8} {elapsed * 1e3:>8.0f} {elapsed * 1e6 / lines:>8.1f}")
+
+if __name__ == "__main__":
+    main()
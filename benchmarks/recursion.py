@@ -0,0 +1,39 @@
+# Usage: python -m benchmarks.recursion
+# Runs recursive calls and nested expressions far deeper than Python's recursion limit on the VM,
+# which calls functions and walks expressions on its own stacks. The time per level should stay the
+# same as they get deeper.
+from time import perf_counter
+from components.wrapper import run
+
+DEPTHS = (1000, 10000, 100000)
+
+SCRIPTS = {
+    "calls": lambda depth: f"""
+func Count(n) {{
+    if n == 0 {{ return 0 }}
+    return 1 + Count(n - 1)
+}}
+Count({depth})
+""",
+    "chain": lambda depth: " + ".join(["1"] * depth),
+    "parens": lambda depth: "(" * depth + str(depth) + ")" * depth,
+}
+
+def bench(script: str):
+    start = perf_counter()
+    value, error, _ = run("<bench>", script, "<Bench>", isolated_symbol_table=True, engine="vm")
+    elapsed = perf_counter() - start
+
+    if error: raise Exception(error.as_string())
+    return elapsed, repr(value.elements[-1])
+
+def main():
+    print(f"{'script':>8} {'depth':>8} {'ms':>8} {'us/level':>8} {'result':>8}")
+
+    for name, script in SCRIPTS.items():
+        for depth in DEPTHS:
+            elapsed, result = bench(script(depth))
+            print(f"{name:>8} {depth:>8} {elapsed * 1e3:>8.0f} {elapsed * 1e6 / depth:>8.1f} {result:>8}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+# Usage: python -m benchmarks.short_circuit
+# Runs hot loops guarded by && and || on every engine. The right side of a guard is an expensive
+# call that only runs when the left side doesn't decide the result, once every 100 iterations here.
+from benchmarks.engines import ENGINES, bench
+
+EXPENSIVE = """
+func Expensive(n) {
+    var total = 1
+    for j = 0 ; 50 { total += j }
+    return total + n
+}
+var hits = 0
+"""
+
+SCRIPTS = {
+    "and": EXPENSIVE + """
+for i = 0 ; 20000 {
+    if i % 100 == 0 && Expensive(i) > 0 { hits += 1 }
+}
+hits
+""",
+    "or": EXPENSIVE + """
+for i = 0 ; 20000 {
+    if i % 100 != 0 || Expensive(i) < 0 { hits += 1 }
+}
+hits
+""",
+    "while": EXPENSIVE + """
+var i = 0
+while i < 20000 && (i % 100 != 0 || Expensive(i) > 0) {
+    i += 1
+    hits += 1
+}
+hits
+""",
+}
+
+def main():
+    print(f"{'script':>8} " + " ".join(f"{engine + ' ms':>10}" for engine in ENGINES) + f" {'result':>16}")
+
+    for name, script in SCRIPTS.items():
+        timings = [bench(script, engine) for engine in ENGINES]
+        results = {result for _, result in timings}
+
+        if len(results) != 1:
+            raise Exception(f"Engines disagree on '{name}': {results}")
+
+        print(f"{name:>8} " + " ".join(f"{elapsed * 1e3:>10.1f}" for elapsed, _ in timings) + f" {results.pop():>16}")
+
+if __name__ == "__main__":
+    main()
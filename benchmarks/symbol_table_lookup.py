@@ -0,0 +1,41 @@
+# Usage: python -m benchmarks.symbol_table_lookup
+# Looks up a name defined in the outermost scope from 1..30 nested scopes,
+# the cost per lookup should grow linearly with the depth.
+from time import perf_counter
+from components.symbol_table import SymbolTable
+from components.datatypes.all import Number
+
+MAX_DEPTH = 30
+LOOKUPS = 2000
+REPEATS = 5
+
+def make_nested_symbol_table(depth: int) -> SymbolTable:
+    symbol_table = SymbolTable()
+    symbol_table.set("target", Number(1), Number)
+    
+    for _ in range(depth):
+        symbol_table = SymbolTable(symbol_table)
+        
+    return symbol_table
+
+def bench_lookup(depth: int) -> float:
+    symbol_table = make_nested_symbol_table(depth)
+    best = None
+    
+    for _ in range(REPEATS):
+        start = perf_counter()
+        for _ in range(LOOKUPS):
+            symbol_table.get("target")
+        elapsed = perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+        
+    return best / LOOKUPS
+
+def main():
+    print(f"{'depth':>5} {'us/lookup':>10}")
+    
+    for depth in range(1, MAX_DEPTH + 1):
+        print(f"{depth:>5} {bench_lookup(depth) * 1e6:>10.2f}")
+
+if __name__ == "__main__":
+    main()
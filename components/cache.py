@@ -0,0 +1,58 @@
+from os import listdir, makedirs, remove
+from os.path import basename, dirname, join, exists, getmtime
+from hashlib import sha256
+from importlib.util import MAGIC_NUMBER
+
+# Files derived from a script are kept in a __nktcache__ folder next to it, named after the
+# script and the hash of its source, so an edited script never picks up a stale entry.
+# Every entry starts with the Python magic number, entries of another Python are ignored.
+
+CACHE_DIR_NAME = "__nktcache__"
+
+def source_hash(text: str) -> str:
+    return sha256(text.encode("utf-8")).hexdigest()
+
+def script_stem(path: str) -> str:
+    return basename(path).removesuffix(".nkt")
+
+def cache_dir(path: str) -> str:
+    return join(dirname(path), CACHE_DIR_NAME)
+
+def cache_file(path: str, text: str, extension: str) -> str:
+    return join(cache_dir(path), f"{script_stem(path)}.{source_hash(text)[:16]}.{extension}")
+
+def read_cache(file: str) -> bytes:
+    try:
+        with open(file, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+
+    if not data.startswith(MAGIC_NUMBER):
+        return None
+
+    return data[len(MAGIC_NUMBER):]
+
+def write_cache(file: str, data: bytes):
+    # The cache is only an optimization, failing to write it isn't an error
+    try:
+        makedirs(dirname(file), exist_ok=True)
+        with open(file, "wb") as f:
+            f.write(MAGIC_NUMBER + data)
+    except OSError:
+        pass
+
+def clear_cache(path: str, extension: str, older_than: float = None):
+    # Removes the entries of every older version of the script, or only the ones written before older_than
+    directory = cache_dir(path)
+    if not exists(directory): return
+
+    prefix, suffix = f"{script_stem(path)}.", f".{extension}"
+    for name in listdir(directory):
+        hash_part = name[len(prefix):-len(suffix)]
+        if name.startswith(prefix) and name.endswith(suffix) and len(hash_part) == 16 and "." not in hash_part:
+            try:
+                if older_than is None or getmtime(join(directory, name)) < older_than:
+                    remove(join(directory, name))
+            except OSError:
+                pass
@@ -0,0 +1,386 @@
+from .node import (Node, NumberNode, StringNode, ClassNode,
+                   ListNode, BlockNode, VarAccessNode, VarAssignNode, VarReassignNode,
+                   BinOpNode, LogicalOpNode, UnaryOpNode, IfNode, ForNode, ForEachNode, WhileNode,
+                   FuncDefNode, CallNode, ReturnNode, ContinueNode, BreakNode)
+from .datatypes.all import Value, Number, String, List, Null, Class
+from .context import Context
+from .symbol_table import SymbolTable
+from .token import TokenType
+from .interpreter import Interpreter, SHORT_CIRCUITS, binary_operation_name, binary_operation, located, call_value, iterate
+from .runtime import RunTimeResult, RunTimeSignal, ErrorSignal, ReturnSignal, ContinueSignal, BreakSignal
+from .error import RunTimeError
+from .utils.strings_template import IS_NOT_DEFINED_ERROR
+
+# Walks the AST once and turns every node into a Python closure taking the context and
+# returning the node's value. Errors, returns, continues and breaks are raised as signals,
+# so nothing is dispatched by name and no RunTimeResult is made per node while running.
+# Values, assignments and errors go through the same code as the tree walker.
+
+def compile_body(node: Node):
+    # Function bodies are compiled once and kept on their node
+    closure = getattr(node, "closure", None)
+    if closure is None:
+        closure = node.closure = ClosureCompiler().compile(node)
+    return closure
+
+def run_closure(closure, context: Context) -> RunTimeResult:
+    try:
+        return RunTimeResult().success(closure(context))
+    except RunTimeSignal as signal:
+        return signal.as_result()
+
+def run_body(node: Node, context: Context) -> RunTimeResult:
+    return run_closure(compile_body(node), context)
+
+def not_defined(node: Node, context: Context):
+    raise ErrorSignal(RunTimeError(
+        node.pos_start, node.pos_end,
+        IS_NOT_DEFINED_ERROR.format(node.var_name_tok.value),
+        context
+    ))
+
+class ClosureCompiler:
+    def __init__(self):
+        self.interpreter = Interpreter()
+
+    def compile(self, node: Node):
+        method_name = f'compile_{type(node).__name__}'
+        method = getattr(self, method_name, self.no_compile_method)
+
+        return method(node)
+
+    def no_compile_method(self, node: Node):
+        # Nodes without a closure are run by the tree walker
+        interpreter = self.interpreter
+
+        def interpret(context: Context):
+            res = interpreter.visit(node, context)
+            if res.should_return(): res.raise_signal()
+            return res.value
+
+        return interpret
+
+    ###################################
+
+    def compile_NumberNode(self, node: NumberNode):
+        value, pos_start, pos_end = node.tok.value, node.pos_start, node.pos_end
+
+        def number(context: Context):
+            return Number(value).set_context(context).set_pos(pos_start, pos_end)
+
+        return number
+
+    def compile_StringNode(self, node: StringNode):
+        value, pos_start, pos_end = node.tok.value, node.pos_start, node.pos_end
+
+        def string(context: Context):
+            return String(value).set_context(context).set_pos(pos_start, pos_end)
+
+        return string
+
+    def compile_ListNode(self, node: ListNode):
+        element_closures = [self.compile(element_node) for element_node in node.element_nodes]
+        pos_start, pos_end = node.pos_start, node.pos_end
+
+        def list_(context: Context):
+            return List([element(context) for element in element_closures]).set_context(context).set_pos(pos_start, pos_end)
+
+        return list_
+
+    def compile_BlockNode(self, node: BlockNode):
+        statement_closures = [self.compile(statement_node) for statement_node in node.statement_nodes]
+        pos_start, pos_end = node.pos_start, node.pos_end
+
+        if node.should_return_null:
+            def statements(context: Context):
+                for statement in statement_closures:
+                    statement(context)
+                return Null.null
+
+            return statements
+
+        def block(context: Context):
+            return List([statement(context) for statement in statement_closures]).set_context(context).set_pos(pos_start, pos_end)
+
+        return block
+
+    def compile_VarAccessNode(self, node: VarAccessNode):
+        name = node.var_name_tok.value
+
+        if node.address is not None and node.address[0] == 0:
+            slot = node.address[1]
+
+            def load_slot(context: Context):
+                symbol_table = context.symbol_table
+                entry = symbol_table.frame[slot]
+                if entry is None or entry[2] == "temporary_symbols":
+                    value = symbol_table.lookup(name)
+                    if value is None: not_defined(node, context)
+                else:
+                    value = entry[0]
+
+                return value
+
+            return load_slot
+
+        def load_name(context: Context):
+            value = context.symbol_table.lookup(name)
+            if value is None: not_defined(node, context)
+
+            return value
+
+        return load_name
+
+    def compile_VarAssignNode(self, node: VarAssignNode):
+        value_closure = self.compile(node.value_node)
+        var_assign = self.interpreter._var_assign
+
+        def assign(context: Context):
+            res = var_assign(node, context, value_closure(context))
+            if res.error: raise ErrorSignal(res.error)
+            return res.value
+
+        return assign
+
+    def compile_VarReassignNode(self, node: VarReassignNode):
+        value_closure = self.compile(node.value_node)
+        var_reassign_target = self.interpreter._var_reassign_target
+        var_reassign = self.interpreter._var_reassign
+
+        def reassign(context: Context):
+            res = var_reassign_target(node, context)
+            if res.error: raise ErrorSignal(res.error)
+
+            res = var_reassign(node, context, res.value, value_closure(context))
+            if res.error: raise ErrorSignal(res.error)
+            return res.value
+
+        return reassign
+
+    def compile_BinOpNode(self, node: BinOpNode):
+        left_closure = self.compile(node.left_node)
+        left_node, right_node = node.left_node, node.right_node
+        pos_start, pos_end = node.pos_start, node.pos_end
+
+        if node.op_tok.type == TokenType.DOT:
+            def dot(context: Context):
+                result, error = located(left_closure(context), left_node, context).dotted(right_node)
+                if error: raise ErrorSignal(error)
+                return result.set_pos(pos_start, pos_end)
+
+            return dot
+
+        right_closure = self.compile(node.right_node)
+        method_name = binary_operation_name(node.op_tok)
+
+        def binary(context: Context):
+            result, error = binary_operation(left_closure(context), right_closure(context), method_name, left_node, right_node, context)
+            if error: raise ErrorSignal(error)
+            return result.set_pos(pos_start, pos_end)
+
+        return binary
+
+    def compile_LogicalOpNode(self, node: LogicalOpNode):
+        left_closure = self.compile(node.left_node)
+        right_closure = self.compile(node.right_node)
+        left_node, right_node = node.left_node, node.right_node
+        short_circuit, method_name = SHORT_CIRCUITS[node.op_tok.value], binary_operation_name(node.op_tok)
+        pos_start, pos_end = node.pos_start, node.pos_end
+
+        def logical(context: Context):
+            left = left_closure(context)
+            result = getattr(left, short_circuit)()
+
+            if result is None:
+                result, error = binary_operation(left, right_closure(context), method_name, left_node, right_node, context)
+                if error: raise ErrorSignal(error)
+
+            return result.set_pos(pos_start, pos_end)
+
+        return logical
+
+    def compile_UnaryOpNode(self, node: UnaryOpNode):
+        operand_closure = self.compile(node.node)
+        unary_operation = self.interpreter._unary_operation
+        pos_start, pos_end = node.pos_start, node.pos_end
+
+        def unary(context: Context):
+            result, error = unary_operation(node, operand_closure(context), context)
+            if error: raise ErrorSignal(error)
+            return result.set_pos(pos_start, pos_end)
+
+        return unary
+
+    def compile_IfNode(self, node: IfNode):
+        cases = [(self.compile(condition), self.compile(expr), should_return_null) for condition, expr, should_return_null in node.cases]
+        else_case = (self.compile(node.else_case[0]), node.else_case[1]) if node.else_case else None
+
+        def if_(context: Context):
+            for condition, expr, should_return_null in cases:
+                if condition(context).is_true():
+                    expr_value = expr(context)
+                    return Null.null if should_return_null else expr_value
+
+            if else_case:
+                expr, should_return_null = else_case
+                expr_value = expr(context)
+                return Null.null if should_return_null else expr_value
+
+            return Null.null
+
+        return if_
+
+    def compile_ForNode(self, node: ForNode):
+        start_closure = self.compile(node.start_value_node)
+        end_closure = self.compile(node.end_value_node)
+        step_closure = self.compile(node.step_value_node) if node.step_value_node else None
+        body_closure = self.compile(node.body_node)
+        var_name, var_address = node.var_name_tok.value, node.var_address
+        should_return_null, pos_start, pos_end = node.should_return_null, node.pos_start, node.pos_end
+
+        def for_(context: Context):
+            elements = None if should_return_null else []
+
+            i = start_closure(context).value
+            end = end_closure(context).value
+            step = step_closure(context).value if step_closure else 1
+
+            symbol_table = context.symbol_table
+
+            while (i < end) if step >= 0 else (i > end):
+                if var_address is not None:
+                    symbol_table.set_slot(*var_address, var_name, Number(i), Number)
+                else:
+                    symbol_table.set(var_name, Number(i), Number)
+                i += step
+
+                try:
+                    value = body_closure(context)
+                except ContinueSignal:
+                    continue
+                except BreakSignal:
+                    break
+
+                if elements is not None: elements.append(value)
+
+            return Null.null if should_return_null else List(elements).set_context(context).set_pos(pos_start, pos_end)
+
+        return for_
+
+    def compile_ForEachNode(self, node: ForEachNode):
+        iterable_closure = self.compile(node.iterable_node)
+        body_closure = self.compile(node.body_node)
+        var_name, var_address = node.var_name_tok.value, node.var_address
+        should_return_null, pos_start, pos_end = node.should_return_null, node.pos_start, node.pos_end
+
+        def for_each(context: Context):
+            elements = None if should_return_null else []
+
+            iterator, error = iterate(iterable_closure(context), node, context)
+            if error: raise ErrorSignal(error)
+
+            symbol_table = context.symbol_table
+
+            for element in iterator:
+                if var_address is not None:
+                    symbol_table.set_slot(*var_address, var_name, element, Value)
+                else:
+                    symbol_table.set(var_name, element, Value)
+
+                try:
+                    value = body_closure(context)
+                except ContinueSignal:
+                    continue
+                except BreakSignal:
+                    break
+
+                if elements is not None: elements.append(value)
+
+            return Null.null if should_return_null else List(elements).set_context(context).set_pos(pos_start, pos_end)
+
+        return for_each
+
+    def compile_WhileNode(self, node: WhileNode):
+        condition_closure = self.compile(node.condition_node)
+        body_closure = self.compile(node.body_node)
+        should_return_null, pos_start, pos_end = node.should_return_null, node.pos_start, node.pos_end
+
+        def while_(context: Context):
+            elements = None if should_return_null else []
+
+            while condition_closure(context).is_true():
+                try:
+                    value = body_closure(context)
+                except ContinueSignal:
+                    continue
+                except BreakSignal:
+                    break
+
+                if elements is not None: elements.append(value)
+
+            return Null.null if should_return_null else List(elements).set_context(context).set_pos(pos_start, pos_end)
+
+        return while_
+
+    def compile_ClassNode(self, node: ClassNode):
+        class_name, layout = node.class_name_tok.value, node.layout
+        body_node = node.body_node
+        body_closure = self.compile(body_node)
+        pos_start, pos_end = node.pos_start, node.pos_end
+
+        def class_(context: Context):
+            ctx = Context(class_name, context, pos_start)
+            ctx.symbol_table = SymbolTable(context.symbol_table, layout)
+
+            body_closure(ctx)
+
+            class_value = Class(class_name, body_node, ctx.symbol_table).set_context(context).set_pos(pos_start, pos_end)
+            context.symbol_table.set_as_immutable(class_name, class_value, Class)
+            return class_value
+
+        return class_
+
+    def compile_FuncDefNode(self, node: FuncDefNode):
+        # Argument types and defaults are made on every definition, like the tree walker does
+        func_def = self.interpreter.visit_FuncDefNode
+
+        def function(context: Context):
+            return func_def(node, context)
+
+        return function
+
+    def compile_CallNode(self, node: CallNode):
+        call_closure = self.compile(node.node_to_call)
+        arg_closures = [self.compile(arg_node) for arg_node in node.arg_nodes]
+
+        def call(context: Context):
+            value_to_call = call_closure(context)
+            args = [arg(context) for arg in arg_closures]
+
+            return call_value(value_to_call, args, node, context, run_body).unwrap()
+
+        return call
+
+    def compile_ReturnNode(self, node: ReturnNode):
+        value_closure = self.compile(node.node_to_return) if node.node_to_return else None
+
+        def return_(context: Context):
+            value = value_closure(context) if value_closure else Null.null
+
+            # Like the tree walker, a falsy return value doesn't stop the function
+            if value: raise ReturnSignal(value)
+            return None
+
+        return return_
+
+    def compile_ContinueNode(self, node: ContinueNode):
+        def continue_(context: Context):
+            raise ContinueSignal()
+
+        return continue_
+
+    def compile_BreakNode(self, node: BreakNode):
+        def break_(context: Context):
+            raise BreakSignal()
+
+        return break_
@@ -0,0 +1,276 @@
+from .node import (Node, NumberNode, StringNode, ClassNode,
+                   ListNode, BlockNode, VarAccessNode, VarAssignNode, VarReassignNode,
+                   BinOpNode, LogicalOpNode, UnaryOpNode, IfNode, ForNode, ForEachNode, WhileNode,
+                   FuncDefNode, CallNode, ReturnNode, ContinueNode, BreakNode)
+from .token import TokenType
+from .keyword import Keyword
+from .interpreter import binary_operation_name
+
+# Lowers the AST into a flat opcode stream for the VM. Every instruction is an opcode
+# followed by one argument, the argument is a jump target or an index in the constants,
+# which hold the nodes the VM needs for values, positions and error messages.
+
+(
+    NUMBER, STRING, NULL, POP,
+    LOAD_SLOT, LOAD_NAME, STORE, REASSIGN_TARGET, REASSIGN,
+    BINARY, DOT, UNARY, BUILD_LIST,
+    JUMP, JUMP_IF_FALSE, JUMP_AND, JUMP_OR,
+    FOR_SETUP, FOR_ITER, FOR_EACH_SETUP, FOR_EACH_ITER, WHILE_SETUP, WHILE_TEST, LOOP_APPEND, LOOP_END,
+    CONTINUE, BREAK, RETURN,
+    CALL, INTERPRET, END
+) = range(31)
+
+class Bytecode:
+    def __init__(self):
+        self.instructions: list[int] = []
+        self.constants: list = []
+
+class Loop:
+    # Jump targets of a loop, continue goes to start and break goes to end
+    def __init__(self, node: Node):
+        self.node = node
+        self.start: int = None
+        self.end: int = None
+
+class ShortCircuit:
+    # Jump target of a && or ||, where it goes when its left value decides the result
+    def __init__(self, node: LogicalOpNode):
+        self.node = node
+        self.end: int = None
+
+def compile_body(node: Node) -> Bytecode:
+    # Function and class bodies are compiled once and kept on their node
+    bytecode = getattr(node, "bytecode", None)
+    if bytecode is None:
+        bytecode = node.bytecode = Compiler().compile(node)
+    return bytecode
+
+class Compiler:
+    def compile(self, node: Node) -> Bytecode:
+        self.bytecode = Bytecode()
+        self.visit(node)
+        self.emit(END)
+        return self.bytecode
+
+    def emit(self, opcode: int, arg: int = 0):
+        instructions = self.bytecode.instructions
+        instructions.append(opcode)
+        instructions.append(arg)
+        # Index of the argument, to patch jumps once their target is known
+        return len(instructions) - 1
+
+    def constant(self, value):
+        self.bytecode.constants.append(value)
+        return len(self.bytecode.constants) - 1
+
+    def here(self):
+        return len(self.bytecode.instructions)
+
+    def patch(self, arg_index: int):
+        self.bytecode.instructions[arg_index] = self.here()
+
+    def visit(self, node: Node):
+        method_name = f'visit_{type(node).__name__}'
+        method = getattr(self, method_name, self.no_visit_method)
+
+        return method(node)
+
+    def no_visit_method(self, node: Node):
+        # Nodes without an opcode are run by the tree walker
+        self.emit(INTERPRET, self.constant(node))
+
+    ###################################
+
+    def visit_NumberNode(self, node: NumberNode):
+        self.emit(NUMBER, self.constant(node))
+
+    def visit_StringNode(self, node: StringNode):
+        self.emit(STRING, self.constant(node))
+
+    def visit_ListNode(self, node: ListNode):
+        for element_node in node.element_nodes:
+            self.visit(element_node)
+
+        self.emit(BUILD_LIST, self.constant((node, len(node.element_nodes))))
+
+    def visit_BlockNode(self, node: BlockNode):
+        if node.should_return_null:
+            self.discard(node)
+            self.emit(NULL)
+            return
+
+        for statement_node in node.statement_nodes:
+            self.visit(statement_node)
+
+        self.emit(BUILD_LIST, self.constant((node, len(node.statement_nodes))))
+
+    def discard(self, node: Node):
+        # Runs a node whose value isn't used, the statements of a block are popped one by one
+        if type(node) is BlockNode:
+            for statement_node in node.statement_nodes:
+                self.discard(statement_node)
+        else:
+            self.visit(node)
+            self.emit(POP)
+
+    def visit_VarAccessNode(self, node: VarAccessNode):
+        if node.address is not None and node.address[0] == 0:
+            self.emit(LOAD_SLOT, self.constant((node, node.address[1])))
+        else:
+            self.emit(LOAD_NAME, self.constant(node))
+
+    def visit_VarAssignNode(self, node: VarAssignNode):
+        self.visit(node.value_node)
+        self.emit(STORE, self.constant(node))
+
+    def visit_VarReassignNode(self, node: VarReassignNode):
+        index = self.constant(node)
+        self.emit(REASSIGN_TARGET, index)
+        self.visit(node.value_node)
+        self.emit(REASSIGN, index)
+
+    def visit_BinOpNode(self, node: BinOpNode):
+        # Operations nest as deep as the expression is long, so they're walked on a stack of
+        # (node, operands emitted) instead of a nested visit per operand. A && or || has its
+        # left operand emitted first, then its ShortCircuit once the jump to it is emitted.
+        stack = [(node, False)]
+
+        while stack:
+            node, operands_emitted = stack.pop()
+            node_type = type(node)
+
+            if node_type is BinOpNode:
+                if operands_emitted:
+                    self.emit_binary(node)
+                    continue
+                stack.append((node, True))
+                if node.op_tok.type != TokenType.DOT:
+                    stack.append((node.right_node, False))
+                stack.append((node.left_node, False))
+
+            elif node_type is LogicalOpNode:
+                if operands_emitted is False:
+                    stack.append((node, None))
+                    stack.append((node.left_node, False))
+                elif operands_emitted is None:
+                    short_circuit = ShortCircuit(node)
+                    self.emit(JUMP_AND if node.op_tok.value == Keyword.AND else JUMP_OR, self.constant(short_circuit))
+                    stack.append((node, short_circuit))
+                    stack.append((node.right_node, False))
+                else:
+                    self.emit_binary(node)
+                    operands_emitted.end = self.here()
+
+            elif node_type is UnaryOpNode:
+                if operands_emitted:
+                    self.emit(UNARY, self.constant(node))
+                    continue
+                stack.append((node, True))
+                stack.append((node.node, False))
+
+            else:
+                self.visit(node)
+
+    visit_LogicalOpNode = visit_UnaryOpNode = visit_BinOpNode
+
+    def emit_binary(self, node: BinOpNode):
+        if node.op_tok.type == TokenType.DOT:
+            self.emit(DOT, self.constant(node))
+        else:
+            self.emit(BINARY, self.constant((node, binary_operation_name(node.op_tok))))
+
+    def _case(self, expr: Node, should_return_null: bool):
+        if should_return_null:
+            self.discard(expr)
+            self.emit(NULL)
+        else:
+            self.visit(expr)
+
+    def visit_IfNode(self, node: IfNode):
+        end_jumps = []
+
+        for condition, expr, should_return_null in node.cases:
+            self.visit(condition)
+            next_case = self.emit(JUMP_IF_FALSE)
+            self._case(expr, should_return_null)
+            end_jumps.append(self.emit(JUMP))
+            self.patch(next_case)
+
+        if node.else_case:
+            self._case(*node.else_case)
+        else:
+            self.emit(NULL)
+
+        for end_jump in end_jumps:
+            self.patch(end_jump)
+
+    def _loop_body(self, loop: Loop, index: int):
+        # The values of the iterations are only kept when the loop's value is used
+        if loop.node.should_return_null:
+            self.discard(loop.node.body_node)
+        else:
+            self.visit(loop.node.body_node)
+            self.emit(LOOP_APPEND)
+        self.emit(JUMP, loop.start)
+        loop.end = self.here()
+        self.emit(LOOP_END, index)
+
+    def visit_ForNode(self, node: ForNode):
+        self.visit(node.start_value_node)
+        self.visit(node.end_value_node)
+        if node.step_value_node:
+            self.visit(node.step_value_node)
+
+        loop = Loop(node)
+        index = self.constant(loop)
+        self.emit(FOR_SETUP, index)
+        loop.start = self.here()
+        self.emit(FOR_ITER, index)
+        self._loop_body(loop, index)
+
+    def visit_ForEachNode(self, node: ForEachNode):
+        self.visit(node.iterable_node)
+
+        loop = Loop(node)
+        index = self.constant(loop)
+        self.emit(FOR_EACH_SETUP, index)
+        loop.start = self.here()
+        self.emit(FOR_EACH_ITER, index)
+        self._loop_body(loop, index)
+
+    def visit_WhileNode(self, node: WhileNode):
+        loop = Loop(node)
+        index = self.constant(loop)
+        self.emit(WHILE_SETUP, index)
+        loop.start = self.here()
+        self.visit(node.condition_node)
+        self.emit(WHILE_TEST, index)
+        self._loop_body(loop, index)
+
+    def visit_ClassNode(self, node: ClassNode):
+        # A class body only runs once, when the class is defined
+        self.emit(INTERPRET, self.constant(node))
+
+    def visit_FuncDefNode(self, node: FuncDefNode):
+        self.emit(INTERPRET, self.constant(node))
+
+    def visit_CallNode(self, node: CallNode):
+        self.visit(node.node_to_call)
+        for arg_node in node.arg_nodes:
+            self.visit(arg_node)
+
+        self.emit(CALL, self.constant(node))
+
+    def visit_ReturnNode(self, node: ReturnNode):
+        if node.node_to_return:
+            self.visit(node.node_to_return)
+        else:
+            self.emit(NULL)
+
+        self.emit(RETURN)
+
+    def visit_ContinueNode(self, node: ContinueNode):
+        self.emit(CONTINUE)
+
+    def visit_BreakNode(self, node: BreakNode):
+        self.emit(BREAK)
@@ -13,48 +13,35 @@ class Context:
         self.parent: Context = parent
         self.parent_entry_pos = parent_entry_pos
         self.symbol_table: SymbolTable = None
+        # Profile of the function body running in this context, counts the loop iterations
+        self.profile = None
         
         context_count += 1
-        debug_message.set_message(f"CONTEXT {self.id}: CREATED: {self.display_name}").display()
+        if debug_message.enabled: debug_message.set_message("CONTEXT {}: CREATED: {}", self.id, self.display_name).display()
         
     def merge(self, other):
         self.symbol_table.merge(other.symbol_table)
         return self
 
     def import_from(self, other, namespace: str):
-        symbols_list = [
-            "symbols",
-            "immutable_symbols"
-        ]
-        
-        for symbol in symbols_list:
-            for k, v in getattr(other.symbol_table, symbol).items():
-                self.symbol_table._set_symbol(f"{namespace}_{k}", v[0], v[1], symbol)
+        for name, entry in other.symbol_table.items("symbols", "immutable_symbols"):
+            self.symbol_table._set_symbol(f"{namespace}_{name}", entry[0], entry[1], entry[2])
     
     def exists_in(self, name: str, calling_from_parent: bool = False):
-        debug_message.set_message(f"ST {self.id}: SYMBOL '{name}': CHECKING SYMBOL TYPE")
-        symbol_type_name = None
-        ctx_inst = self
+        if debug_message.enabled: debug_message.set_message("ST {}: SYMBOL '{}': CHECKING SYMBOL TYPE", self.id, name)
+        ctx = self
         
-        if name in self.symbol_table.symbols:
-            symbol_type_name = "symbols"
-            
-        elif name in self.symbol_table.immutable_symbols:
-            symbol_type_name = "immutable_symbols"
-            
-        elif name in self.symbol_table.temporary_symbols and not calling_from_parent:
-            symbol_type_name = "temporary_symbols"
-            
-        elif name in self.symbol_table.scoped_symbols and not calling_from_parent:
-            symbol_type_name = "scoped_symbols"
+        while ctx:
+            entry = ctx.symbol_table.entries.get(name)
             
-        elif name in self.symbol_table.builtin_symbols:
-            symbol_type_name = "builtin_symbols"
+            # Temporary and scoped symbols are only visible from their own context
+            if entry is not None and not (calling_from_parent and entry[2] in ("temporary_symbols", "scoped_symbols")):
+                return entry[2], ctx
             
-        if symbol_type_name is None and self.parent:
-            symbol_type_name, ctx_inst = self.parent.exists_in(name, True)
+            ctx = ctx.parent
+            calling_from_parent = True
         
-        return symbol_type_name, ctx_inst
+        return None, None
     
     def __repr__(self) -> str:
         return f"<Context:{self.display_name}, Id:{self.id}, Parent:{self.parent}>"
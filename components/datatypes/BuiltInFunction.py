@@ -1,5 +1,5 @@
 from os import system as os_system, name as os_name
-from os.path import join as os_join
+from os.path import join as os_join, getmtime as os_getmtime
 from random import randint, random, uniform
 from enum import Enum
 
@@ -9,14 +9,15 @@ from .Boolean import Boolean
 from .Null import Null
 from .String import String
 from .List import List
+from .Range import Range
 from .Function import BaseFunction, Function, make_args_struct
 from .Class import Class, Instance
 from ..symbol_table import SymbolTable
 from ..node import Node
 from ..context import Context
-from ..runtime import RunTimeResult
+from ..runtime import RunTimeResult, RunTimeSignal
 from ..error import RunTimeError
-from ..utils.strings_template import OUT_OF_BOUNDS_ERROR
+from ..utils.strings_template import OUT_OF_BOUNDS_ERROR, NOT_ITERABLE_ERROR
 from ..utils.misc import get_abs_path
 
 class BuiltInFunctionNames(Enum):
@@ -28,6 +29,7 @@ class BuiltInFunctionNames(Enum):
     CLEAR = "Clear"
     
     TOSTRING = "ToString"
+    TOLIST = "ToList"
     
     ISNUMBER = "IsNumber"
     ISSTRING = "IsString"
@@ -41,11 +43,14 @@ class BuiltInFunctionNames(Enum):
     LISTEXTEND = "ListExtend"
     LISTLEN = "ListLen"
     
+    RANGE = "Range"
+    
     RANDOM = "Random"
     RANDOMINT = "RandomInt"
     RANDOMFLOAT = "RandomFloat"
     
     IMPORT = "Import"
+    RELOAD = "Reload"
     RUN = "Run"
     EXIT = "Exit"
     
@@ -86,6 +91,21 @@ class BuiltInFunction(BaseFunction):
 
         return res.success(return_value)
 
+    def iterated(self, value: Value, exec_ctx: Context):
+        # The elements of a value a for-each loop can go through, a generator is run to its end
+        iterator = value.iterate()
+        if iterator is None:
+            return RunTimeResult().failure(RunTimeError(
+                self.pos_start, self.pos_end,
+                NOT_ITERABLE_ERROR.format(type(value).__qualname__),
+                exec_ctx
+            ))
+
+        try:
+            return RunTimeResult().success(list(iterator))
+        except RunTimeSignal as signal:
+            return signal.as_result()
+
     def no_visit_method(self, node: Node, context: Context):
         raise Exception(f"No execute_{self.name} method defined")
 
@@ -126,6 +146,15 @@ class BuiltInFunction(BaseFunction):
         return RunTimeResult().success(String(exec_ctx.symbol_table.get("value").__print_repr__()))
     execute_TOSTRING.args = [make_args_struct("value", Value)]
 
+    def execute_TOLIST(self, exec_ctx: Context):
+        res = RunTimeResult()
+        elements = res.register(self.iterated(exec_ctx.symbol_table.get("value"), exec_ctx))
+        if res.should_return():
+            return res
+
+        return res.success(List(elements))
+    execute_TOLIST.args = [make_args_struct("value", Value)]
+
     def execute_ISNUMBER(self, exec_ctx: Context):
         is_number = isinstance(exec_ctx.symbol_table.get("value"), Number)
         return RunTimeResult().success(Boolean.true if is_number else Boolean.false)
@@ -181,17 +210,45 @@ class BuiltInFunction(BaseFunction):
     execute_LISTPOP.args = [make_args_struct("list", List), make_args_struct("index", Number)]
 
     def execute_LISTEXTEND(self, exec_ctx: Context):
+        res = RunTimeResult()
         list_a: List = exec_ctx.symbol_table.get("listA")
-        list_b: List = exec_ctx.symbol_table.get("listB")
-        list_a.elements.extend(list_b.elements)
-        return RunTimeResult().success(list_a)
-    execute_LISTEXTEND.args = [make_args_struct("listA", List), make_args_struct("listB", List)]
+
+        # Any value a for-each loop can go through extends the list, not only another list
+        elements = res.register(self.iterated(exec_ctx.symbol_table.get("listB"), exec_ctx))
+        if res.should_return():
+            return res
+
+        list_a.elements.extend(elements)
+        return res.success(list_a)
+    execute_LISTEXTEND.args = [make_args_struct("listA", List), make_args_struct("listB", Value)]
 
     def execute_LISTLEN(self, exec_ctx: Context):
         list_: List = exec_ctx.symbol_table.get("list")
         return RunTimeResult().success(Number(len(list_.elements)))
     execute_LISTLEN.args = [make_args_struct("list", List)]
 
+    def execute_RANGE(self, exec_ctx: Context):
+        start: Number = exec_ctx.symbol_table.get("start")
+        end: Number = exec_ctx.symbol_table.get("end")
+        step: Number = exec_ctx.symbol_table.get("step")
+
+        if start.is_float or end.is_float or step.is_float:
+            return RunTimeResult().failure(RunTimeError(
+                self.pos_start, self.pos_end,
+                "All args must be int",
+                exec_ctx
+            ))
+
+        if step.value == 0:
+            return RunTimeResult().failure(RunTimeError(
+                self.pos_start, self.pos_end,
+                "Step arg can't be 0",
+                exec_ctx
+            ))
+
+        return RunTimeResult().success(Range(start.value, end.value, step.value))
+    execute_RANGE.args = [make_args_struct("start", Number), make_args_struct("end", Number), make_args_struct("step", Number, Number(1))]
+
     def execute_RANDOM(self, exec_ctx: Context):
         return RunTimeResult().success(Number(random()))
     execute_RANDOM.args = []
@@ -216,8 +273,8 @@ class BuiltInFunction(BaseFunction):
         return RunTimeResult().success(Number(uniform(min.value, max.value)))
     execute_RANDOMFLOAT.args = [make_args_struct("min", Number), make_args_struct("max", Number)]
 
-    def execute_IMPORT(self, exec_ctx: Context):
-        from ..wrapper import run
+    def import_module(self, exec_ctx: Context, reload: bool):
+        from ..wrapper import run, imported_context, set_imported_context
         fn = exec_ctx.symbol_table.get("filename").value
         cwd = exec_ctx.symbol_table.get("NAKATHON_CWD").value
         namespace = exec_ctx.symbol_table.get("namespace").value.replace(" ", "_")
@@ -232,8 +289,15 @@ class BuiltInFunction(BaseFunction):
             namespace = target_file.removesuffix(".nkt")
         
         try:
-            with open(full_path, "r", encoding="utf-8") as f:
-                script = f.read()
+            # Taken before reading, a file changed while it's read is run again on the next import
+            mtime = os_getmtime(full_path)
+            
+            # A module already imported and unchanged since is bound again without running it
+            context = None if reload else imported_context(full_path, mtime, import_cwd)
+            
+            if context is None:
+                with open(full_path, "r", encoding="utf-8") as f:
+                    script = f.read()
         except Exception as e:
             return RunTimeResult().failure(RunTimeError(
                 self.pos_start, self.pos_end,
@@ -241,18 +305,21 @@ class BuiltInFunction(BaseFunction):
                 exec_ctx
             ))
 
-        _, error, context = run(fn, script, 
-                                f"<Importing \"{target_file}\" as \"{namespace}\">" if namespace != "*" 
-                                else f"<Importing \"{target_file}\" without a namespace>", 
-                                True, True, cwd=import_cwd)
-        
-        if error:
-            return RunTimeResult().failure(RunTimeError(
-                self.pos_start, self.pos_end,
-                f"Failed to finish importing \"{fn}\"\n" +
-                error.as_string(),
-                exec_ctx
-            ))
+        if context is None:
+            _, error, context = run(fn, script, 
+                                    f"<Importing \"{target_file}\" as \"{namespace}\">" if namespace != "*" 
+                                    else f"<Importing \"{target_file}\" without a namespace>", 
+                                    True, True, cwd=import_cwd)
+            
+            if error:
+                return RunTimeResult().failure(RunTimeError(
+                    self.pos_start, self.pos_end,
+                    f"Failed to finish importing \"{fn}\"\n" +
+                    error.as_string(),
+                    exec_ctx
+                ))
+            
+            set_imported_context(full_path, mtime, context)
         
         if namespace != "*":
             exec_ctx.parent.import_from(context, namespace)
@@ -261,8 +328,16 @@ class BuiltInFunction(BaseFunction):
             #return RunTimeResult().success(Instance(Class(namespace,None, context.symbol_table), context.symbol_table))
         
         return RunTimeResult().success(String(namespace))
+
+    def execute_IMPORT(self, exec_ctx: Context):
+        return self.import_module(exec_ctx, False)
     execute_IMPORT.args = [make_args_struct("filename", String), make_args_struct("namespace", String, String(""))]
     
+    def execute_RELOAD(self, exec_ctx: Context):
+        # Runs the module again even when it's unchanged, every later import binds the new one
+        return self.import_module(exec_ctx, True)
+    execute_RELOAD.args = [make_args_struct("filename", String), make_args_struct("namespace", String, String(""))]
+    
     def execute_RUN(self, exec_ctx: Context):
         from ..wrapper import run
         fn = exec_ctx.symbol_table.get("filename").value
@@ -323,12 +398,10 @@ class BuiltInFunction(BaseFunction):
             def _method1(symbol_table: SymbolTable, symbol_name: str):
                 print(f"\t{symbol_name} (id: {symbol_table.id}):")
                 
-                symbol = getattr(symbol_table, symbol_name)
-                
                 _out_text = []
                 
-                for k, v in symbol.items():
-                    _out_text.append(f"{k} = {v}")
+                for k, (value, type_, _, lifetime) in symbol_table.items(symbol_name):
+                    _out_text.append(f"{k} = {(value, type_) if lifetime is None else (value, type_, lifetime)}")
                 
                 if not _out_text:
                     print("\t{}")
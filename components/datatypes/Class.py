@@ -1,7 +1,7 @@
 from .Value import Value
 from .Function import Function
 from .Instance import Instance
-from ..node import VarAccessNode, CallNode, ListNode
+from ..node import VarAccessNode, CallNode, BlockNode
 from ..runtime import RunTimeResult
 from ..error import RunTimeError
 from ..context import Context
@@ -9,7 +9,7 @@ from ..symbol_table import SymbolTable
 from ..keyword import Keyword
 
 class Class(Value):
-    def __init__(self, name: str, body_node: ListNode, symbol_table: SymbolTable):
+    def __init__(self, name: str, body_node: BlockNode, symbol_table: SymbolTable):
         self.name = name
         self.body_node = body_node
         self.symbol_table = symbol_table
@@ -64,11 +64,11 @@ class Class(Value):
 
         exec_ctx.symbol_table = inst.symbol_table
  
-        for name in self.symbol_table.symbols:
+        for name, _ in self.symbol_table.items("symbols"):
             value, type_ = self.symbol_table.copy_symbol(name)
             inst.symbol_table.set(name, value.set_context(exec_ctx), type_)
 
-        for name in self.symbol_table.immutable_symbols:
+        for name, _ in self.symbol_table.items("immutable_symbols"):
             value, type_ = self.symbol_table.copy_symbol(name)
             inst.symbol_table.set_as_immutable(name, value.set_context(exec_ctx), type_)
 
@@ -0,0 +1,19 @@
+from .Value import Value
+
+class Generator(Value):
+    # The values yielded by a call of a generator function, its body only runs as far as they're taken
+    def __init__(self, name: str, iterator):
+        self.name = name
+        super().__init__(iterator)
+
+    def iterate(self):
+        return self.value
+
+    def copy(self):
+        copy = Generator(self.name, self.value)
+        copy.set_pos(self.pos_start, self.pos_end)
+        copy.set_context(self.context)
+        return copy
+
+    def __repr__(self):
+        return f"<Generator:{self.name}>"
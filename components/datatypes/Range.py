@@ -0,0 +1,37 @@
+from .Value import Value
+from .Number import Number
+from ..error import RunTimeError
+from ..utils.strings_template import OUT_OF_BOUNDS_ERROR
+
+class Range(Value):
+    # The numbers from start up to end by step, only made one at a time as they're used
+    def __init__(self, start: int, end: int, step: int = 1):
+        self.start = start
+        self.end = end
+        self.step = step
+        super().__init__(range(start, end, step))
+
+    def dived_by(self, other):
+        if isinstance(other, Number):
+            try:
+                return Number(self.value[other.value]).set_context(self.context), None
+            except:
+                return None, RunTimeError(
+                    other.pos_start, other.pos_end,
+                    OUT_OF_BOUNDS_ERROR,
+                    self.context
+                )
+
+        return self._illegal_operation(other)
+
+    def iterate(self):
+        return map(Number, self.value)
+
+    def copy(self):
+        copy = Range(self.start, self.end, self.step)
+        copy.set_pos(self.pos_start, self.pos_end)
+        copy.set_context(self.context)
+        return copy
+
+    def __repr__(self):
+        return f"Range({self.start}, {self.end}, {self.step})"
@@ -2,6 +2,8 @@ from .Value import Value
 from .Number import Number
 from .String import String
 from .List import List
+from .Range import Range
+from .Generator import Generator
 from .Boolean import Boolean
 from .Null import Null
 from .Function import Function, BaseFunction
@@ -19,6 +21,8 @@ def make_value_type(name: str) -> Value:
         "Float": Number,
         "String": String,
         "List": List,
+        "Range": Range,
+        "Generator": Generator,
         "Boolean": Boolean,
         "Bool": Boolean,
         "Null": Null,
@@ -51,6 +55,8 @@ __all__ = [
     "Number",
     "String",
     "List",
+    "Range",
+    "Generator",
     "Boolean",
     "Null",
     "BaseFunction",
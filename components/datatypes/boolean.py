@@ -16,6 +16,12 @@ class Boolean(Value):
         
         return self._illegal_operation(other)
 
+    def anded_by_any(self):
+        return None if self.value else Boolean(self.value).set_context(self.context)
+
+    def ored_by_any(self):
+        return Boolean(self.value).set_context(self.context) if self.value else None
+
     def is_true(self):
         return self.value is True
     
@@ -1,27 +1,32 @@
 from .Value import Value
 from .Null import Null
-from ..node import ListNode
+from .Generator import Generator
+from ..node import BlockNode
 from ..context import Context
 from ..runtime import RunTimeResult
 from ..error import RunTimeError
 from ..symbol_table import SymbolTable
+from ..utils.strings_template import MAX_RECURSION_DEPTH_ERROR
 from ..utils.misc import index_exists, try_get, try_set, remove_none_elements
 from ..utils.debug import DebugMessage
 
 debug_message = DebugMessage("")
 
 class BaseFunction(Value):
+    layout: dict[str, int] = None
+    
     def __init__(self, name: str, display_name: str = None):
         self.name = name or "<anonymous>"
         self.display_name = display_name
-        super().__init__(name)
+        super().__init__(self.name)
         
     def _get_name(self) -> str:
         return self.display_name or self.name
 
-    def generate_new_context(self):
-        new_context = Context(self.name, self.context, self.pos_start)
-        new_context.symbol_table = SymbolTable(new_context.parent.symbol_table)
+    def generate_new_context(self, context: Context = None, pos_start = None):
+        # Made from the function's own context and position unless it's called from elsewhere
+        new_context = Context(self.name, context or self.context, pos_start or self.pos_start)
+        new_context.symbol_table = SymbolTable(new_context.parent.symbol_table, self.layout)
         return new_context
 
     def check_args(self, arg_names: list[str], arg_values: list[Value], arg_types: list[Value], arg_default_values: list[Value]):
@@ -92,37 +97,79 @@ class BaseFunction(Value):
     #     return f"<{self.__class__.__qualname__}:{self.name}>"
 
 class Function(BaseFunction):
-    def __init__(self, name: str, body_node: ListNode, arg_names: list[str], arg_types: list[Value], arg_default_values: list[Value], should_auto_return: bool = False):
+    def __init__(self, name: str, body_node: BlockNode, arg_names: list[str], arg_types: list[Value], arg_default_values: list[Value], should_auto_return: bool = False, layout: dict[str, int] = None, is_generator: bool = False):
         self.body_node = body_node
+        self.layout = layout
         self.arg_names = arg_names
         self.arg_types = arg_types
         self.arg_default_values = arg_default_values
         self.should_auto_return = should_auto_return
+        self.is_generator = is_generator
         super().__init__(name)
 
-    def execute(self, arg_values: list[Value]):
-        from ..interpreter import Interpreter
+    def execute(self, arg_values: list[Value], run_body = None):
+        return self.call(arg_values, self.context, self.pos_start, self.pos_end, run_body)
+
+    def call(self, arg_values: list[Value], context: Context, pos_start, pos_end, run_body = None):
+        # Runs the function as called from context at pos_start, the function itself isn't copied there
+        # run_body(body_node, context) lets another engine run the body, the tree walker runs it by default
+        exec_ctx = self.generate_new_context(context, pos_start)
+        if self.is_generator:
+            return self.started(arg_values, exec_ctx, context, pos_start, pos_end)
+
+        if run_body is None:
+            from ..interpreter import Interpreter
+            from .. import tiering
+            if tiering.enabled:
+                run_body = tiering.body_runner(self.body_node, arg_values, exec_ctx, Interpreter())
+            else:
+                run_body = Interpreter().visit
+
+        res = self.enter(arg_values, exec_ctx, context, pos_start, pos_end)
+        if res.should_return():
+            return res
 
-        res = RunTimeResult()
-        interpreter = Interpreter()
-        exec_ctx = self.generate_new_context()
-        
-        res.register(self.check_and_populate_args(
-            self.arg_names, arg_values, self.arg_types, self.arg_default_values, exec_ctx))
-        if res.should_return() and res.func_return_value is None:
+        try:
+            return self.returned(run_body(self.body_node, exec_ctx))
+        except RecursionError:
+            # Every call nests Python calls here, only the VM keeps its calls on a stack of its own
+            return RunTimeResult().failure(RunTimeError(pos_start, pos_end, MAX_RECURSION_DEPTH_ERROR, context))
+
+    def started(self, arg_values: list[Value], exec_ctx: Context, context: Context, pos_start, pos_end):
+        # A generator function's call is worth a Generator, its body only runs as the generator is iterated
+        # and every engine leaves it to the tree walker, which can suspend it at a yield
+        from ..generator import GeneratorInterpreter
+
+        res = self.enter(arg_values, exec_ctx, context, pos_start, pos_end)
+        if res.should_return():
             return res
 
-        value = res.register(interpreter.visit(self.body_node, exec_ctx))
+        iterator = GeneratorInterpreter().run(self.body_node, exec_ctx)
+        return res.success(Generator(self.name, iterator).set_context(context).set_pos(pos_start, pos_end))
+
+    def enter(self, arg_values: list[Value], exec_ctx: Context, context: Context, pos_start, pos_end):
+        # Populates the arguments in exec_ctx, the engines running the body themselves call it before they do
+        res = self.check_and_populate_args(
+            self.arg_names, arg_values, self.arg_types, self.arg_default_values, exec_ctx)
+        if res.error:
+            # Argument errors point at the call, only then is a copy of the function placed there
+            located = self.copy().set_pos(pos_start, pos_end).set_context(context)
+            return located.check_and_populate_args(
+                self.arg_names, arg_values, self.arg_types, self.arg_default_values, exec_ctx)
+        return res
+
+    def returned(self, res: RunTimeResult):
+        # The result of the call from the result of running its body, continue and break still leave it
         if res.should_return() and res.func_return_value is None:
             return res
 
         ret_value = (
-            value if self.should_auto_return else None) or res.func_return_value or Null.null
-        return res.success(ret_value)
+            res.value if self.should_auto_return else None) or res.func_return_value or Null.null
+        return RunTimeResult().success(ret_value)
 
     def copy(self):
         copy = Function(self.name, self.body_node,
-                        self.arg_names, self.arg_types, self.arg_default_values, self.should_auto_return)
+                        self.arg_names, self.arg_types, self.arg_default_values, self.should_auto_return, self.layout, self.is_generator)
         copy.set_pos(self.pos_start, self.pos_end)
         copy.set_context(self.context)
         return copy
@@ -139,10 +186,11 @@ def make_out_args(input_arg_values: list[Value], default_arg_values: list[Value]
 
     new_args = [None] * len(arg_names)
     
-    debug_message.set_message(f"{function_name}: ARG VALUES: NAMES: {arg_names}")
-    debug_message.set_message(f"{function_name}: ARG VALUES: TYPES: {[_type.__qualname__ for _type in arg_types]}")
-    debug_message.set_message(f"{function_name}: ARG VALUES: INPUT: {input_arg_values}")
-    debug_message.set_message(f"{function_name}: ARG VALUES: DEFAULT: {default_arg_values}")
+    if debug_message.enabled:
+        debug_message.set_message("{}: ARG VALUES: NAMES: {}", function_name, arg_names)
+        debug_message.set_message("{}: ARG VALUES: TYPES: {}", function_name, [_type.__qualname__ for _type in arg_types])
+        debug_message.set_message("{}: ARG VALUES: INPUT: {}", function_name, input_arg_values)
+        debug_message.set_message("{}: ARG VALUES: DEFAULT: {}", function_name, default_arg_values)
     
     for i in range(len(new_args)):
         if index_exists(default_arg_values, i) and try_get(default_arg_values, i):
@@ -151,6 +199,6 @@ def make_out_args(input_arg_values: list[Value], default_arg_values: list[Value]
         if index_exists(input_arg_values, i) and (try_get(new_args, i) is None or try_get(input_arg_values, i) != try_get(default_arg_values, i)):
             try_set(new_args, i, try_get(input_arg_values, i))
     
-    debug_message.set_message(f"{function_name}: ARG VALUES: NEW: {new_args}")
+    if debug_message.enabled: debug_message.set_message("{}: ARG VALUES: NEW: {}", function_name, new_args)
 
     return new_args
\ No newline at end of file
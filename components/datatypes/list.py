@@ -51,6 +51,9 @@ class List(Value):
         
         return self._illegal_operation(other)
     
+    def iterate(self):
+        return iter(self.elements)
+
     def copy(self):
         copy = List(self.elements)
         copy.set_pos(self.pos_start, self.pos_end)
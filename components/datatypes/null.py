@@ -29,6 +29,12 @@ class Null(Value):
         
         return self._illegal_operation(other)
 
+    def anded_by_any(self):
+        return None if self.value else Boolean(self.value).set_context(self.context)
+
+    def ored_by_any(self):
+        return Boolean(self.value).set_context(self.context) if self.value else None
+
     def notted(self):
         return Boolean(True if self.value != None else False).set_context(self.context), None
     
@@ -9,7 +9,7 @@ class Value:
         self.set_pos()
         self.set_context()
         
-        debug_message.set_message(f"VALUE: CREATED: {self}").display()
+        if debug_message.enabled: debug_message.set_message("VALUE: CREATED: {}", self).display()
 
     def set_pos(self, pos_start = None, pos_end = None):
         self.pos_start = pos_start
@@ -59,6 +59,13 @@ class Value:
     def ored_by(self, other):
         return self._illegal_operation(other)
 
+    def anded_by_any(self):
+        # The value of self && other whatever other is, None when it depends on other
+        return None
+
+    def ored_by_any(self):
+        return None
+
     def notted(self, other):
         return self._illegal_operation(other)
     
@@ -75,6 +82,10 @@ class Value:
     def is_true(self):
         return False
 
+    def iterate(self):
+        # Python iterator over the values a for-each loop goes through, None when the value can't be iterated
+        return None
+
     def _illegal_operation_error(self, other = None):
         from ..error import RunTimeError
         if not other: other = self
@@ -54,13 +54,29 @@ class RunTimeError(Error):
         return result
 
     def generate_traceback(self) -> str:
-        result = ""
         pos: Position = self.pos_start
         ctx = self.context
 
+        lines = []
+        repeats = 0
+
         while ctx:
-            result += f"\tFile {pos.fn}, line {pos.ln + 1}, in {ctx.display_name}\n\n"
+            line = f"\tFile {pos.fn}, line {pos.ln + 1}, in {ctx.display_name}\n\n"
             pos = ctx.parent_entry_pos
             ctx = ctx.parent
 
-        return "Traceback (most recent call last):\n" + result
+            # Like Python, a deep recursion only shows the same line a few times
+            if lines and line == lines[-1]:
+                repeats += 1
+                if repeats >= 3:
+                    continue
+            else:
+                lines.append(self._repeated(repeats))
+                repeats = 0
+            lines.append(line)
+
+        lines.append(self._repeated(repeats))
+        return "Traceback (most recent call last):\n" + "".join(lines)
+
+    def _repeated(self, repeats: int) -> str:
+        return f"\t[Previous line repeated {repeats - 2} more times]\n\n" if repeats > 2 else ""
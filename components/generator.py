@@ -0,0 +1,115 @@
+from .datatypes.all import Number, Null, Value
+from .context import Context
+from .node import Node, BlockNode, IfNode, ForNode, ForEachNode, WhileNode, YieldNode
+from .interpreter import Interpreter, iterate, node_classes
+from .runtime import ErrorSignal, ReturnSignal, ContinueSignal, BreakSignal
+
+# Runs the body of a generator function as a Python generator, which keeps the body's frame and
+# where it stopped while the values it yielded are used. Only the statements with a yield in them
+# are stepped through here, every other statement is evaluated at once by the tree walker, so a
+# generator's body is run the same way whichever engine called it.
+
+class GeneratorInterpreter(Interpreter):
+    # {NodeClass: step method}, built once like the tree walker's dispatch
+    steps: dict[type, object] = None
+
+    def __init__(self):
+        super().__init__()
+        cls = type(self)
+        if cls.__dict__.get("steps") is None:
+            cls.steps = {
+                node_class: getattr(cls, f'step_{node_class.__name__}')
+                for node_class in node_classes() if hasattr(cls, f'step_{node_class.__name__}')
+            }
+
+    def run(self, body_node: Node, context: Context):
+        # The values yielded by the body, returning ends it like reaching its end does, and so does
+        # a continue or break outside of its loops instead of going on in the loop using the values
+        try:
+            yield from self.step(body_node, context)
+        except (ReturnSignal, ContinueSignal, BreakSignal):
+            return
+
+    def step(self, node: Node, context: Context):
+        # The values yielded by the node, one without a yield in it is run right away and yields none
+        method = self.steps.get(type(node)) if node.yields else None
+        if method is None:
+            self.evaluate(node, context)
+            return ()
+
+        return method(self, node, context)
+
+    ###################################
+
+    def step_BlockNode(self, node: BlockNode, context: Context):
+        for statement_node in node.statement_nodes:
+            yield from self.step(statement_node, context)
+
+    def step_IfNode(self, node: IfNode, context: Context):
+        for condition, expr, _ in node.cases:
+            if self.evaluate(condition, context).is_true():
+                yield from self.step(expr, context)
+                return
+
+        if node.else_case:
+            yield from self.step(node.else_case[0], context)
+
+    def step_ForNode(self, node: ForNode, context: Context):
+        start_value = self.evaluate(node.start_value_node, context)
+        end_value = self.evaluate(node.end_value_node, context)
+
+        if node.step_value_node:
+            step_value = self.evaluate(node.step_value_node, context)
+        else:
+            step_value = Number(1)
+
+        i, end, step = start_value.value, end_value.value, step_value.value
+        var_name, var_address = node.var_name_tok.value, node.var_address
+
+        while i < end if step >= 0 else i > end:
+            if var_address is not None:
+                context.symbol_table.set_slot(*var_address, var_name, Number(i), Number)
+            else:
+                context.symbol_table.set(var_name, Number(i), Number)
+            i += step
+
+            try:
+                yield from self.step(node.body_node, context)
+            except ContinueSignal:
+                continue
+            except BreakSignal:
+                break
+
+    def step_ForEachNode(self, node: ForEachNode, context: Context):
+        iterator, error = iterate(self.evaluate(node.iterable_node, context), node, context)
+        if error: raise ErrorSignal(error)
+
+        var_name, var_address = node.var_name_tok.value, node.var_address
+
+        for element in iterator:
+            if var_address is not None:
+                context.symbol_table.set_slot(*var_address, var_name, element, Value)
+            else:
+                context.symbol_table.set(var_name, element, Value)
+
+            try:
+                yield from self.step(node.body_node, context)
+            except ContinueSignal:
+                continue
+            except BreakSignal:
+                break
+
+    def step_WhileNode(self, node: WhileNode, context: Context):
+        while self.evaluate(node.condition_node, context).is_true():
+            try:
+                yield from self.step(node.body_node, context)
+            except ContinueSignal:
+                continue
+            except BreakSignal:
+                break
+
+    def step_YieldNode(self, node: YieldNode, context: Context):
+        if node.node_to_yield:
+            yield self.evaluate(node.node_to_yield, context)
+        else:
+            yield Null.null
@@ -6,28 +6,122 @@ from .datatypes.all import (
 )
 from .context import Context
 from .node import (Node, NumberNode, StringNode, ClassNode, ObjectNode,
-                   ListNode, VarAccessNode, VarAssignNode, VarReassignNode,
-                   BinOpNode, UnaryOpNode, IfNode, ForNode, WhileNode,
-                   FuncDefNode, CallNode, ReturnNode, ContinueNode, BreakNode)
+                   ListNode, BlockNode, VarAccessNode, VarAssignNode, VarReassignNode,
+                   BinOpNode, LogicalOpNode, UnaryOpNode, IfNode, ForNode, ForEachNode, WhileNode,
+                   FuncDefNode, CallNode, ReturnNode, YieldNode, ContinueNode, BreakNode)
 from .token import Token, TokenType
 from .keyword import Keyword
-from .runtime import RunTimeResult
+from .runtime import RunTimeResult, RunTimeSignal, ErrorSignal, ReturnSignal, ContinueSignal, BreakSignal
 from .error import RunTimeError
 from .utils.strings_template import (IS_NOT_DEFINED_ERROR, CANNOT_OVERWRITE_IMMUTABLE_BUILTIN_VAR_FUNC_ERROR, VAR_TYPE_INVALID_ERROR,
                                      NO_METHOD_DEFINED_ERROR, VAR_TYPE_DECLARED_BUT_VALUE_TYPE_IS_NOT_SAME_ERROR,
                                      UNKNOWN_FAIL_TYPE_ERROR, VAR_TYPE_ALREADY_DECLARED_CANNOT_CHANGE_ERROR,
-                                     WAS_NOT_INITIALIZED_ERROR)
+                                     WAS_NOT_INITIALIZED_ERROR, NOT_ITERABLE_ERROR, CANNOT_YIELD_HERE_ERROR)
 from .utils.debug import DebugMessage
 
 debug_message = DebugMessage("").set_auto_display(True)
 
+# Value method used by each operator, shared with the VM so both engines give the same results
+BINARY_OPERATIONS = {
+    TokenType.PLUS: "added_to",
+    TokenType.MINUS: "subbed_by",
+    TokenType.MUL: "multed_by",
+    TokenType.DIV: "dived_by",
+    TokenType.POWER: "powed_by",
+    TokenType.DIVREST: "rest_of_dived_by",
+    TokenType.EE: "get_comparison_eq",
+    TokenType.NE: "get_comparison_ne",
+    TokenType.LT: "get_comparison_lt",
+    TokenType.GT: "get_comparison_gt",
+    TokenType.LTE: "get_comparison_lte",
+    TokenType.GTE: "get_comparison_gte",
+}
+
+KEYWORD_BINARY_OPERATIONS = {
+    Keyword.AND: "anded_by",
+    Keyword.OR: "ored_by",
+}
+
+# Value method giving the result of a logical operator from its left value alone, None when the right value is needed
+SHORT_CIRCUITS = {
+    Keyword.AND: "anded_by_any",
+    Keyword.OR: "ored_by_any",
+}
+
+REASSIGN_OPERATIONS = {
+    TokenType.PLUSE: "added_to",
+    TokenType.MINUSE: "subbed_by",
+    TokenType.MULE: "multed_by",
+    TokenType.DIVE: "dived_by",
+    TokenType.POWERE: "powed_by",
+    TokenType.DIVRESTE: "rest_of_dived_by",
+}
+
+def binary_operation_name(op_tok: Token) -> str:
+    if op_tok.type == TokenType.KEYWORD:
+        return KEYWORD_BINARY_OPERATIONS.get(op_tok.value)
+    return BINARY_OPERATIONS.get(op_tok.type)
+
+def located(value: Value, node: Node, context: Context) -> Value:
+    # Values are shared instead of copied when read, a copy placed where one was used is only made for errors
+    return value.copy().set_pos(node.pos_start, node.pos_end).set_context(context)
+
+def binary_operation(left: Value, right: Value, method_name: str, left_node: Node, right_node: Node, context: Context):
+    # Without a left node the left value keeps its own position, like a variable's value updated in place
+    result, error = getattr(left, method_name)(right)
+    if error:
+        left = located(left, left_node, context) if left_node else left
+        result, error = getattr(left, method_name)(located(right, right_node, context))
+    return result, error
+
+def call_value(value_to_call: Value, args: list[Value], node: CallNode, context: Context, run_body = None) -> RunTimeResult:
+    # Functions run as called from here, other values are still copied to the call
+    if isinstance(value_to_call, Function):
+        return value_to_call.call(args, context, node.pos_start, node.pos_end, run_body)
+    return located(value_to_call, node, context).execute(args)
+
+def iterate(value: Value, node: ForEachNode, context: Context):
+    # The Python iterator a for-each loop goes through, shared by every engine
+    iterator = value.iterate()
+    if iterator is None:
+        iterable_node = node.iterable_node
+        return None, RunTimeError(
+            iterable_node.pos_start, iterable_node.pos_end,
+            NOT_ITERABLE_ERROR.format(type(value).__qualname__),
+            context
+        )
+    return iterator, None
+
+def node_classes(cls: type = Node):
+    for subclass in cls.__subclasses__():
+        yield subclass
+        yield from node_classes(subclass)
+
 class Interpreter:
-    def visit(self, node: Node, context: Context):
-        method_name = f'visit_{type(node).__name__}'
-        debug_message.set_message(f"VISIT: {method_name}")
-        method = getattr(self, method_name, self.no_visit_method)
-        
-        return method(node, context)
+    # {NodeClass: visit method}, built once per interpreter class instead of looking the method up by name on every visit
+    dispatch: dict[type, object] = None
+
+    def __init__(self):
+        cls = type(self)
+        if cls.__dict__.get("dispatch") is None:
+            cls.dispatch = {
+                node_class: getattr(cls, f'visit_{node_class.__name__}')
+                for node_class in node_classes() if hasattr(cls, f'visit_{node_class.__name__}')
+            }
+
+    def visit(self, node: Node, context: Context) -> RunTimeResult:
+        # The visit methods return values and raise signals, the result is only made here for the callers
+        try:
+            return RunTimeResult().success(self.evaluate(node, context))
+        except RunTimeSignal as signal:
+            return signal.as_result()
+
+    def evaluate(self, node: Node, context: Context) -> Value:
+        method = self.dispatch.get(type(node))
+        if method is None:
+            return self.no_visit_method(node, context)
+
+        return method(self, node, context)
 
     def no_visit_method(self, node: Node, context: Context):
         raise Exception(NO_METHOD_DEFINED_ERROR.format(f"visit_{type(node).__name__}"))
@@ -35,30 +129,29 @@ class Interpreter:
     ###################################
 
     def visit_NumberNode(self, node: NumberNode, context: Context) -> Number:
-        return RunTimeResult().success(
-            Number(node.tok.value).set_context(
-                context).set_pos(node.pos_start, node.pos_end)
-        )
+        return Number(node.tok.value).set_context(
+            context).set_pos(node.pos_start, node.pos_end)
 
     def visit_StringNode(self, node: StringNode, context: Context) -> String:
-        return RunTimeResult().success(
-            String(node.tok.value).set_context(
-                context).set_pos(node.pos_start, node.pos_end)
-        )
+        return String(node.tok.value).set_context(
+            context).set_pos(node.pos_start, node.pos_end)
 
     def visit_ListNode(self, node: ListNode, context: Context) -> List:
-        res = RunTimeResult()
-        elements = []
+        elements = [self.evaluate(element_node, context) for element_node in node.element_nodes]
 
-        for element_node in node.element_nodes:
-            elements.append(res.register(self.visit(element_node, context)))
-            if res.should_return():
-                return res
+        return List(elements).set_context(context).set_pos(
+            node.pos_start, node.pos_end)
 
-        return res.success(
-            List(elements).set_context(context).set_pos(
-                node.pos_start, node.pos_end)
-        )
+    def visit_BlockNode(self, node: BlockNode, context: Context) -> List:
+        if node.should_return_null:
+            for statement_node in node.statement_nodes:
+                self.evaluate(statement_node, context)
+            return Null.null
+
+        elements = [self.evaluate(statement_node, context) for statement_node in node.statement_nodes]
+
+        return List(elements).set_context(context).set_pos(
+            node.pos_start, node.pos_end)
         
     def _make_var_name(self, node: VarAccessNode, context: Context):
         res = RunTimeResult()
@@ -81,14 +174,15 @@ class Interpreter:
         return var_full_name
         
     def visit_VarAccessNode(self, node: VarAccessNode, context: Context) -> Value:
-        res = RunTimeResult()
-        
         var_full_name: str = self._make_var_name(node, context)
         
-        value = context.symbol_table.get(var_full_name)
+        if node.address is not None:
+            value = context.symbol_table.lookup_slot(*node.address, var_full_name)
+        else:
+            value = context.symbol_table.lookup(var_full_name)
         
-        if not context.symbol_table.exists(var_full_name):
-            return res.failure(RunTimeError(
+        if value is None:
+            raise ErrorSignal(RunTimeError(
                 node.pos_start, node.pos_end,
                 IS_NOT_DEFINED_ERROR.format(var_full_name),
                 context
@@ -112,19 +206,41 @@ class Interpreter:
 
         #     value = child
         
-        value = value.copy().set_pos(node.pos_start, node.pos_end).set_context(context)
-        return res.success(value)
+        return value
         
     def visit_VarAssignNode(self, node: VarAssignNode, context: Context):
-        return self._var_assign(node, context)
+        value = self.evaluate(node.value_node, context)
+
+        return self._var_assign(node, context, value).unwrap()
     
     def visit_VarReassignNode(self, node: VarReassignNode, context: Context):
+        target = self._var_reassign_target(node, context).unwrap()
+        value = self.evaluate(node.value_node, context)
+
+        return self._var_reassign(node, context, target, value).unwrap()
+
+    def _var_reassign_target(self, node: VarReassignNode, context: Context):
+        # Finds how the variable was set, returns the (method, lifetime, type token) to reset it with
         res = RunTimeResult()
         
         var_full_name: str = self._make_var_name(node, context)
         
+        if node.address is not None:
+            entry = context.symbol_table.frame_entry(*node.address)
+            
+            # Already a variable of this scope, no need to look for it through the contexts
+            if entry is not None and entry[2] == "symbols":
+                return res.success(("reset", None, Token(TokenType.IDENTIFIER, entry[1].__qualname__)))
+        
         var_symbol_value_type, context_inst = context.exists_in(var_full_name)
         
+        if var_symbol_value_type in ("immutable_symbols", "builtin_symbols"):
+            return res.failure(RunTimeError(
+                node.pos_start, node.pos_end,
+                CANNOT_OVERWRITE_IMMUTABLE_BUILTIN_VAR_FUNC_ERROR.format(var_full_name),
+                context
+            ))
+        
         if var_symbol_value_type is not None:
             var_type = context_inst.symbol_table.get_type(var_full_name)
 
@@ -133,12 +249,12 @@ class Interpreter:
             lifetime = None
             
             if var_symbol_value_type == "temporary_symbols":
-                lifetime = getattr(context_inst.symbol_table, var_symbol_value_type)[var_full_name][2]
+                lifetime = context_inst.symbol_table.entries[var_full_name][3]
                 lifetime += -1
             
             var_value_type_token = Token(TokenType.IDENTIFIER, var_type.__qualname__)
             #! problem here with context
-            return self._var_reassign(node, context, method, lifetime, var_value_type_token)
+            return res.success((method, lifetime, var_value_type_token))
         else:
             return res.failure(RunTimeError(
                 node.pos_start, node.pos_end,
@@ -146,7 +262,7 @@ class Interpreter:
                 context
             ))
     
-    def _var_assign(self, node: VarAssignNode, context: Context):
+    def _var_assign(self, node: VarAssignNode, context: Context, value: Value):
         res = RunTimeResult()
         
         method = node.method
@@ -155,10 +271,6 @@ class Interpreter:
         var_full_name: str = self._make_var_name(node, context)
         
         var_type = make_value_type(node.var_value_type_tok.value)
-        value = res.register(self.visit(node.value_node, context))
-
-        if res.should_return():
-            return res
         
         if var_type is None:
             return res.failure(RunTimeError(
@@ -174,60 +286,34 @@ class Interpreter:
                 context
             ))
          
-        success, fail_type = getattr(context.symbol_table, method)(var_full_name, value, var_type) if lifetime is None else getattr(context.symbol_table, method)(var_full_name, value, var_type, lifetime)
+        if method == "set" and node.address is not None:
+            success, fail_type = context.symbol_table.set_slot(*node.address, var_full_name, value, var_type)
+        else:
+            success, fail_type = getattr(context.symbol_table, method)(var_full_name, value, var_type) if lifetime is None else getattr(context.symbol_table, method)(var_full_name, value, var_type, lifetime)
         
-        if success: return res.success(value)
-        elif fail_type == "const": 
-            return res.failure(RunTimeError(
-                node.pos_start, node.pos_end,
-                CANNOT_OVERWRITE_IMMUTABLE_BUILTIN_VAR_FUNC_ERROR.format(var_full_name),
-                context
-            ))
-        elif fail_type == "type": 
-            return res.failure(RunTimeError(
-                node.pos_start, node.pos_end,
-                VAR_TYPE_ALREADY_DECLARED_CANNOT_CHANGE_ERROR.format(var_full_name),
-                context
-            ))
-        else: 
-            return res.failure(RunTimeError(
-                node.pos_start, node.pos_end,
-                UNKNOWN_FAIL_TYPE_ERROR,
-                context
-            ))
+        return self._var_write_result(node, context, var_full_name, value, success, fail_type)
 
-    def _var_reassign(self, node: VarReassignNode, context: Context, method: str, lifetime: int, type_: Token):
+    def _var_reassign(self, node: VarReassignNode, context: Context, target: tuple, value: Value):
         res = RunTimeResult()
+        method, lifetime, type_ = target
         
         var_full_name: str = self._make_var_name(node, context)
         
         var_type = make_value_type(type_.value)
         var_assign = node.var_assign_type_tok
-        value = res.register(self.visit(node.value_node, context))
         
-        symbols_name = method.removeprefix("reset")+ ("_symbols" if method != "reset" else "symbols")
+        symbols_name = f"{method.removeprefix('reset_')}_symbols" if method != "reset" else "symbols"
 
         if context.symbol_table._exists(var_full_name, symbols_name) and var_assign.type != TokenType.EQUALS:
-            current_value = context.symbol_table.get(var_full_name)
-
-            if var_assign.type == TokenType.PLUSE:
-                value, error = current_value.added_to(value)
-            elif var_assign.type == TokenType.MINUSE:
-                value, error = current_value.subbed_by(value)
-            elif var_assign.type == TokenType.MULE:
-                value, error = current_value.multed_by(value)
-            elif var_assign.type == TokenType.DIVE:
-                value, error = current_value.dived_by(value)
-            elif var_assign.type == TokenType.POWERE:
-                value, error = current_value.powed_by(value)
-            elif var_assign.type == TokenType.DIVRESTE:
-                value, error = current_value.rest_of_dived_by(value)
+            if node.address is not None:
+                current_value = context.symbol_table.lookup_slot(*node.address, var_full_name)
+            else:
+                current_value = context.symbol_table.get(var_full_name)
+
+            value, error = binary_operation(current_value, value, REASSIGN_OPERATIONS[var_assign.type], None, node.value_node, context)
             
             if error:
                 return res.failure(error)
-
-        if res.should_return():
-            return res
         
         if var_type is None:
             return res.failure(RunTimeError(
@@ -243,8 +329,16 @@ class Interpreter:
                 context
             ))
          
-        success, fail_type = getattr(context.symbol_table, method)(var_full_name, value, var_type) if lifetime is None else getattr(context.symbol_table, method)(var_full_name, value, var_type, lifetime)
+        if method == "reset" and node.address is not None:
+            success, fail_type = context.symbol_table.set_slot(*node.address, var_full_name, value, var_type)
+        else:
+            success, fail_type = getattr(context.symbol_table, method)(var_full_name, value, var_type) if lifetime is None else getattr(context.symbol_table, method)(var_full_name, value, var_type, lifetime)
         
+        return self._var_write_result(node, context, var_full_name, value, success, fail_type)
+
+    def _var_write_result(self, node: Node, context: Context, var_full_name: str, value: Value, success: bool, fail_type: str):
+        res = RunTimeResult()
+
         if success: return res.success(value)
         elif fail_type == "const": 
             return res.failure(RunTimeError(
@@ -266,108 +360,69 @@ class Interpreter:
             ))
             
     def visit_BinOpNode(self, node: BinOpNode, context: Context):
-        res = RunTimeResult()
-        left = res.register(self.visit(node.left_node, context))
-        if res.should_return():
-            return res
-        right = res.register(self.visit(node.right_node, context))
-
-        if node.op_tok.type == TokenType.PLUS:
-            result, error = left.added_to(right)
-        elif node.op_tok.type == TokenType.MINUS:
-            result, error = left.subbed_by(right)
-        elif node.op_tok.type == TokenType.MUL:
-            result, error = left.multed_by(right)
-        elif node.op_tok.type == TokenType.DIV:
-            result, error = left.dived_by(right)
-        elif node.op_tok.type == TokenType.POWER:
-            result, error = left.powed_by(right)
-        elif node.op_tok.type == TokenType.DIVREST:
-            result, error = left.rest_of_dived_by(right)
-            
-        elif node.op_tok.type == TokenType.EE:
-            result, error = left.get_comparison_eq(right)
-        elif node.op_tok.type == TokenType.NE:
-            result, error = left.get_comparison_ne(right)
-        elif node.op_tok.type == TokenType.LT:
-            result, error = left.get_comparison_lt(right)
-        elif node.op_tok.type == TokenType.GT:
-            result, error = left.get_comparison_gt(right)
-        elif node.op_tok.type == TokenType.LTE:
-            result, error = left.get_comparison_lte(right)
-        elif node.op_tok.type == TokenType.GTE:
-            result, error = left.get_comparison_gte(right)
-        elif node.op_tok.matches(TokenType.KEYWORD, Keyword.AND):
-            result, error = left.anded_by(right)
-        elif node.op_tok.matches(TokenType.KEYWORD, Keyword.OR):
-            result, error = left.ored_by(right)
-            
-        elif node.op_tok.type == TokenType.DOT:
-            result, error = left.dotted(node.right_node)
+        left = self.evaluate(node.left_node, context)
 
-        if error:
-            return res.failure(error)
+        if node.op_tok.type == TokenType.DOT:
+            result, error = located(left, node.left_node, context).dotted(node.right_node)
         else:
-            return res.success(result.set_pos(node.pos_start, node.pos_end))
+            right = self.evaluate(node.right_node, context)
+            result, error = binary_operation(left, right, binary_operation_name(node.op_tok), node.left_node, node.right_node, context)
+
+        if error: raise ErrorSignal(error)
+        return result.set_pos(node.pos_start, node.pos_end)
+
+    def visit_LogicalOpNode(self, node: LogicalOpNode, context: Context):
+        left = self.evaluate(node.left_node, context)
+        result = getattr(left, SHORT_CIRCUITS[node.op_tok.value])()
+
+        if result is None:
+            right = self.evaluate(node.right_node, context)
+            result, error = binary_operation(left, right, binary_operation_name(node.op_tok), node.left_node, node.right_node, context)
+            if error: raise ErrorSignal(error)
+
+        return result.set_pos(node.pos_start, node.pos_end)
 
     def visit_UnaryOpNode(self, node: UnaryOpNode, context: Context):
-        res = RunTimeResult()
-        number = res.register(self.visit(node.node, context))
-        if res.should_return():
-            return res
+        number = self.evaluate(node.node, context)
+        number, error = self._unary_operation(node, number, context)
 
-        error = None
+        if error: raise ErrorSignal(error)
+        return number.set_pos(node.pos_start, node.pos_end)
+
+    def _unary_operation(self, node: UnaryOpNode, number: Value, context: Context):
+        result, error = number, None
 
         if node.op_tok.type == TokenType.MINUS:
-            number, error = number.multed_by(Number(-1))
+            result, error = number.multed_by(Number(-1))
+            if error: result, error = located(number, node.node, context).multed_by(Number(-1))
         elif node.op_tok.matches(TokenType.KEYWORD, Keyword.NOT):
-            number, error = number.notted()
+            result, error = number.notted()
+            if error: result, error = located(number, node.node, context).notted()
 
-        if error:
-            return res.failure(error)
-        else:
-            return res.success(number.set_pos(node.pos_start, node.pos_end))
+        return result, error
 
     def visit_IfNode(self, node: IfNode, context: Context):
-        res = RunTimeResult()
-
         for condition, expr, should_return_null in node.cases:
-            condition_value = res.register(self.visit(condition, context))
-            if res.should_return():
-                return res
-
-            if condition_value.is_true():
-                expr_value = res.register(self.visit(expr, context))
-                if res.should_return():
-                    return res
-                return res.success(Null.null if should_return_null else expr_value)
+            if self.evaluate(condition, context).is_true():
+                expr_value = self.evaluate(expr, context)
+                return Null.null if should_return_null else expr_value
 
         if node.else_case:
             expr, should_return_null = node.else_case
-            expr_value = res.register(self.visit(expr, context))
-            if res.should_return():
-                return res
-            return res.success(Null.null if should_return_null else expr_value)
+            expr_value = self.evaluate(expr, context)
+            return Null.null if should_return_null else expr_value
 
-        return res.success(Null.null)
+        return Null.null
 
     def visit_ForNode(self, node: ForNode, context: Context):
-        res = RunTimeResult()
-        elements = []
+        # The values of the iterations are only kept when the loop's value is used
+        elements = None if node.should_return_null else []
 
-        start_value = res.register(self.visit(node.start_value_node, context))
-        if res.should_return():
-            return res
-
-        end_value = res.register(self.visit(node.end_value_node, context))
-        if res.should_return():
-            return res
+        start_value = self.evaluate(node.start_value_node, context)
+        end_value = self.evaluate(node.end_value_node, context)
 
         if node.step_value_node:
-            step_value = res.register(
-                self.visit(node.step_value_node, context))
-            if res.should_return():
-                return res
+            step_value = self.evaluate(node.step_value_node, context)
         else:
             step_value = Number(1)
 
@@ -378,78 +433,99 @@ class Interpreter:
         else:
             def condition(): return i > end_value.value
 
+        profile = context.profile
         while condition():
-            context.symbol_table.set(node.var_name_tok.value, Number(i), Number)
+            if profile: profile.loop_iterations += 1
+            if node.var_address is not None:
+                context.symbol_table.set_slot(*node.var_address, node.var_name_tok.value, Number(i), Number)
+            else:
+                context.symbol_table.set(node.var_name_tok.value, Number(i), Number)
             i += step_value.value
 
-            value = res.register(self.visit(node.body_node, context))
-            if res.should_return() and res.loop_should_continue == False and res.loop_should_break == False:
-                return res
-
-            if res.loop_should_continue:
+            try:
+                value = self.evaluate(node.body_node, context)
+            except ContinueSignal:
                 continue
-
-            if res.loop_should_break:
+            except BreakSignal:
                 break
 
-            elements.append(value)
+            if elements is not None: elements.append(value)
 
-        return res.success(
+        return (
             Null.null if node.should_return_null else
             List(elements).set_context(context).set_pos(
                 node.pos_start, node.pos_end)
         )
 
-    def visit_WhileNode(self, node: WhileNode, context: Context):
-        res = RunTimeResult()
-        elements = []
+    def visit_ForEachNode(self, node: ForEachNode, context: Context):
+        elements = None if node.should_return_null else []
 
-        while True:
-            condition = res.register(self.visit(node.condition_node, context))
-            if res.should_return():
-                return res
+        iterator, error = iterate(self.evaluate(node.iterable_node, context), node, context)
+        if error: raise ErrorSignal(error)
 
-            if not condition.is_true():
-                break
+        var_name, var_address = node.var_name_tok.value, node.var_address
+        symbol_table = context.symbol_table
+        profile = context.profile
 
-            value = res.register(self.visit(node.body_node, context))
-            if res.should_return() and res.loop_should_continue == False and res.loop_should_break == False:
-                return res
+        # The variable can hold any type of value, each element is written to it as it is
+        for element in iterator:
+            if profile: profile.loop_iterations += 1
+            if var_address is not None:
+                symbol_table.set_slot(*var_address, var_name, element, Value)
+            else:
+                symbol_table.set(var_name, element, Value)
 
-            if res.loop_should_continue:
+            try:
+                value = self.evaluate(node.body_node, context)
+            except ContinueSignal:
                 continue
+            except BreakSignal:
+                break
+
+            if elements is not None: elements.append(value)
+
+        return (
+            Null.null if node.should_return_null else
+            List(elements).set_context(context).set_pos(
+                node.pos_start, node.pos_end)
+        )
+
+    def visit_WhileNode(self, node: WhileNode, context: Context):
+        elements = None if node.should_return_null else []
+        profile = context.profile
 
-            if res.loop_should_break:
+        while self.evaluate(node.condition_node, context).is_true():
+            if profile: profile.loop_iterations += 1
+
+            try:
+                value = self.evaluate(node.body_node, context)
+            except ContinueSignal:
+                continue
+            except BreakSignal:
                 break
 
-            elements.append(value)
+            if elements is not None: elements.append(value)
 
-        return res.success(
+        return (
             Null.null if node.should_return_null else
             List(elements).set_context(context).set_pos(
                 node.pos_start, node.pos_end)
         )
 
     def visit_ClassNode(self, node: ClassNode, context: Context):
-        res = RunTimeResult()
-        
         class_name = node.class_name_tok.value
         body_node = node.body_node
         
         ctx = Context(class_name, context, node.pos_start)
-        ctx.symbol_table = SymbolTable(context.symbol_table)
+        ctx.symbol_table = SymbolTable(context.symbol_table, node.layout)
 
-        res.register(self.visit(body_node, ctx))
-        if res.should_return():
-            return res
+        self.evaluate(body_node, ctx)
 
         class_value = Class(class_name, body_node, ctx.symbol_table).set_context(context).set_pos(node.pos_start, node.pos_end)
         context.symbol_table.set_as_immutable(class_name, class_value, Class)
-        return res.success(class_value)
+        return class_value
     
     def visit_FuncDefNode(self, node: FuncDefNode, context: Context):
-        res = RunTimeResult()
-
         func_name_tok = node.func_name_tok
         
         func_full_name: str = func_name_tok.value if func_name_tok else None
@@ -460,51 +536,40 @@ class Interpreter:
         arg_types = [make_value_type(arg_type.value) for arg_type in node.arg_type_toks]
         arg_default_values = [make_value(arg_default_value.value) for arg_default_value in node.arg_default_value_toks]
         
-        func_value = Function(func_full_name, body_node, arg_names, arg_types, arg_default_values, node.should_auto_return).set_context(context).set_pos(node.pos_start, node.pos_end)
+        func_value = Function(func_full_name, body_node, arg_names, arg_types, arg_default_values, node.should_auto_return, node.layout, node.is_generator).set_context(context).set_pos(node.pos_start, node.pos_end)
 
         if func_name_tok:
             context.symbol_table.set(func_full_name, func_value, Function)
 
-        return res.success(func_value)
+        return func_value
 
     def visit_CallNode(self, node: CallNode, context: Context):
-        res = RunTimeResult()
-        args = []
-
-        value_to_call = res.register(self.visit(node.node_to_call, context))
-        if res.should_return():
-            return res
-        value_to_call = value_to_call.copy().set_pos(node.pos_start, node.pos_end)
-
-        for arg_node in node.arg_nodes:
-            args.append(res.register(self.visit(arg_node, context)))
-            if res.should_return():
-                return res
+        value_to_call = self.evaluate(node.node_to_call, context)
+        args = [self.evaluate(arg_node, context) for arg_node in node.arg_nodes]
 
-        return_value = res.register(value_to_call.execute(args))
-        
-        if res.should_return():
-            return res
-        
-        return_value = return_value.copy().set_pos(
-            node.pos_start, node.pos_end).set_context(context)
-        
-        return res.success(return_value)
+        # Functions still return a result, a return, continue or break of the callee goes on from here
+        return call_value(value_to_call, args, node, context).unwrap()
 
     def visit_ReturnNode(self, node: ReturnNode, context: Context):
-        res = RunTimeResult()
-
         if node.node_to_return:
-            value = res.register(self.visit(node.node_to_return, context))
-            if res.should_return():
-                return res
+            value = self.evaluate(node.node_to_return, context)
         else:
             value = Null.null
 
-        return res.success_return(value)
+        # A falsy value doesn't stop the function, the statement is then worth nothing
+        if value: raise ReturnSignal(value)
+        return None
+
+    def visit_YieldNode(self, node: YieldNode, context: Context):
+        # A generator's body is only suspended at the yields it runs as statements, see GeneratorInterpreter
+        raise ErrorSignal(RunTimeError(
+            node.pos_start, node.pos_end,
+            CANNOT_YIELD_HERE_ERROR,
+            context
+        ))
 
     def visit_ContinueNode(self, node: ContinueNode, context: Context):
-        return RunTimeResult().success_continue()
+        raise ContinueSignal()
 
     def visit_BreakNode(self, node: BreakNode, context: Context):
-        return RunTimeResult().success_break()
+        raise BreakSignal()
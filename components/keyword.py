@@ -20,10 +20,12 @@ class Keyword(Enum):
     
     # Loops
     FOR = "for"
+    IN = "in"
     WHILE = "while"
     CONTINUE = "continue"
     BREAK = "break"
     
     # Other
     RETURN = "return"
+    YIELD = "yield"
     SELFREF = "self"
\ No newline at end of file
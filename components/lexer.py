@@ -1,307 +1,246 @@
 from .error import IllegalCharError, ExpectedCharError, Error
-from .token import TokenType, Token
+from .token import TokenType, TokenStream, Kind, KINDS
 from .keyword import Keyword
-from .position import Position
+from .position import Source, Position
 from string import ascii_letters
+from re import compile as re_compile, escape as re_escape
 
 DIGITS = "0123456789"
 LETTERS = ascii_letters
 SPECIAL_CHARACTERS = "&|_"
 LETTERS_DIGITS = LETTERS + DIGITS
 
+# Single characters, their token ends right after them
+BASIC_TOKENS = {
+    token_type.value: KINDS[token_type] for token_type in (
+        TokenType.LPAREN, TokenType.RPAREN,
+        TokenType.LSQUARE, TokenType.RSQUARE,
+        TokenType.LBRACE, TokenType.RBRACE,
+        TokenType.COMMA, TokenType.NEWLINE, TokenType.SEMICOLON,
+        TokenType.COLON, TokenType.DOT,
+    )
+}
+
+# Operators, like identifiers, numbers and strings their token ends where the lexer stopped
+OPERATOR_TOKENS = {
+    token_type.value: KINDS[token_type] for token_type in (
+        TokenType.PLUS, TokenType.PLUSE,
+        TokenType.MINUS, TokenType.ARROW, TokenType.MINUSE,
+        TokenType.MUL, TokenType.POWER, TokenType.POWERE, TokenType.MULE,
+        TokenType.DIV, TokenType.DIVE,
+        TokenType.DIVREST, TokenType.DIVRESTE,
+        TokenType.EQUALS, TokenType.EE, TokenType.NE,
+        TokenType.LT, TokenType.LTE,
+        TokenType.GT, TokenType.GTE,
+    )
+}
+
+ESCAPE_CHARS = {
+    "n": "\n",   # Newline
+    "t": "\t",   # Tab
+    "\\": "\\",  # Backslash
+    "\"": "\"",  # Double quote
+    "r": "\r",   # Carriage return
+    "b": "\b",   # Backspace
+    "f": "\f",   # Form feed
+    "0": "\0",   # Null character
+    "v": "\v"   # Vertical tab
+}
+
+def _alternatives(strings) -> str:
+    # Longest first, so '**=' is matched before '**' and '*'
+    return "|".join(re_escape(string) for string in sorted(strings, key=len, reverse=True))
+
+NEWLINE = TokenType.NEWLINE.value
+QUOTE = TokenType.STRING.value
+ELSE = Keyword.ELSE.value
+KEYWORDS = Keyword._value2member_map_
+
+IDENTIFIER_START = re_escape(LETTERS + SPECIAL_CHARACTERS)
+IDENTIFIER_CHARS = re_escape(LETTERS_DIGITS + "_" + SPECIAL_CHARACTERS)
+
+# One match per token along with the spaces before it, strings and comments are only started by it
+SPACES_REGEX = re_compile(r"[ \t]*")
+TOKEN_REGEX = re_compile(SPACES_REGEX.pattern + "(?:" + "|".join([
+    rf"(?P<identifier>[{IDENTIFIER_START}][{IDENTIFIER_CHARS}]*)",
+    r"(?P<number>[0-9]+(?:\.[0-9]*)?)",
+    rf"(?P<operator>{_alternatives(OPERATOR_TOKENS)})",
+    rf"(?P<basic>{_alternatives(BASIC_TOKENS)})",
+    rf"(?P<string>{re_escape(QUOTE)})",
+    rf"(?P<comment>{re_escape(TokenType.COMMENT.value)})",
+    rf"(?P<not>{re_escape(TokenType.NE.value[0])})",
+]) + ")")
+IDENTIFIER_REGEX = re_compile(rf"[{IDENTIFIER_CHARS}]*")
+STRING_STOP_REGEX = re_compile(rf'{re_escape(QUOTE)}|\\')
+COMMENT_SIGNS_REGEX = re_compile(rf"{re_escape(TokenType.COMMENT.value)}*")
+
+# Scans the source with the regexes above instead of one character at a time into a TokenStream,
+# where tokens are only a kind, a value and offsets in the shared Source. Every token whose end was
+# the lexer's own position (operators, identifiers, numbers and strings) shares self.pos, which is
+# left where the lexer stopped, so tokens and errors get the same positions they always had.
+
 class Lexer:
     def __init__(self, fn: str, text: str, calling_external_code: bool):
         self.fn = fn
         self.text = text
-        self.pos = Position(-1, 0, -1, fn, text)
-        self.current_char: str = None
+        self.source = Source(fn, text)
+        self.pos = Position(0, self.source)
         self.calling_external_code = calling_external_code
-        self.advance()
 
-    def advance(self):
-        self.pos.advance(self.current_char)
-        self.current_char = self.text[self.pos.idx] if self.pos.idx < len(
-            self.text) else None
+    def stop(self, idx: int):
+        # The lexer can end past the text, after an unterminated string or a comment on the last line
+        self.pos.idx = idx
 
     def make_tokens(self):
-        tokens = []
-        
         if not self.fn.endswith(".nkt") and self.calling_external_code:
             return None, Error(self.pos, self.pos, "LoadingError", "Script file extension must be .nkt")
-        
-        basic_tokens = {
-            TokenType.LPAREN.value: TokenType.LPAREN,
-            TokenType.RPAREN.value: TokenType.RPAREN,
-            TokenType.LSQUARE.value: TokenType.LSQUARE,
-            TokenType.RSQUARE.value: TokenType.RSQUARE,
-            TokenType.LBRACE.value: TokenType.LBRACE,
-            TokenType.RBRACE.value: TokenType.RBRACE,
-            TokenType.COMMA.value: TokenType.COMMA,
-            TokenType.NEWLINE.value: TokenType.NEWLINE,
-            TokenType.SEMICOLON.value: TokenType.SEMICOLON,
-            TokenType.COLON.value: TokenType.COLON,
-            TokenType.DOT.value: TokenType.DOT,
-        }
-        
-        advanced_tokens = {
-            TokenType.PLUS.value: self.make_plus, # Also checks for '+='
-            TokenType.MINUS.value: self.make_minus, # Also checks for '->', '-='
-            TokenType.MUL.value: self.make_multiplier, # Also checks for '*=', '**', '**='
-            TokenType.DIV.value: self.make_div, # Also checks for '/='
-            TokenType.DIVREST.value: self.make_divrest, # Also checks for '%='
-            TokenType.EQUALS.value: self.make_equals, # Also checks for '=='
-            TokenType.LT.value: self.make_less_than, # Also checks for '<='
-            TokenType.GT.value: self.make_greater_than, # Also checks for '>='
-            TokenType.STRING.value: self.make_string
-        }
-        
-        no_return_tokens = {
-            TokenType.COMMENT.value: self.skip_comment
-        }
-        
-        while self.current_char != None:
-            if self.current_char in " \t":
-                self.advance()
-                
-            elif self.current_char in LETTERS or self.current_char in SPECIAL_CHARACTERS:
-                tokens.append(self.make_identifier())
-                
-            elif self.current_char in DIGITS:
-                tokens.append(self.make_number())
-                
-            elif self.current_char in basic_tokens:
-                tokens.append(Token(basic_tokens[self.current_char], pos_start=self.pos))
-                self.advance()
-
-            elif self.current_char in advanced_tokens:
-                tokens.append(advanced_tokens[self.current_char]())
-
-            elif self.current_char in no_return_tokens:
-                no_return_tokens[self.current_char]()
-                            
-            elif self.current_char == TokenType.NE.value[0]:
-                tok, error = self.make_not_equals()
-                if error: return [], error
-                tokens.append(tok)
-                
-            else:
-                pos_start = self.pos.copy()
-                char = self.current_char
-                self.advance()
-                return [], IllegalCharError(pos_start, self.pos, f"'{char}'")
 
-        tokens.append(Token(TokenType.EOF, pos_start=self.pos))
+        tokens = TokenStream(self.source, self.pos)
+        for _ in self.lex(tokens): pass
+
+        if tokens.error: return [], tokens.error
         return tokens, None
 
-    def make_plus(self):
-        tok_type = TokenType.PLUS
-        pos_start = self.pos.copy()
-        self.advance()
-        
-        if self.current_char == TokenType.EQUALS.value:
-                self.advance()
-                tok_type = TokenType.PLUSE
-            
-        return Token(tok_type, pos_start=pos_start, pos_end=self.pos)
-    
-    def make_minus(self):
-        tok_type = TokenType.MINUS
-        pos_start = self.pos.copy()
-        self.advance()
-        
-        if self.current_char == TokenType.ARROW.value[-1]:
-            self.advance()
-            tok_type = TokenType.ARROW
-            
-        elif self.current_char == TokenType.EQUALS.value:
-                self.advance()
-                tok_type = TokenType.MINUSE
-            
-        return Token(tok_type, pos_start=pos_start, pos_end=self.pos)
-    
-    def make_multiplier(self):
-        tok_type = TokenType.MUL
-        pos_start = self.pos.copy()
-        self.advance()
-        
-        if self.current_char == TokenType.MUL.value:
-            self.advance()
-            tok_type = TokenType.POWER
-            
-            if self.current_char == TokenType.EQUALS.value:
-                self.advance()
-                tok_type = TokenType.POWERE
-                
-        elif self.current_char == TokenType.EQUALS.value:
-                self.advance()
-                tok_type = TokenType.MULE
-            
-        return Token(tok_type, pos_start=pos_start, pos_end=self.pos)
-    
-    def make_div(self):
-        tok_type = TokenType.DIV
-        pos_start = self.pos.copy()
-        self.advance()
-        
-        if self.current_char == TokenType.EQUALS.value:
-                self.advance()
-                tok_type = TokenType.DIVE
-            
-        return Token(tok_type, pos_start=pos_start, pos_end=self.pos)
-    
-    def make_divrest(self):
-        tok_type = TokenType.DIVREST
-        pos_start = self.pos.copy()
-        self.advance()
-        
-        if self.current_char == TokenType.EQUALS.value:
-                self.advance()
-                tok_type = TokenType.DIVRESTE
-            
-        return Token(tok_type, pos_start=pos_start, pos_end=self.pos)
-    
-    def make_number(self):
-        num_str = ""
-        dot_count = 0
-        pos_start = self.pos.copy()
-
-        while self.current_char != None and self.current_char in DIGITS + ".":
-            if self.current_char == ".":
-                if dot_count == 1:
-                    break
-                dot_count += 1
-                num_str += "."
-            else:
-                num_str += self.current_char
-            self.advance()
+    def stream_tokens(self):
+        # Tokens are only lexed as the parser reaches them, a line at a time
+        if not self.fn.endswith(".nkt") and self.calling_external_code:
+            return None, Error(self.pos, self.pos, "LoadingError", "Script file extension must be .nkt")
 
-        if dot_count == 0:
-            return Token(TokenType.INT, int(num_str), pos_start, self.pos)
-        else:
-            return Token(TokenType.FLOAT, float(num_str), pos_start, self.pos)
-
-    def make_string(self):
-        string = ""
-        pos_start = self.pos.copy()
-        escape_char = False
-        self.advance()
-
-        escape_chars = {
-            "n": "\n",   # Newline
-            "t": "\t",   # Tab
-            "\\": "\\",  # Backslash
-            "\"": "\"",  # Double quote
-            "r": "\r",   # Carriage return
-            "b": "\b",   # Backspace
-            "f": "\f",   # Form feed
-            "0": "\0",   # Null character
-            "v": "\v"   # Vertical tab
-        }
-
-        while self.current_char != None and (self.current_char != TokenType.STRING.value or escape_char):
-            if escape_char:
-                string += escape_chars.get(self.current_char, self.current_char)
-                escape_char = False
-            else:
-                if self.current_char == "\\":
-                    escape_char = True
+        tokens = TokenStream(self.source, self.pos)
+        tokens.feed = self.lex(tokens)
+        return tokens, None
+
+    def fail(self, tokens: TokenStream, error: Error):
+        # The stream ends where the error starts, so a parser reading it stops there
+        tokens.error = error
+        tokens.append(Kind.EOF, None, error.pos_start.idx, error.pos_start.idx + 1)
+
+    def lex(self, tokens: TokenStream):
+        append = tokens.append
+        text = self.text
+        text_len = len(text)
+        idx = 0
+
+        while idx < text_len:
+            match = TOKEN_REGEX.match(text, idx)
+
+            if match is None:
+                idx = SPACES_REGEX.match(text, idx).end()
+                if idx == text_len: break
+
+                pos_start = Position(idx, self.source)
+                self.stop(idx + 1)
+                return self.fail(tokens, IllegalCharError(pos_start, self.pos, f"'{text[idx]}'"))
+
+            kind = match.lastgroup
+            idx = match.start(kind)
+
+            if kind == "identifier":
+                idx = self.make_identifier(tokens, match)
+
+            elif kind == "number":
+                num_str = match.group(kind)
+                if "." in num_str:
+                    append(Kind.FLOAT, float(num_str), idx)
                 else:
-                    string += self.current_char
-                    
-            self.advance()
-            
-
-        self.advance()
-        return Token(TokenType.STRING, string, pos_start, self.pos)
-
-    def make_identifier(self):
-        id_str = ""
-        pos_start = self.pos.copy()
-        
-        reversed_keyword_dict = Keyword._value2member_map_
-        
-        while self.current_char != None and self.current_char in LETTERS_DIGITS + "_" + SPECIAL_CHARACTERS:
-            id_str += self.current_char
-            self.advance()
-            
-            if self.current_char == " " and id_str == Keyword.ELSE.value:
-                self.advance()
-                if self.current_char == "i":
-                    id_str += " "
-            
-        tok_type = TokenType.KEYWORD if id_str in reversed_keyword_dict else TokenType.IDENTIFIER
-        tok_value = reversed_keyword_dict[id_str] if id_str in reversed_keyword_dict else id_str
-        
-        return Token(tok_type, tok_value, pos_start=pos_start, pos_end=self.pos)
-
-    def make_equals(self):
-        tok_type = TokenType.EQUALS
-        pos_start = self.pos.copy()
-        self.advance()
-        
-        if self.current_char == TokenType.EQUALS.value:
-            self.advance()
-            tok_type = TokenType.EE
-            
-        return Token(tok_type, pos_start=pos_start, pos_end=self.pos)
-            
-    def make_not_equals(self):
-        pos_start = self.pos.copy()
-        self.advance()
-        
-        if self.current_char == TokenType.EQUALS.value:
-            self.advance()
-            return Token(TokenType.NE, pos_start=pos_start, pos_end=self.pos), None
-        
-        self.advance()
-        return None, ExpectedCharError(pos_start, self.pos, "'=' (after '!')")
-    
-    def make_less_than(self):
-        tok_type = TokenType.LT
-        pos_start = self.pos.copy()
-        self.advance()
-        
-        if self.current_char == TokenType.EQUALS.value:
-            self.advance()
-            tok_type = TokenType.LTE
-            
-        return Token(tok_type, pos_start=pos_start, pos_end=self.pos)
-
-    def make_greater_than(self):
-        tok_type = TokenType.GT
-        pos_start = self.pos.copy()
-        self.advance()
-        
-        if self.current_char == TokenType.EQUALS.value:
-            self.advance()
-            tok_type = TokenType.GTE
-            
-        return Token(tok_type, pos_start=pos_start, pos_end=self.pos)
-            
-    def skip_comment(self):
-        sign_count = 0
-        for _ in range(3):
-            if self.current_char == TokenType.COMMENT.value:
-                sign_count += 1
-            self.advance()
-            if self.current_char != TokenType.COMMENT.value: break
-        
-        block_mode = sign_count == 3
-        check_pass = 0
-        
-        while True:
-            self.advance()
-            
-            if not block_mode:
-                if self.current_char is None or self.current_char == TokenType.NEWLINE.value: break
-                
+                    append(Kind.INT, int(num_str), idx)
+                idx = match.end()
+
+            elif kind == "operator":
+                append(OPERATOR_TOKENS[match.group(kind)], None, idx)
+                idx = match.end()
+
+            elif kind == "basic":
+                char = text[idx]
+                append(BASIC_TOKENS[char], None, idx, idx + 1)
+                idx += 1
+
+                # Lexed so far, the tokens ending at the lexer's position end here until the next line is lexed
+                if char == NEWLINE:
+                    self.stop(idx)
+                    yield
+
+            elif kind == "string":
+                idx = self.make_string(tokens, idx)
+
+            elif kind == "comment":
+                idx = self.skip_comment(idx)
+
             else:
-                if self.current_char == TokenType.COMMENT.value:
-                    check_pass += 1
-                elif check_pass >= 3: break
-                else: check_pass = 0
-            
-                if self.current_char is None: break
-
-        self.advance()
-        
\ No newline at end of file
+                # '!' not followed by '=', the character after it is skipped too
+                pos_start = Position(idx, self.source)
+                self.stop(idx + 2)
+                return self.fail(tokens, ExpectedCharError(pos_start, self.pos, "'=' (after '!')"))
+
+        self.stop(idx)
+        append(Kind.EOF, None, idx, idx + 1)
+
+    def make_identifier(self, tokens: TokenStream, match):
+        id_str = match.group("identifier")
+        start = match.start("identifier")
+        idx = match.end()
+
+        # A single space after 'else' is skipped, and kept when an 'if' follows it
+        if id_str == ELSE and self.text.startswith(" ", idx):
+            idx += 1
+            if self.text.startswith("i", idx):
+                id_str += " "
+
+            rest = IDENTIFIER_REGEX.match(self.text, idx)
+            id_str += rest.group()
+            idx = rest.end()
+
+        keyword = KEYWORDS.get(id_str)
+        if keyword is not None:
+            tokens.append(Kind.KEYWORD, keyword, start)
+        else:
+            tokens.append(Kind.IDENTIFIER, id_str, start)
+        return idx
+
+    def make_string(self, tokens: TokenStream, idx: int):
+        text = self.text
+        start = idx
+        parts = []
+        idx += 1
+
+        while True:
+            match = STRING_STOP_REGEX.search(text, idx)
+
+            # Unterminated, the lexer ends one past the text
+            if match is None:
+                parts.append(text[idx:])
+                idx = len(text) + 1
+                break
+
+            stop = match.start()
+            parts.append(text[idx:stop])
+
+            if text[stop] == QUOTE:
+                idx = stop + 1
+                break
+
+            # Escaped character, a backslash ending the text ends the string
+            if stop + 1 >= len(text):
+                idx = len(text) + 1
+                break
+
+            parts.append(ESCAPE_CHARS.get(text[stop + 1], text[stop + 1]))
+            idx = stop + 2
+
+        tokens.append(Kind.STRING, "".join(parts), start)
+        return idx
+
+    def skip_comment(self, idx: int):
+        # '#' to the end of the line, '###' to the next '###', either also skips the character after it
+        text = self.text
+        sign_count = min(COMMENT_SIGNS_REGEX.match(text, idx).end() - idx, 3)
+        after_signs = idx + sign_count + 1
+
+        if sign_count < 3:
+            end = text.find(NEWLINE, after_signs)
+            if end < 0: end = len(text)
+        else:
+            end = text.find(TokenType.COMMENTBLOCK.value, after_signs)
+            end = len(text) if end < 0 else COMMENT_SIGNS_REGEX.match(text, end).end()
+
+        return max(end, after_signs) + 1
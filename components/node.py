@@ -6,6 +6,9 @@ from .position import Position
 debug_message = DebugMessage("")
 
 class Node:
+    # Set by the parser on statements and blocks with a yield somewhere in them
+    yields = False
+
     def __init__(self, tok: Token = None, pos_start: Position = None, pos_end: Position = None, should_return_null: bool = False):
         self.tok = tok
 
@@ -15,10 +18,18 @@ class Node:
         self.should_return_null = should_return_null
         
         self.child = None
-
-        self.display = self.tok
         
-        debug_message.set_message(f"NODE: CREATED: {self}").display()
+        if debug_message.enabled: debug_message.set_message("NODE: CREATED: {}", self).display()
+
+    @property
+    def display(self):
+        # Only made when the node is shown, each node would otherwise hold the text of every node under it
+        return self.tok
+
+    def discard(self):
+        # The node's value is never used, the engines then run it without keeping any value and it's worth null
+        self.should_return_null = True
+        return self
 
     def __repr__(self):
         return f"<{self.__class__.__name__}:{self.display}>"
@@ -39,10 +50,25 @@ class ListNode(Node):
     def __repr__(self):
         return f"<{self.__class__.__name__}:{len(self.element_nodes)}>"
 
+class BlockNode(Node):
+    # Statements of the program or of a body, worth the list of their values unless discarded
+    def __init__(self, statement_nodes: list[Node], pos_start: Position, pos_end: Position):
+        self.statement_nodes = statement_nodes
+        super().__init__(None, pos_start, pos_end)
+
+    def discard(self):
+        for statement_node in self.statement_nodes:
+            statement_node.discard()
+        return super().discard()
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}:{len(self.statement_nodes)}>"
+
 class VarAccessNode(Node):
     def __init__(self, var_name_tok: Token, var_extra_names_toks: list[Token] = []):
         self.var_name_tok = var_name_tok
         self.var_extra_names_toks = var_extra_names_toks
+        self.address: tuple[int, int] = None
         super().__init__(var_name_tok)
 
 class VarAssignNode(Node):
@@ -54,16 +80,21 @@ class VarAssignNode(Node):
         self.lifetime = lifetime
         self.var_assign_type_tok = var_assign_type_tok
         self.value_node = value_node
+        self.address: tuple[int, int] = None
         super().__init__(var_name_tok, pos_end = value_node.pos_end)
-        self.display = f"{self.var_name_tok}:{self.var_value_type_tok.value}:{self.value_node}"
         # self.pos_end = self.value_node.pos_end
 
+    @property
+    def display(self):
+        return f"{self.var_name_tok}:{self.var_value_type_tok.value}:{self.value_node}"
+
 class VarReassignNode(Node):
     def __init__(self, var_name_tok: Token, var_extra_names_toks: list[Token], value_node: Node, var_assign_type_tok: Token):
         self.var_name_tok = var_name_tok
         self.var_extra_names_toks = var_extra_names_toks
         self.value_node = value_node
         self.var_assign_type_tok = var_assign_type_tok
+        self.address: tuple[int, int] = None
         super().__init__(var_name_tok, pos_end = value_node.pos_end)
         # self.pos_end = self.value_node.pos_end
 
@@ -73,18 +104,28 @@ class BinOpNode(Node):
         self.op_tok = op_tok
         self.right_node = right_node
         super().__init__(op_tok, left_node.pos_start, right_node.pos_end)
-        self.display = f"({self.left_node}, {self.op_tok}, {self.right_node})"
         # self.pos_start = self.left_node.pos_start
         # self.pos_end = self.right_node.pos_end
 
+    @property
+    def display(self):
+        return f"({self.left_node}, {self.op_tok}, {self.right_node})"
+
+class LogicalOpNode(BinOpNode):
+    # && and ||, the right side is only run when the left side doesn't decide the result
+    pass
+
 class UnaryOpNode(Node):
     def __init__(self, op_tok: Token, node: Node):
         self.op_tok = op_tok
         self.node = node
         super().__init__(op_tok, pos_end = node.pos_end)
-        self.display = f"({self.op_tok}, {self.node})"
         # self.pos_end = self.node.pos_end
 
+    @property
+    def display(self):
+        return f"({self.op_tok}, {self.node})"
+
 class IfNode(Node):
     def __init__(self, cases: tuple[tuple[Token]], else_case: tuple):
         self.cases = cases
@@ -92,6 +133,12 @@ class IfNode(Node):
         super().__init__(cases[0][0], pos_end = (else_case or cases[len(cases) - 1])[0].pos_end)
         # self.pos_end = (else_case or self.cases[len(self.cases) - 1])[0].pos_end
 
+    def discard(self):
+        self.cases = [(condition, expr.discard(), True) for condition, expr, _ in self.cases]
+        if self.else_case:
+            self.else_case = (self.else_case[0].discard(), True)
+        return super().discard()
+
 class ForNode(Node):
     def __init__(self, var_name_tok: Token, start_value_node: Node, end_value_node: Node, step_value_node: Node, body_node: Node, should_return_null: bool):
         self.var_name_tok = var_name_tok
@@ -99,9 +146,26 @@ class ForNode(Node):
         self.end_value_node = end_value_node
         self.step_value_node = step_value_node
         self.body_node = body_node
+        self.var_address: tuple[int, int] = None
         super().__init__(var_name_tok, pos_end = body_node.pos_end, should_return_null = should_return_null)
         # self.pos_end = self.body_node.pos_end
 
+    def discard(self):
+        self.body_node.discard()
+        return super().discard()
+
+class ForEachNode(Node):
+    def __init__(self, var_name_tok: Token, iterable_node: Node, body_node: Node, should_return_null: bool):
+        self.var_name_tok = var_name_tok
+        self.iterable_node = iterable_node
+        self.body_node = body_node
+        self.var_address: tuple[int, int] = None
+        super().__init__(var_name_tok, pos_end = body_node.pos_end, should_return_null = should_return_null)
+
+    def discard(self):
+        self.body_node.discard()
+        return super().discard()
+
 class WhileNode(Node):
     def __init__(self, condition_node: Node, body_node: Node, should_return_null: bool):
         self.condition_node = condition_node
@@ -109,25 +173,32 @@ class WhileNode(Node):
         super().__init__(condition_node, pos_end = body_node.pos_end, should_return_null = should_return_null)
         # self.pos_end = self.body_node.pos_end
 
+    def discard(self):
+        self.body_node.discard()
+        return super().discard()
+
 class ObjectNode(Node):
     def __init__(self, element_nodes: list[Node]):
         self.element_nodes = element_nodes
         super().__init__()
 
 class ClassNode(Node):
-    def __init__(self, class_name_tok: Token, body_node: ListNode, pos_start: Position, pos_end: Position):
+    def __init__(self, class_name_tok: Token, body_node: BlockNode, pos_start: Position, pos_end: Position):
         self.class_name_tok = class_name_tok
         self.body_node = body_node
+        self.layout: dict[str, int] = None
         super().__init__(class_name_tok, pos_start, pos_end)
         
 class FuncDefNode(Node):
-    def __init__(self, func_name_tok: Token, arg_name_toks: list[Token], arg_type_toks: list[Token], arg_default_value_toks: list[Token], body_node: ListNode, should_auto_return: bool):
+    def __init__(self, func_name_tok: Token, arg_name_toks: list[Token], arg_type_toks: list[Token], arg_default_value_toks: list[Token], body_node: BlockNode, should_auto_return: bool, is_generator: bool = False):
         self.func_name_tok = func_name_tok
         self.arg_name_toks = arg_name_toks
         self.arg_type_toks = arg_type_toks
         self.arg_default_value_toks = arg_default_value_toks
         self.body_node = body_node
         self.should_auto_return = should_auto_return
+        self.is_generator = is_generator
+        self.layout: dict[str, int] = None
         
         if self.func_name_tok:
             to_tok_base = self.func_name_tok
@@ -157,6 +228,13 @@ class ReturnNode(Node):
         self.node_to_return = node_to_return
         super().__init__(node_to_return, pos_start, pos_end)
         
+class YieldNode(Node):
+    yields = True
+
+    def __init__(self, node_to_yield: Node, pos_start: Position, pos_end: Position):
+        self.node_to_yield = node_to_yield
+        super().__init__(node_to_yield, pos_start, pos_end)
+
 class ContinueNode(Node):
     def __init__(self, pos_start: Position, pos_end: Position):
         super().__init__(pos_start = pos_start, pos_end = pos_end)
@@ -1,24 +1,97 @@
-from typing import Callable
 from .error import InvalidSyntaxError
-from .token import Token, TokenType
+from .token import Token, TokenType, TokenStream, Kind
 from .keyword import Keyword
-from .node import (Node, NumberNode, StringNode, BinOpNode, ClassNode,
+from .node import (Node, NumberNode, StringNode, BinOpNode, LogicalOpNode, ClassNode,
                    UnaryOpNode, VarAccessNode, VarAssignNode, VarReassignNode,
-                   CallNode, ForNode, FuncDefNode, IfNode,
-                   WhileNode, ListNode, ReturnNode, ContinueNode, BreakNode)
+                   CallNode, ForNode, ForEachNode, FuncDefNode, IfNode,
+                   WhileNode, ListNode, BlockNode, ReturnNode, YieldNode, ContinueNode, BreakNode)
 from .utils.strings_template import CANNOT_DECLARE_TYPE_AFTER_DECLARED_ERROR
 from .utils.expected import expected
 from .utils.debug import DebugMessage
 
 debug_message = DebugMessage("", True)
 
+# What a statement or an expression can start with, statements are told apart by their first token
+# and assignments by the token after an identifier, so a token is never parsed twice
+EXPR_START_KINDS = frozenset((Kind.INT, Kind.FLOAT, Kind.STRING, Kind.IDENTIFIER,
+                              Kind.PLUS, Kind.MINUS, Kind.LPAREN, Kind.LSQUARE))
+EXPR_START_KEYWORDS = frozenset((Keyword.SETVAR, Keyword.SETIMMUTABLEVAR, Keyword.SETTEMPVAR, Keyword.SETSCOPEDVAR,
+                                 Keyword.NOT, Keyword.IF, Keyword.FOR, Keyword.WHILE, Keyword.SETFUNCTION, Keyword.SETCLASS))
+STATEMENT_START_KEYWORDS = EXPR_START_KEYWORDS | {Keyword.RETURN, Keyword.YIELD, Keyword.CONTINUE, Keyword.BREAK}
+VAR_KEYWORDS = frozenset((Keyword.SETVAR, Keyword.SETIMMUTABLEVAR, Keyword.SETTEMPVAR, Keyword.SETSCOPEDVAR))
+ASSIGN_KINDS = (Kind.EQUALS, Kind.PLUSE, Kind.MINUSE, Kind.MULE, Kind.DIVE, Kind.POWERE, Kind.DIVRESTE)
+
+# What's listed in the longer syntax errors
+EXPECTED_STATEMENT = (Keyword.RETURN, Keyword.CONTINUE, Keyword.BREAK,
+                      Keyword.SETVAR, Keyword.SETIMMUTABLEVAR, Keyword.SETTEMPVAR, Keyword.SETSCOPEDVAR,
+                      Keyword.IF, Keyword.FOR, Keyword.WHILE, Keyword.SETFUNCTION,
+                      TokenType.INT, TokenType.FLOAT, TokenType.IDENTIFIER,
+                      TokenType.PLUS, TokenType.MINUS, TokenType.LPAREN, TokenType.LSQUARE, TokenType.LBRACE, Keyword.NOT)
+# A yield is only a statement in the body of a function
+EXPECTED_FUNCTION_STATEMENT = EXPECTED_STATEMENT[:1] + (Keyword.YIELD,) + EXPECTED_STATEMENT[1:]
+EXPECTED_EXPR = (Keyword.SETVAR, Keyword.SETIMMUTABLEVAR, Keyword.SETTEMPVAR, Keyword.SETSCOPEDVAR,
+                 Keyword.IF, Keyword.FOR, Keyword.WHILE, Keyword.SETFUNCTION,
+                 TokenType.INT, TokenType.FLOAT, TokenType.IDENTIFIER,
+                 TokenType.PLUS, TokenType.MINUS, TokenType.LPAREN, TokenType.LSQUARE, TokenType.LBRACE, Keyword.NOT)
+EXPECTED_COMP_EXPR = (TokenType.INT, TokenType.FLOAT, TokenType.IDENTIFIER,
+                      TokenType.PLUS, TokenType.MINUS, TokenType.LPAREN, TokenType.LSQUARE, Keyword.NOT)
+EXPECTED_ATOM = (TokenType.INT, TokenType.FLOAT, TokenType.IDENTIFIER,
+                 TokenType.PLUS, TokenType.MINUS, TokenType.LPAREN, TokenType.LSQUARE,
+                 Keyword.IF, Keyword.FOR, Keyword.WHILE, Keyword.SETFUNCTION)
+EXPECTED_ARG = (TokenType.RPAREN, Keyword.SETVAR, Keyword.SETIMMUTABLEVAR, Keyword.SETTEMPVAR, Keyword.SETSCOPEDVAR,
+                Keyword.IF, Keyword.FOR, Keyword.WHILE, Keyword.SETFUNCTION,
+                TokenType.INT, TokenType.FLOAT, TokenType.IDENTIFIER,
+                TokenType.PLUS, TokenType.MINUS, TokenType.LPAREN, TokenType.LSQUARE, Keyword.NOT)
+EXPECTED_ELEMENT = (TokenType.RSQUARE, Keyword.SETVAR, Keyword.SETIMMUTABLEVAR, Keyword.SETTEMPVAR, Keyword.SETSCOPEDVAR,
+                    Keyword.FOR, Keyword.WHILE, Keyword.SETFUNCTION,
+                    TokenType.INT, TokenType.FLOAT, TokenType.IDENTIFIER,
+                    TokenType.PLUS, TokenType.MINUS, TokenType.LPAREN, TokenType.LSQUARE, Keyword.NOT)
+EXPECTED_ASSIGN = (TokenType.EQUALS, TokenType.PLUSE, TokenType.MINUSE, TokenType.MULE, TokenType.DIVE, TokenType.POWERE, TokenType.DIVRESTE)
+EXPECTED_ARG_DEF = (TokenType.IDENTIFIER, TokenType.COLON, TokenType.EQUALS, TokenType.COMMA, TokenType.RPAREN)
+
+# Left and right binding powers of the binary operators, the higher the tighter. '**' and '.' bind
+# their right operand looser than their left one, so they're right associative. The right operand
+# of '.' can't start with a unary '+' or '-', and 'not' only starts where a comparison can.
+LOGICAL_POWERS = {
+    Keyword.AND: (1, 2), Keyword.OR: (1, 2),
+}
+BINARY_POWERS = {
+    Kind.EE: (3, 4), Kind.NE: (3, 4), Kind.LT: (3, 4), Kind.GT: (3, 4), Kind.LTE: (3, 4), Kind.GTE: (3, 4),
+    Kind.PLUS: (5, 6), Kind.MINUS: (5, 6),
+    Kind.MUL: (7, 8), Kind.DIV: (7, 8), Kind.DIVREST: (7, 8),
+    Kind.POWER: (10, 9),
+    Kind.DOT: (11, 10),
+}
+NOT_POWER = 2
+UNARY_POWER = 9
+
+# What binary_expr keeps on its stack, (kind, operator token, left operand, power around it) for
+# operators and (kind, result around it, result of the '(', power around it) for parentheses
+PREFIX_FRAME, BINARY_FRAME, PAREN_FRAME = range(3)
+
+class ParseError:
+    # Where parsing failed and what was expected there. Enclosing rules fail too and their errors
+    # are mostly discarded, so the message is only made for the error that's reported.
+    __slots__ = ("tok_idx", "details")
+
+    def __init__(self, tok_idx: int, details: tuple[TokenType | Keyword] | str):
+        self.tok_idx = tok_idx
+        self.details = details
+
+    def as_error(self, tokens: TokenStream) -> InvalidSyntaxError:
+        tok = tokens[self.tok_idx]
+        details = self.details if isinstance(self.details, str) else expected(*self.details)
+        return InvalidSyntaxError(tok.pos_start, tok.pos_end, details)
+
+    def __repr__(self) -> str:
+        return f"<ParseError:{self.tok_idx}:{self.details}>"
+
 class ParseResult:
     def __init__(self):
         self.error = None
         self.node = None
         self.last_registered_advance_count = 0
         self.advance_count = 0
-        self.to_reverse_count = 0
 
     def register_advancement(self):
         self.last_registered_advance_count = 1
@@ -31,12 +104,6 @@ class ParseResult:
             self.error = res.error
         return res.node
 
-    def try_register(self, res):
-        if res.error:
-            self.to_reverse_count = res.advance_count
-            return None
-        return self.register(res)
-
     def success(self, node):
         self.node = node
         return self
@@ -50,9 +117,11 @@ class ParseResult:
         return f"<ParseResult:({self.node}, {self.error})>"
 
 class Parser:
-    def __init__(self, tokens: list[Token]):
+    def __init__(self, tokens: TokenStream):
         self.tokens = tokens
         self.tok_idx = -1
+        # Yields parsed in the body of the function being parsed, None outside of a function
+        self.yield_count = None
         self.advance()
 
     def advance(self):
@@ -60,40 +129,76 @@ class Parser:
         self.update_current_tok()
         return self.current_tok
 
-    def reverse(self, amount: int = 1):
-        self.tok_idx -= amount
-        self.update_current_tok()
-        return self.current_tok
-
     def update_current_tok(self):
-        if self.tok_idx >= 0 and self.tok_idx < len(self.tokens):
+        # The kind is what's compared while parsing, the token is made for the nodes keeping it
+        if self.tok_idx >= 0 and self.tokens.reaches(self.tok_idx):
             self.current_tok = self.tokens[self.tok_idx]
+            self.current_kind = self.tokens.kinds[self.tok_idx]
 
     def register_advance(self, res: ParseResult):
-        res.register_advancement()
-        return self.advance()
+        # What register_advancement and advance do, it's called for every token
+        res.last_registered_advance_count = 1
+        res.advance_count += 1
+        self.tok_idx += 1
+        self.update_current_tok()
+        return self.current_tok
+
+    def syntax_error(self, details: tuple[TokenType | Keyword] | str) -> ParseError:
+        # At the current token, which stays the EOF once the parser advances past it
+        return ParseError(min(self.tok_idx, len(self.tokens) - 1), details)
+
+    def peek_kind(self) -> int:
+        # The kind of the token after the current one, the parser's only lookahead
+        idx = self.tok_idx + 1
+        return self.tokens.kinds[idx] if self.tokens.reaches(idx) else Kind.EOF
+
+    def starts_expr(self) -> bool:
+        return self.current_kind in EXPR_START_KINDS or (
+            self.current_kind == Kind.KEYWORD and self.current_tok.value in EXPR_START_KEYWORDS)
+
+    def starts_statement(self) -> bool:
+        return self.current_kind in EXPR_START_KINDS or (
+            self.current_kind == Kind.KEYWORD and self.current_tok.value in STATEMENT_START_KEYWORDS)
 
     def parse(self):
         res = self.statements()
         
-        if not res.error and self.current_tok.type != TokenType.EOF:
-            return res.failure(InvalidSyntaxError(
-                self.current_tok.pos_start, self.current_tok.pos_end,
-                "Token cannot appear after previous tokens"
-            ))
+        if not res.error and self.current_kind != Kind.EOF:
+            res.failure(self.syntax_error("Token cannot appear after previous tokens"))
+        if res.error:
+            res.error = res.error.as_error(self.tokens)
         return res
+
+    def statement_stream(self):
+        # Yields every top-level statement as soon as it's parsed, then the error ending the stream if any
+        res = ParseResult()
+
+        for statement in self.each_statement(res):
+            # A statement cut short by the lexer's error isn't run, the error is reported instead
+            if self.tokens.error and self.current_kind == Kind.EOF: break
+
+            self.tokens.drop(self.tok_idx)
+            self.tok_idx = 0
+            yield statement, None
+
+        if self.tokens.error:
+            yield None, self.tokens.error
+        elif res.error:
+            yield None, res.error.as_error(self.tokens)
+        elif self.current_kind != Kind.EOF:
+            yield None, self.syntax_error("Token cannot appear after previous tokens").as_error(self.tokens)
     
     def get_full_identifier(self, res: ParseResult):
         identifier_name = self.current_tok
-        debug_message.set_message(f"IDENTIFIER: {identifier_name}")
+        if debug_message.enabled: debug_message.set_message("IDENTIFIER: {}", identifier_name)
         self.register_advance(res)
         
         extra_identifiers = []
         
-        # while self.current_tok.type == TokenType.DOT:
+        # while self.current_kind == Kind.DOT:
         #     self.register_advance(res)
 
-        #     if self.current_tok.type != TokenType.IDENTIFIER:
+        #     if self.current_kind != Kind.IDENTIFIER:
         #         return None, None, res.failure(InvalidSyntaxError(
         #             self.current_tok.pos_start, self.current_tok.pos_end,
         #             expected(TokenType.IDENTIFIER)
@@ -102,99 +207,112 @@ class Parser:
         #     extra_identifiers.append(self.current_tok)
         #     self.register_advance(res)
         
-        debug_message.set_message(f"IDENTIFIER: EXTRAS: {extra_identifiers}")
+        if debug_message.enabled: debug_message.set_message("IDENTIFIER: EXTRAS: {}", extra_identifiers)
         return identifier_name, extra_identifiers, None
             
     ###################################
 
     def statements(self):
-        debug_message.set_message("")
+        if debug_message.enabled: debug_message.set_message("")
         res = ParseResult()
-        statements = []
-        pos_start = self.current_tok.pos_start.copy()
+        pos_start = self.current_tok.pos_start
+        yield_count = self.yield_count
+        
+        statements = list(self.each_statement(res))
+        if res.error:
+            return res
         
-        while self.current_tok.type in (TokenType.NEWLINE, TokenType.SEMICOLON):
+        block = BlockNode(
+            statements,
+            pos_start,
+            self.current_tok.pos_end
+        )
+        if self.yield_count != yield_count: block.yields = True
+        return res.success(block)
+
+    def each_statement(self, res: ParseResult):
+        # Statements separated by newlines or semicolons, up to the first separator not followed by one.
+        # A statement failing to parse leaves its error in res.
+        while self.current_kind in (Kind.NEWLINE, Kind.SEMICOLON):
             self.register_advance(res)
 
         statement = res.register(self.statement())
         
         if res.error:
-            return res
-        statements.append(statement)
-
-        more_statements = True
+            return
+        yield statement
 
         while True:
             newline_count = 0
             
-            while self.current_tok.type in (TokenType.NEWLINE, TokenType.SEMICOLON):
+            while self.current_kind in (Kind.NEWLINE, Kind.SEMICOLON):
                 self.register_advance(res)
                 newline_count += 1
                 
-            if newline_count == 0:
-                more_statements = False
+            if newline_count == 0 or not self.starts_statement():
+                return
 
-            if not more_statements:
-                break
-            statement = res.try_register(self.statement())
+            statement = res.register(self.statement())
             
-            if not statement:
-                self.reverse(res.to_reverse_count)
-                more_statements = False
-                continue
-            statements.append(statement)
-        
-        return res.success(ListNode(
-            statements,
-            pos_start,
-            self.current_tok.pos_end.copy()
-        ))
+            if res.error:
+                return
+            yield statement
 
     def statement(self):
-        debug_message.set_message("")
+        if debug_message.enabled: debug_message.set_message("")
         res = ParseResult()
-        pos_start = self.current_tok.pos_start.copy()
+        pos_start = self.current_tok.pos_start
+        yield_count = self.yield_count
         
         if self.current_tok.matches(TokenType.KEYWORD, Keyword.RETURN):
             self.register_advance(res)
             
-            expr = res.try_register(self.expr())
-            if not expr:
-                self.reverse(res.to_reverse_count)
-            return res.success(ReturnNode(expr, pos_start, self.current_tok.pos_start.copy()))
+            expr = None
+            if self.starts_expr():
+                expr = res.register(self.expr())
+                if res.error:
+                    return res
+            return res.success(ReturnNode(expr, pos_start, self.current_tok.pos_start))
+
+        if self.current_tok.matches(TokenType.KEYWORD, Keyword.YIELD):
+            if self.yield_count is None:
+                return res.failure(self.syntax_error("'yield' outside of a function"))
+
+            self.register_advance(res)
+            
+            expr = None
+            if self.starts_expr():
+                expr = res.register(self.expr())
+                if res.error:
+                    return res
+
+            self.yield_count += 1
+            return res.success(YieldNode(expr, pos_start, self.current_tok.pos_start))
 
         if self.current_tok.matches(TokenType.KEYWORD, Keyword.CONTINUE):
             self.register_advance(res)
             
-            return res.success(ContinueNode(pos_start, self.current_tok.pos_start.copy()))
+            return res.success(ContinueNode(pos_start, self.current_tok.pos_start))
 
         if self.current_tok.matches(TokenType.KEYWORD, Keyword.BREAK):
             self.register_advance(res)
             
-            return res.success(BreakNode(pos_start, self.current_tok.pos_start.copy()))
+            return res.success(BreakNode(pos_start, self.current_tok.pos_start))
         
         expr = res.register(self.expr())
         
         if res.error:
-            return res.failure(InvalidSyntaxError(
-                self.current_tok.pos_start, self.current_tok.pos_end,
-                expected(Keyword.RETURN, Keyword.CONTINUE, Keyword.BREAK,
-                         Keyword.SETVAR, Keyword.SETIMMUTABLEVAR, Keyword.SETTEMPVAR, Keyword.SETSCOPEDVAR,
-                         Keyword.IF, Keyword.FOR, Keyword.WHILE, Keyword.SETFUNCTION,
-                         TokenType.INT, TokenType.FLOAT, TokenType.IDENTIFIER,
-                         TokenType.PLUS, TokenType.MINUS, TokenType.LPAREN, TokenType.LSQUARE, TokenType.LBRACE, Keyword.NOT)
-            ))
-            
+            return res.failure(self.syntax_error(EXPECTED_STATEMENT if self.yield_count is None else EXPECTED_FUNCTION_STATEMENT))
+
+        # An if or a loop with a yield in it, the statements around a yield are run by a generator's body
+        if self.yield_count != yield_count: expr.yields = True
         return res.success(expr)
 
     def expr(self):
-        debug_message.set_message("")
+        if debug_message.enabled: debug_message.set_message("")
         res = ParseResult()
 
-        if (self.current_tok.matches(TokenType.KEYWORD, Keyword.SETVAR) or
-            self.current_tok.matches(TokenType.KEYWORD, Keyword.SETIMMUTABLEVAR) or
-            self.current_tok.matches(TokenType.KEYWORD, Keyword.SETTEMPVAR) or
-            self.current_tok.matches(TokenType.KEYWORD, Keyword.SETSCOPEDVAR)):
+        if self.current_kind == Kind.KEYWORD and self.current_tok.value in VAR_KEYWORDS:
             
             var_keyword_tok = self.current_tok
             var_value_type_tok = None
@@ -202,25 +320,19 @@ class Parser:
 
             self.register_advance(res)
 
-            if self.current_tok.type != TokenType.IDENTIFIER:
-                return res.failure(InvalidSyntaxError(
-                    self.current_tok.pos_start, self.current_tok.pos_end,
-                    expected(TokenType.IDENTIFIER)
-                ))
+            if self.current_kind != Kind.IDENTIFIER:
+                return res.failure(self.syntax_error((TokenType.IDENTIFIER,)))
                 
             var_name_tok, var_extra_names_toks, error = self.get_full_identifier(res)
             
             if error:
                 return res.failure(error)
         
-            if self.current_tok.type == TokenType.COLON:
+            if self.current_kind == Kind.COLON:
                 self.register_advance(res)
 
-                if self.current_tok.type != TokenType.IDENTIFIER:
-                    return res.failure(InvalidSyntaxError(
-                        self.current_tok.pos_start, self.current_tok.pos_end,
-                        expected(TokenType.IDENTIFIER)
-                    ))
+                if self.current_kind != Kind.IDENTIFIER:
+                    return res.failure(self.syntax_error((TokenType.IDENTIFIER,)))
                     
                 var_value_type_tok = self.current_tok
                 
@@ -233,22 +345,16 @@ class Parser:
             
             var_lifetime = None
             if var_keyword_tok.value == Keyword.SETTEMPVAR:
-                if self.current_tok.type != TokenType.INT:
-                    return res.failure(InvalidSyntaxError(
-                        self.current_tok.pos_start, self.current_tok.pos_end,
-                        expected(TokenType.INT)
-                    ))
+                if self.current_kind != Kind.INT:
+                    return res.failure(self.syntax_error((TokenType.INT,)))
 
                 var_lifetime = self.current_tok.value
 
             if var_value_type_specified or var_keyword_tok.value == Keyword.SETTEMPVAR:
                 self.register_advance(res)
 
-            if self.current_tok.type not in (TokenType.EQUALS, TokenType.PLUSE, TokenType.MINUSE, TokenType.MULE, TokenType.DIVE, TokenType.POWERE, TokenType.DIVRESTE):
-                return res.failure(InvalidSyntaxError(
-                    self.current_tok.pos_start, self.current_tok.pos_end,
-                    expected(TokenType.EQUALS, TokenType.PLUSE, TokenType.MINUSE, TokenType.MULE, TokenType.DIVE, TokenType.POWERE, TokenType.DIVRESTE)
-                ))
+            if self.current_kind not in ASSIGN_KINDS:
+                return res.failure(self.syntax_error(EXPECTED_ASSIGN))
                 
             var_assign_type_tok = self.current_tok
 
@@ -269,185 +375,210 @@ class Parser:
 
             return res.success(VarAssignNode(var_name_tok, var_extra_names_toks, expr, var_value_type_tok, var_assign_type_tok, var_method, var_lifetime))
 
-        elif self.current_tok.type == TokenType.IDENTIFIER:                
+        # An identifier is only taken here when the token after it makes it an assignment,
+        # otherwise it's left for atom
+        elif self.current_kind == Kind.IDENTIFIER and self.peek_kind() in ASSIGN_KINDS:
             var_name_tok, var_extra_names_toks, error = self.get_full_identifier(res)
 
             if error:
                 return res.failure(error)
             
-            if self.current_tok.type in (TokenType.EQUALS, TokenType.PLUSE, TokenType.MINUSE, TokenType.MULE, TokenType.DIVE, TokenType.POWERE, TokenType.DIVRESTE):
-                var_assign_type_tok = self.current_tok
+            var_assign_type_tok = self.current_tok
 
-                self.register_advance(res)
-                
-                expr = res.register(self.expr())
-                if res.error:
-                    return res
+            self.register_advance(res)
+            
+            expr = res.register(self.expr())
+            if res.error:
+                return res
 
-                return res.success(VarReassignNode(var_name_tok, var_extra_names_toks, expr, var_assign_type_tok))
+            return res.success(VarReassignNode(var_name_tok, var_extra_names_toks, expr, var_assign_type_tok))
             
-            elif self.current_tok.type == TokenType.COLON:
-                return res.failure(InvalidSyntaxError(
-                    self.current_tok.pos_start, self.current_tok.pos_end,
-                    CANNOT_DECLARE_TYPE_AFTER_DECLARED_ERROR
-                ))
+        elif self.current_kind == Kind.IDENTIFIER and self.peek_kind() == Kind.COLON:
+            self.register_advance(res)
             
-            # PART 1 OF ACCESSING VARIABLES THE OTHER PART IS ON ATOM
-            # elif var_extra_names_toks != []:
-            #     return res.success(VarAccessNode(var_name_tok, var_extra_names_toks))
-                #__1 = 1
-
-            # elif var_extra_names_toks == []:
-            #     self.reverse()
-            else:
-                self.reverse()
+            return res.failure(self.syntax_error(CANNOT_DECLARE_TYPE_AFTER_DECLARED_ERROR))
+        
+        # PART 1 OF ACCESSING VARIABLES THE OTHER PART IS ON ATOM
+        # elif var_extra_names_toks != []:
+        #     return res.success(VarAccessNode(var_name_tok, var_extra_names_toks))
         
-        node = res.register(self.bin_op(
-            self.comp_expr, ((TokenType.KEYWORD, Keyword.AND), (TokenType.KEYWORD, Keyword.OR))))
+        node = res.register(self.binary_expr())
 
         if res.error:
-            return res.failure(InvalidSyntaxError(
-                self.current_tok.pos_start, self.current_tok.pos_end,
-                expected(Keyword.SETVAR, Keyword.SETIMMUTABLEVAR, Keyword.SETTEMPVAR, Keyword.SETSCOPEDVAR,
-                         Keyword.IF, Keyword.FOR, Keyword.WHILE, Keyword.SETFUNCTION,
-                         TokenType.INT, TokenType.FLOAT, TokenType.IDENTIFIER,
-                         TokenType.PLUS, TokenType.MINUS, TokenType.LPAREN, TokenType.LSQUARE, TokenType.LBRACE, Keyword.NOT)
-            ))
+            return res.failure(self.syntax_error(EXPECTED_EXPR))
 
         return res.success(node)
 
-    def comp_expr(self):
-        debug_message.set_message("")
+    def starts_assignment(self) -> bool:
+        # Whether expr parses the current tokens itself instead of leaving them to binary_expr
+        if self.current_kind == Kind.KEYWORD:
+            return self.current_tok.value in VAR_KEYWORDS
+        return self.current_kind == Kind.IDENTIFIER and (self.peek_kind() in ASSIGN_KINDS or self.peek_kind() == Kind.COLON)
+
+    def binary_expr(self):
+        # Precedence climbing on an explicit stack instead of a nested call per operand, so deeply nested
+        # expressions don't run into Python's recursion limit. An operator's right operand only takes the
+        # operators binding tighter than its right power (or as tight, when it's right associative), the
+        # stack keeps the operators and the parentheses waiting for it along with the power around them.
         res = ParseResult()
+        min_power = 0
+        stack = []
+        operand_res = None
 
-        if self.current_tok.matches(TokenType.KEYWORD, Keyword.NOT):
-            op_tok = self.current_tok
-            self.register_advance(res)
+        while True:
+            if operand_res is None:
+                if debug_message.enabled: debug_message.set_message("")
+                tok = self.current_tok
+                kind = self.current_kind
 
-            node = res.register(self.comp_expr())
+                if (kind == Kind.PLUS or kind == Kind.MINUS) and min_power <= UNARY_POWER:
+                    self.register_advance(res)
+                    stack.append((PREFIX_FRAME, tok, None, min_power))
+                    min_power = UNARY_POWER
+                    continue
+
+                if kind == Kind.KEYWORD and tok.value == Keyword.NOT and min_power <= NOT_POWER:
+                    self.register_advance(res)
+                    stack.append((PREFIX_FRAME, tok, None, min_power))
+                    min_power = NOT_POWER
+                    continue
+
+                if kind == Kind.LPAREN:
+                    if debug_message.enabled: debug_message.set_message("PARENTHESES")
+                    paren_res = ParseResult()
+                    self.register_advance(paren_res)
+
+                    # The expression in the parentheses gets a result of its own, like the expr call it stands for
+                    if not self.starts_assignment():
+                        stack.append((PAREN_FRAME, res, paren_res, min_power))
+                        res = ParseResult()
+                        min_power = 0
+                        continue
+
+                    operand_res = self.close_paren(paren_res, paren_res.register(self.expr()))
+                else:
+                    operand_res = self.atom()
+
+            left = res.register(operand_res)
+            operand_res = None
             if res.error:
-                return res
-            return res.success(UnaryOpNode(op_tok, node))
+                # Where 'not' can start the operand, it's listed in what could have been there instead
+                if min_power <= NOT_POWER:
+                    res.failure(self.syntax_error(EXPECTED_COMP_EXPR))
+                return self.unwind_parens(res, stack)
 
-        node = res.register(self.bin_op(
-            self.arith_expr, (TokenType.EE, TokenType.NE, TokenType.LT, TokenType.GT, TokenType.LTE, TokenType.GTE)))
+            if self.current_kind == Kind.LPAREN:
+                left = res.register(self.call(left))
+                if res.error:
+                    return self.unwind_parens(res, stack)
 
-        if res.error:
-            return res.failure(InvalidSyntaxError(
-                self.current_tok.pos_start, self.current_tok.pos_end,
-                expected(TokenType.INT, TokenType.FLOAT, TokenType.IDENTIFIER,
-                         TokenType.PLUS, TokenType.MINUS, TokenType.LPAREN, TokenType.LSQUARE, Keyword.NOT)
-            ))
+            while True:
+                if self.current_kind == Kind.KEYWORD:
+                    powers = LOGICAL_POWERS.get(self.current_tok.value)
+                else:
+                    powers = BINARY_POWERS.get(self.current_kind)
 
-        return res.success(node)
+                if powers is not None and powers[0] >= min_power:
+                    stack.append((BINARY_FRAME, self.current_tok, left, min_power))
+                    self.register_advance(res)
+                    min_power = powers[1]
+                    break
 
-    def arith_expr(self):
-        debug_message.set_message("")
-        return self.bin_op(self.term, (TokenType.PLUS, TokenType.MINUS))
+                if not stack:
+                    return res.success(left)
 
-    def term(self):
-        debug_message.set_message("")
-        return self.bin_op(self.factor, (TokenType.MUL, TokenType.DIV, TokenType.DIVREST))
+                frame = stack.pop()
+                min_power = frame[3]
 
-    def factor(self):
-        debug_message.set_message("")
-        res = ParseResult()
-        tok = self.current_tok
+                if frame[0] == BINARY_FRAME:
+                    # Only && and || are keyword operators
+                    left = (LogicalOpNode if frame[1].type == TokenType.KEYWORD else BinOpNode)(frame[2], frame[1], left)
+                elif frame[0] == PREFIX_FRAME:
+                    left = UnaryOpNode(frame[1], left)
+                else:
+                    # The parentheses are an operand of the expression around them
+                    expr_res = ParseResult()
+                    expr_res.register(res)
+                    res = frame[1]
+                    operand_res = self.close_paren(frame[2], left, expr_res.success(left))
+                    break
+
+    def close_paren(self, paren_res: ParseResult, node: Node, expr_res: ParseResult = None):
+        if expr_res is not None:
+            paren_res.register(expr_res)
+        if paren_res.error:
+            return paren_res
+
+        if self.current_kind != Kind.RPAREN:
+            return paren_res.failure(self.syntax_error((TokenType.RPAREN,)))
+
+        self.register_advance(paren_res)
+        return paren_res.success(node)
+
+    def unwind_parens(self, res: ParseResult, stack: list):
+        # The error leaves the parentheses still open the way it left the nested expr calls they stand for
+        for frame_kind, outer_res, paren_res, min_power in reversed(stack):
+            if frame_kind != PAREN_FRAME:
+                continue
 
-        if tok.type in (TokenType.PLUS, TokenType.MINUS):
-            self.register_advance(res)
-            
-            factor = res.register(self.factor())
-            if res.error:
-                return res
-            return res.success(UnaryOpNode(tok, factor))
+            expr_res = ParseResult()
+            expr_res.register(res)
+            paren_res.register(expr_res.failure(self.syntax_error(EXPECTED_EXPR)))
 
-        return self.power()
+            res = outer_res
+            res.register(paren_res)
+            if min_power <= NOT_POWER:
+                res.failure(self.syntax_error(EXPECTED_COMP_EXPR))
 
-    def power(self):
-        debug_message.set_message("")
-        #return self.bin_op(self.call, (TokenType.POWER, ), self.factor)
-        return self.bin_op(self.dot, (TokenType.POWER, ), self.factor)
+        return res
 
-    def dot(self):
-        debug_message.set_message("")
-        return self.bin_op(self.call, (TokenType.DOT, ), self.power)
-    
-    def call(self):
-        debug_message.set_message("")
-        
+    def call(self, atom: Node):
+        if debug_message.enabled: debug_message.set_message("")
         res = ParseResult()
-        
-        atom = res.register(self.atom())
-        
-        if res.error:
-            return res
-        
-        # while self.current_tok.type == TokenType.DOT:
-        #     child: Node = atom
-        #     self.register_advance(res)
-
-        #     child_ = res.register(self.call())
-        #     if res.error:
-        #         return res
 
-        #     child.child = child_
-        #     child = child_
+        self.register_advance(res)
+        
+        arg_nodes = []
 
-        if self.current_tok.type == TokenType.LPAREN:
+        if self.current_kind == Kind.RPAREN:
             self.register_advance(res)
-            
-            arg_nodes = []
+        else:
+            arg_nodes.append(res.register(self.expr()))
+            if res.error:
+                return res.failure(self.syntax_error(EXPECTED_ARG))
 
-            if self.current_tok.type == TokenType.RPAREN:
+            while self.current_kind == Kind.COMMA:
                 self.register_advance(res)
-            else:
+
                 arg_nodes.append(res.register(self.expr()))
                 if res.error:
-                    return res.failure(InvalidSyntaxError(
-                        self.current_tok.pos_start, self.current_tok.pos_end,
-                        expected(TokenType.RPAREN, Keyword.SETVAR, Keyword.SETIMMUTABLEVAR, Keyword.SETTEMPVAR, Keyword.SETSCOPEDVAR,
-                                 Keyword.IF, Keyword.FOR, Keyword.WHILE, Keyword.SETFUNCTION,
-                                 TokenType.INT, TokenType.FLOAT, TokenType.IDENTIFIER,
-                                 TokenType.PLUS, TokenType.MINUS, TokenType.LPAREN, TokenType.LSQUARE, Keyword.NOT)
-                    ))
-
-                while self.current_tok.type == TokenType.COMMA:
-                    self.register_advance(res)
-
-                    arg_nodes.append(res.register(self.expr()))
-                    if res.error:
-                        return res
+                    return res
 
-                if self.current_tok.type != TokenType.RPAREN:
-                    return res.failure(InvalidSyntaxError(
-                        self.current_tok.pos_start, self.current_tok.pos_end,
-                        expected(TokenType.COMMA, TokenType.RPAREN)
-                    ))
+            if self.current_kind != Kind.RPAREN:
+                return res.failure(self.syntax_error((TokenType.COMMA, TokenType.RPAREN)))
 
-                self.register_advance(res)
+            self.register_advance(res)
 
-            return res.success(CallNode(atom, arg_nodes))
-        
-        return res.success(atom)
+        return res.success(CallNode(atom, arg_nodes))
 
     def atom(self):
-        debug_message.set_message("CHECKING TOKEN")
+        if debug_message.enabled: debug_message.set_message("CHECKING TOKEN")
         res = ParseResult()
         tok = self.current_tok
+        kind = self.current_kind
         
-        if tok.type in (TokenType.INT, TokenType.FLOAT):
-            debug_message.set_message("NUMBER")
+        if kind in (Kind.INT, Kind.FLOAT):
+            if debug_message.enabled: debug_message.set_message("NUMBER")
             self.register_advance(res)
             return res.success(NumberNode(tok))
 
-        elif tok.type == TokenType.STRING:
-            debug_message.set_message("STRING")
+        elif kind == Kind.STRING:
+            if debug_message.enabled: debug_message.set_message("STRING")
             self.register_advance(res)
             return res.success(StringNode(tok))
 
         # PART 2 OF ACCESSING VARIABLES THE PART 1 IS ON EXPR
-        elif tok.type == TokenType.IDENTIFIER:
+        elif kind == Kind.IDENTIFIER:
             tok, var_extra_names_toks, error = self.get_full_identifier(res)
             
             if error:
@@ -457,125 +588,90 @@ class Parser:
             # self.register_advance(res)
             # return res.success(VarAccessNode(tok))
 
-        elif tok.type == TokenType.LPAREN:
-            debug_message.set_message("PARENTHESES")
-            self.register_advance(res)
-            
-            expr = res.register(self.expr())
-            
-            if res.error:
-                return res
-            if self.current_tok.type == TokenType.RPAREN:
-                self.register_advance(res)
-                
-                return res.success(expr)
-            else:
-                return res.failure(InvalidSyntaxError(
-                    self.current_tok.pos_start, self.current_tok.pos_end,
-                    expected(TokenType.RPAREN)
-                ))
-
-        elif tok.type == TokenType.LSQUARE:
-            debug_message.set_message("SQUARE PARENTHESES")
+        elif kind == Kind.LSQUARE:
+            if debug_message.enabled: debug_message.set_message("SQUARE PARENTHESES")
             list_expr = res.register(self.list_expr())
             if res.error:
                 return res
             return res.success(list_expr)
 
         elif tok.matches(TokenType.KEYWORD, Keyword.IF):
-            debug_message.set_message("IF")
+            if debug_message.enabled: debug_message.set_message("IF")
             if_expr = res.register(self.if_expr())
             if res.error:
                 return res
             return res.success(if_expr)
 
         elif tok.matches(TokenType.KEYWORD, Keyword.FOR):
-            debug_message.set_message("FOR")
+            if debug_message.enabled: debug_message.set_message("FOR")
             for_expr = res.register(self.for_expr())
             if res.error:
                 return res
             return res.success(for_expr)
 
         elif tok.matches(TokenType.KEYWORD, Keyword.WHILE):
-            debug_message.set_message("WHILE")
+            if debug_message.enabled: debug_message.set_message("WHILE")
             while_expr = res.register(self.while_expr())
             if res.error:
                 return res
             return res.success(while_expr)
 
         elif tok.matches(TokenType.KEYWORD, Keyword.SETFUNCTION):
-            debug_message.set_message("SET FUNCTION")
+            if debug_message.enabled: debug_message.set_message("SET FUNCTION")
             func_def = res.register(self.func_def())
             if res.error:
                 return res
             return res.success(func_def)
 
         elif tok.matches(TokenType.KEYWORD, Keyword.SETCLASS):
-            debug_message.set_message("SET CLASS")
+            if debug_message.enabled: debug_message.set_message("SET CLASS")
             class_set = res.register(self.class_set())
             if res.error:
                 return res
             return res.success(class_set)
         
-        debug_message.set_message("INVALID TOKEN")
+        if debug_message.enabled: debug_message.set_message("INVALID TOKEN")
         
-        return res.failure(InvalidSyntaxError(
-            tok.pos_start, tok.pos_end,
-            expected(TokenType.INT, TokenType.FLOAT, TokenType.IDENTIFIER,
-                     TokenType.PLUS, TokenType.MINUS, TokenType.LPAREN, TokenType.LSQUARE,
-                     Keyword.IF, Keyword.FOR, Keyword.WHILE, Keyword.SETFUNCTION)
-        ))
+        return res.failure(self.syntax_error(EXPECTED_ATOM))
 
     def list_expr(self):
-        debug_message.set_message("")
+        if debug_message.enabled: debug_message.set_message("")
         res = ParseResult()
         element_nodes = []
-        pos_start = self.current_tok.pos_start.copy()
+        pos_start = self.current_tok.pos_start
 
-        if self.current_tok.type != TokenType.LSQUARE:
-            return res.failure(InvalidSyntaxError(
-                self.current_tok.pos_start, self.current_tok.pos_end,
-                expected(TokenType.LSQUARE)
-            ))
+        if self.current_kind != Kind.LSQUARE:
+            return res.failure(self.syntax_error((TokenType.LSQUARE,)))
 
         self.register_advance(res)
 
-        if self.current_tok.type == TokenType.RSQUARE:
+        if self.current_kind == Kind.RSQUARE:
             self.register_advance(res)
         else:
             element_nodes.append(res.register(self.expr()))
             if res.error:
-                return res.failure(InvalidSyntaxError(
-                    self.current_tok.pos_start, self.current_tok.pos_end,
-                    expected(TokenType.RSQUARE, Keyword.SETVAR, Keyword.SETIMMUTABLEVAR, Keyword.SETTEMPVAR, Keyword.SETSCOPEDVAR,
-                             Keyword.FOR, Keyword.WHILE, Keyword.SETFUNCTION,
-                             TokenType.INT, TokenType.FLOAT, TokenType.IDENTIFIER,
-                             TokenType.PLUS, TokenType.MINUS, TokenType.LPAREN, TokenType.LSQUARE, Keyword.NOT)
-                ))
-
-            while self.current_tok.type == TokenType.COMMA:
+                return res.failure(self.syntax_error(EXPECTED_ELEMENT))
+
+            while self.current_kind == Kind.COMMA:
                 self.register_advance(res)
 
                 element_nodes.append(res.register(self.expr()))
                 if res.error:
                     return res
 
-            if self.current_tok.type != TokenType.RSQUARE:
-                return res.failure(InvalidSyntaxError(
-                    self.current_tok.pos_start, self.current_tok.pos_end,
-                    expected(TokenType.COMMA, TokenType.RSQUARE)
-                ))
+            if self.current_kind != Kind.RSQUARE:
+                return res.failure(self.syntax_error((TokenType.COMMA, TokenType.RSQUARE)))
 
             self.register_advance(res)
 
         return res.success(ListNode(
             element_nodes,
             pos_start,
-            self.current_tok.pos_end.copy()
+            self.current_tok.pos_end
         ))
 
     def if_expr(self):
-        debug_message.set_message("")
+        if debug_message.enabled: debug_message.set_message("")
         
         res = ParseResult()
         all_cases = res.register(self.if_expr_cases(Keyword.IF))
@@ -585,35 +681,32 @@ class Parser:
         return res.success(IfNode(cases, else_case))
 
     def elseif_expr(self):
-        debug_message.set_message("")
+        if debug_message.enabled: debug_message.set_message("")
         return self.if_expr_cases(Keyword.ELSEIF)
 
     def else_expr(self):
-        debug_message.set_message("")
+        if debug_message.enabled: debug_message.set_message("")
         
         res = ParseResult()
         else_case = None
 
         self.register_advance(res)
             
-        if self.current_tok.type == TokenType.LBRACE:
+        if self.current_kind == Kind.LBRACE:
             self.register_advance(res)
             
-            if self.current_tok.type == TokenType.NEWLINE:
+            if self.current_kind == Kind.NEWLINE:
                 self.register_advance(res)
                 
             statements = res.register(self.statements())
             if res.error:
                 return res
-            else_case = (statements, True)
+            else_case = (statements.discard(), True)
 
             if self.current_tok.matches(TokenType.RBRACE):
                 self.register_advance(res)
             else:
-                return res.failure(InvalidSyntaxError(
-                    self.current_tok.pos_start, self.current_tok.pos_end,
-                    expected(TokenType.RBRACE)
-                ))
+                return res.failure(self.syntax_error((TokenType.RBRACE,)))
         else:
             expr = res.register(self.statement())
             if res.error:
@@ -623,7 +716,7 @@ class Parser:
         return res.success(else_case)
 
     def if_expr_elseif_or_else(self):
-        debug_message.set_message("")
+        if debug_message.enabled: debug_message.set_message("")
         
         res = ParseResult()
         cases, else_case = [], None
@@ -642,17 +735,14 @@ class Parser:
         return res.success((cases, else_case))
 
     def if_expr_cases(self, case_keyword):
-        debug_message.set_message("")
+        if debug_message.enabled: debug_message.set_message("")
         
         res = ParseResult()
         cases = []
         else_case = None
 
         if not self.current_tok.matches(TokenType.KEYWORD, case_keyword):
-            return res.failure(InvalidSyntaxError(
-                self.current_tok.pos_start, self.current_tok.pos_end,
-                f"Expected '{case_keyword}'"
-            ))
+            return res.failure(self.syntax_error((case_keyword,)))
         
         keyword_tok = self.current_tok
         
@@ -666,14 +756,14 @@ class Parser:
         if self.current_tok.matches(TokenType.LBRACE):
             self.register_advance(res)
 
-            if self.current_tok.type == TokenType.NEWLINE:
+            if self.current_kind == Kind.NEWLINE:
                 self.register_advance(res)
 
             statements = res.register(self.statements())
             if res.error:
                 return res
             
-            cases.append((condition, statements, True))
+            cases.append((condition, statements.discard(), True))
             
             if self.current_tok.matches(TokenType.RBRACE):
                 if keyword_tok.matches(TokenType.KEYWORD, Keyword.IF) or keyword_tok.matches(TokenType.KEYWORD, Keyword.ELSEIF):
@@ -691,16 +781,10 @@ class Parser:
                     self.register_advance(res)
                 
                 else:
-                    return res.failure(InvalidSyntaxError(
-                        self.current_tok.pos_start, self.current_tok.pos_end,
-                        expected(Keyword.IF, Keyword.ELSEIF, Keyword.ELSE)
-                    ))
+                    return res.failure(self.syntax_error((Keyword.IF, Keyword.ELSEIF, Keyword.ELSE)))
                     
             else:
-                return res.failure(InvalidSyntaxError(
-                    self.current_tok.pos_start, self.current_tok.pos_end,
-                    expected(TokenType.RBRACE)
-                ))
+                return res.failure(self.syntax_error((TokenType.RBRACE,)))
         
         # Inline statements
         else:
@@ -718,33 +802,38 @@ class Parser:
         return res.success((cases, else_case))
 
     def for_expr(self):
-        debug_message.set_message("")
+        if debug_message.enabled: debug_message.set_message("")
         
         res = ParseResult()
 
         if not self.current_tok.matches(TokenType.KEYWORD, Keyword.FOR):
-            return res.failure(InvalidSyntaxError(
-                self.current_tok.pos_start, self.current_tok.pos_end,
-                expected(Keyword.FOR)
-            ))
+            return res.failure(self.syntax_error((Keyword.FOR,)))
 
         self.register_advance(res)
 
-        if self.current_tok.type != TokenType.IDENTIFIER:
-            return res.failure(InvalidSyntaxError(
-                self.current_tok.pos_start, self.current_tok.pos_end,
-                expected(TokenType.IDENTIFIER)
-            ))
+        if self.current_kind != Kind.IDENTIFIER:
+            return res.failure(self.syntax_error((TokenType.IDENTIFIER,)))
 
         var_name = self.current_tok
         
         self.register_advance(res)
 
-        if self.current_tok.type != TokenType.EQUALS:
-            return res.failure(InvalidSyntaxError(
-                self.current_tok.pos_start, self.current_tok.pos_end,
-                expected(TokenType.EQUALS)
-            ))
+        if self.current_tok.matches(TokenType.KEYWORD, Keyword.IN):
+            self.register_advance(res)
+
+            iterable = res.register(self.expr())
+            if res.error:
+                return res
+
+            loop_body = res.register(self.loop_body())
+            if res.error:
+                return res
+            body, should_return_null = loop_body
+
+            return res.success(self.loop(ForEachNode(var_name, iterable, body, should_return_null)))
+
+        if self.current_kind != Kind.EQUALS:
+            return res.failure(self.syntax_error((TokenType.EQUALS, Keyword.IN)))
 
         self.register_advance(res)
 
@@ -752,11 +841,8 @@ class Parser:
         if res.error:
             return res
 
-        if not self.current_tok.type == TokenType.SEMICOLON:
-            return res.failure(InvalidSyntaxError(
-                self.current_tok.pos_start, self.current_tok.pos_end,
-                expected(TokenType.SEMICOLON)
-            ))
+        if not self.current_kind == Kind.SEMICOLON:
+            return res.failure(self.syntax_error((TokenType.SEMICOLON,)))
 
         self.register_advance(res)
 
@@ -764,7 +850,7 @@ class Parser:
         if res.error:
             return res
 
-        if self.current_tok.type == TokenType.SEMICOLON:
+        if self.current_kind == Kind.SEMICOLON:
             self.register_advance(res)
 
             step_value = res.register(self.expr())
@@ -773,55 +859,20 @@ class Parser:
         else:
             step_value = None
 
-        if self.current_tok.type != TokenType.LBRACE:
-            return res.failure(InvalidSyntaxError(
-                self.current_tok.pos_start, self.current_tok.pos_end,
-                expected(TokenType.LBRACE)
-            ))
-
-        self.register_advance(res)
-
-        if self.current_tok.type in (TokenType.NEWLINE, TokenType.SEMICOLON):
-            self.register_advance(res)
-
-            body = res.register(self.statements())
-            if res.error:
-                return res
-
-            if self.current_tok.type != TokenType.RBRACE:
-                return res.failure(InvalidSyntaxError(
-                    self.current_tok.pos_start, self.current_tok.pos_end,
-                    expected(TokenType.RBRACE)
-                ))
-
-            self.register_advance(res)
-
-            return res.success(ForNode(var_name, start_value, end_value, step_value, body, True))
-
-        body = res.register(self.statement())
+        loop_body = res.register(self.loop_body())
         if res.error:
             return res
-    
-        if self.current_tok.type != TokenType.RBRACE:
-            return res.failure(InvalidSyntaxError(
-                self.current_tok.pos_start, self.current_tok.pos_end,
-                expected(TokenType.RBRACE)
-            ))
-
-        self.register_advance(res)
+        body, should_return_null = loop_body
 
-        return res.success(ForNode(var_name, start_value, end_value, step_value, body, False))
+        return res.success(self.loop(ForNode(var_name, start_value, end_value, step_value, body, should_return_null)))
 
     def while_expr(self):
-        debug_message.set_message("")
+        if debug_message.enabled: debug_message.set_message("")
         
         res = ParseResult()
 
         if not self.current_tok.matches(TokenType.KEYWORD, Keyword.WHILE):
-            return res.failure(InvalidSyntaxError(
-                self.current_tok.pos_start, self.current_tok.pos_end,
-                expected(Keyword.WHILE)
-            ))
+            return res.failure(self.syntax_error((Keyword.WHILE,)))
 
         self.register_advance(res)
 
@@ -829,121 +880,102 @@ class Parser:
         if res.error:
             return res
 
-        if self.current_tok.type != TokenType.LBRACE:
-            return res.failure(InvalidSyntaxError(
-                self.current_tok.pos_start, self.current_tok.pos_end,
-                expected(TokenType.LBRACE)
-            ))
+        loop_body = res.register(self.loop_body())
+        if res.error:
+            return res
+        body, should_return_null = loop_body
 
-        self.register_advance(res)
+        return res.success(self.loop(WhileNode(condition, body, should_return_null)))
 
-        if self.current_tok.type in (TokenType.NEWLINE, TokenType.SEMICOLON):
-            self.register_advance(res)
+    def loop_body(self):
+        # Statements on their own lines are worth null, a single statement right after the '{' keeps the
+        # value of every iteration. Gives the body and whether the loop is worth null.
+        res = ParseResult()
 
-            body = res.register(self.statements())
-            if res.error:
-                return res
+        if self.current_kind != Kind.LBRACE:
+            return res.failure(self.syntax_error((TokenType.LBRACE,)))
 
-            if self.current_tok.type != TokenType.RBRACE:
-                return res.failure(InvalidSyntaxError(
-                    self.current_tok.pos_start, self.current_tok.pos_end,
-                    expected(TokenType.RBRACE)
-                ))
+        self.register_advance(res)
 
-            self.register_advance(res)
+        should_return_null = self.current_kind in (Kind.NEWLINE, Kind.SEMICOLON)
 
-            return res.success(WhileNode(condition, body, True))
+        if should_return_null:
+            self.register_advance(res)
+            body = res.register(self.statements())
+        else:
+            body = res.register(self.statement())
 
-        body = res.register(self.statement())
         if res.error:
             return res
 
-        if self.current_tok.type != TokenType.RBRACE:
-            return res.failure(InvalidSyntaxError(
-                self.current_tok.pos_start, self.current_tok.pos_end,
-                expected(TokenType.RBRACE)
-            ))
+        if self.current_kind != Kind.RBRACE:
+            return res.failure(self.syntax_error((TokenType.RBRACE,)))
 
         self.register_advance(res)
-            
-        return res.success(WhileNode(condition, body, False))
+
+        return res.success((body, should_return_null))
+
+    def loop(self, node: ForNode | ForEachNode | WhileNode):
+        return node.discard() if node.should_return_null else node
 
     def class_set(self):
-        debug_message.set_message("")
+        if debug_message.enabled: debug_message.set_message("")
         
         res = ParseResult()
         
         pos_start = self.current_tok.pos_start
         
         if not self.current_tok.matches(TokenType.KEYWORD, Keyword.SETCLASS):
-            return res.failure(InvalidSyntaxError(
-                self.current_tok.pos_start, self.current_tok.pos_end,
-                expected(Keyword.SETCLASS)
-            ))
+            return res.failure(self.syntax_error((Keyword.SETCLASS,)))
 
         self.register_advance(res)
 
-        if self.current_tok.type != TokenType.IDENTIFIER:
-            return res.failure(InvalidSyntaxError(
-                self.current_tok.pos_start, self.current_tok.pos_end,
-                expected(TokenType.IDENTIFIER)
-            ))
+        if self.current_kind != Kind.IDENTIFIER:
+            return res.failure(self.syntax_error((TokenType.IDENTIFIER,)))
 
         class_name_tok = self.current_tok
         self.register_advance(res)
 
-        if self.current_tok.type != TokenType.LBRACE:
-            return res.failure(InvalidSyntaxError(
-                self.current_tok.pos_start, self.current_tok.pos_end,
-                expected(TokenType.LBRACE)
-            ))
+        if self.current_kind != Kind.LBRACE:
+            return res.failure(self.syntax_error((TokenType.LBRACE,)))
 
         self.register_advance(res)
 
+        # A class body isn't part of the function around it, it can't yield
+        yield_count, self.yield_count = self.yield_count, None
         body = res.register(self.statements())
+        self.yield_count = yield_count
 
         if res.error:
             return res
 
-        if self.current_tok.type != TokenType.RBRACE:
-            return res.failure(InvalidSyntaxError(
-                self.current_tok.pos_start, self.current_tok.pos_end,
-                expected(TokenType.RBRACE)
-            ))
+        if self.current_kind != Kind.RBRACE:
+            return res.failure(self.syntax_error((TokenType.RBRACE,)))
 
         self.register_advance(res)
         
-        return res.success(ClassNode(class_name_tok, body, pos_start, self.current_tok.pos_end))
+        return res.success(ClassNode(class_name_tok, body.discard(), pos_start, self.current_tok.pos_end))
 
     def func_def(self):
-        debug_message.set_message("")
+        if debug_message.enabled: debug_message.set_message("")
         
         res = ParseResult()
 
         if not self.current_tok.matches(TokenType.KEYWORD, Keyword.SETFUNCTION):
-            return res.failure(InvalidSyntaxError(
-                self.current_tok.pos_start, self.current_tok.pos_end,
-                expected(Keyword.SETFUNCTION)
-            ))
+            return res.failure(self.syntax_error((Keyword.SETFUNCTION,)))
 
         self.register_advance(res)
 
-        if self.current_tok.type == TokenType.IDENTIFIER:
+        if self.current_kind == Kind.IDENTIFIER:
             func_name_tok = self.current_tok
             self.register_advance(res)
             
-            if self.current_tok.type != TokenType.LPAREN:
-                return res.failure(InvalidSyntaxError(
-                    self.current_tok.pos_start, self.current_tok.pos_end,
-                    expected(TokenType.LPAREN)
-                ))
+            if self.current_kind != Kind.LPAREN:
+                return res.failure(self.syntax_error((TokenType.LPAREN,)))
         else:
             func_name_tok = None
-            if self.current_tok.type != TokenType.LPAREN:
-                return res.failure(InvalidSyntaxError(
-                    self.current_tok.pos_start, self.current_tok.pos_end,
-                    expected(TokenType.IDENTIFIER, TokenType.LPAREN)
-                ))
+            if self.current_kind != Kind.LPAREN:
+                return res.failure(self.syntax_error((TokenType.IDENTIFIER, TokenType.LPAREN)))
 
         self.register_advance(res)
         
@@ -955,30 +987,24 @@ class Parser:
         
         while True:
             failsafe += 1
-            if failsafe > 5 or self.current_tok.type == TokenType.RPAREN: break
+            if failsafe > 5 or self.current_kind == Kind.RPAREN: break
             
             arg_name_set = False
 
-            if self.current_tok.type == TokenType.IDENTIFIER:
+            if self.current_kind == Kind.IDENTIFIER:
                 arg_name_toks.append(self.current_tok)
                 self.register_advance(res)
                 
                 failsafe = -1
                 arg_name_set = True
             else:
-                return res.failure(InvalidSyntaxError(
-                    self.current_tok.pos_start, self.current_tok.pos_end,
-                    expected(TokenType.IDENTIFIER)
-                ))             
+                return res.failure(self.syntax_error((TokenType.IDENTIFIER,)))
                 
-            if self.current_tok.type == TokenType.COLON and arg_name_set:
+            if self.current_kind == Kind.COLON and arg_name_set:
                 self.register_advance(res)
 
-                if self.current_tok.type != TokenType.IDENTIFIER:
-                    return res.failure(InvalidSyntaxError(
-                        self.current_tok.pos_start, self.current_tok.pos_end,
-                        expected(TokenType.IDENTIFIER)
-                    ))
+                if self.current_kind != Kind.IDENTIFIER:
+                    return res.failure(self.syntax_error((TokenType.IDENTIFIER,)))
 
                 arg_type_toks.append(self.current_tok)
                 self.register_advance(res)
@@ -988,12 +1014,9 @@ class Parser:
             elif arg_name_set:
                 arg_type_toks.append(Token(TokenType.IDENTIFIER, "Value"))
             else:
-                return res.failure(InvalidSyntaxError(
-                    self.current_tok.pos_start, self.current_tok.pos_end,
-                    expected(TokenType.IDENTIFIER)
-                ))
+                return res.failure(self.syntax_error((TokenType.IDENTIFIER,)))
             
-            if self.current_tok.type == TokenType.EQUALS and arg_name_set:
+            if self.current_kind == Kind.EQUALS and arg_name_set:
                 self.register_advance(res)
 
                 arg_default_value_toks.append(self.current_tok)
@@ -1004,28 +1027,26 @@ class Parser:
             elif arg_name_set:
                 arg_default_value_toks.append(Token(TokenType.GENERIC, None))
             else:
-                return res.failure(InvalidSyntaxError(
-                    self.current_tok.pos_start, self.current_tok.pos_end,
-                    expected(TokenType.IDENTIFIER)
-                ))
+                return res.failure(self.syntax_error((TokenType.IDENTIFIER,)))
 
-            if self.current_tok.type == TokenType.COMMA and arg_name_set:
+            if self.current_kind == Kind.COMMA and arg_name_set:
                 self.register_advance(res)
                 
                 failsafe = -1
 
-        if self.current_tok.type != TokenType.RPAREN:
-            return res.failure(InvalidSyntaxError(
-                self.current_tok.pos_start, self.current_tok.pos_end,
-                expected(TokenType.IDENTIFIER, TokenType.COLON, TokenType.EQUALS, TokenType.COMMA, TokenType.RPAREN)
-            ))
+        if self.current_kind != Kind.RPAREN:
+            return res.failure(self.syntax_error(EXPECTED_ARG_DEF))
                 
         self.register_advance(res)
 
-        if self.current_tok.type == TokenType.ARROW:
+        # A function with a yield in its body is a generator, the yields of the functions in it are their own
+        yield_count, self.yield_count = self.yield_count, 0
+
+        if self.current_kind == Kind.ARROW:
             self.register_advance(res)
 
             body = res.register(self.expr())
+            is_generator, self.yield_count = self.yield_count > 0, yield_count
             if res.error:
                 return res
 
@@ -1035,26 +1056,23 @@ class Parser:
                 arg_type_toks,
                 arg_default_value_toks,
                 body,
-                True
+                True,
+                is_generator
             ))
 
-        if self.current_tok.type != TokenType.LBRACE:
-            return res.failure(InvalidSyntaxError(
-                self.current_tok.pos_start, self.current_tok.pos_end,
-                expected(TokenType.ARROW, TokenType.LBRACE)
-            ))
+        if self.current_kind != Kind.LBRACE:
+            self.yield_count = yield_count
+            return res.failure(self.syntax_error((TokenType.ARROW, TokenType.LBRACE)))
 
         self.register_advance(res)
 
         body = res.register(self.statements())
+        is_generator, self.yield_count = self.yield_count > 0, yield_count
         if res.error:
             return res
         
-        if self.current_tok.type != TokenType.RBRACE:
-            return res.failure(InvalidSyntaxError(
-                self.current_tok.pos_start, self.current_tok.pos_end,
-                expected(TokenType.RBRACE)
-            ))
+        if self.current_kind != Kind.RBRACE:
+            return res.failure(self.syntax_error((TokenType.RBRACE,)))
 
         self.register_advance(res)
 
@@ -1063,33 +1081,7 @@ class Parser:
             arg_name_toks,
             arg_type_toks,
             arg_default_value_toks,
-            body,
-            False
+            body.discard(),
+            False,
+            is_generator
         ))
-
-    ###################################
-
-    def bin_op(self, func_a: Callable, ops: tuple[TokenType | Keyword], func_b: Callable = None):
-        if func_b is None:
-            func_b = func_a
-            
-        debug_message.set_message(f"{func_a.__name__}, {ops}, {func_b.__name__}")
-
-        res = ParseResult()
-        left = res.register(func_a())
-        if res.error:
-            debug_message.set_message("Error")
-            return res
-
-        while self.current_tok.type in ops or (self.current_tok.type, self.current_tok.value) in ops:
-            op_tok = self.current_tok
-            
-            self.register_advance(res)
-            
-            right = res.register(func_b())
-            if res.error:
-                debug_message.set_message("Error")
-                return res
-            left = BinOpNode(left, op_tok, right)
-
-        return res.success(left)
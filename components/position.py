@@ -1,20 +1,69 @@
+from bisect import bisect_right
+
+class Source:
+    # A script shared by every position in it, where its lines start is only found once a line is needed
+    __slots__ = ("fn", "text", "line_starts")
+
+    def __init__(self, fn: str, text: str):
+        self.fn = fn
+        self.text = text
+        self.line_starts: list[int] = None
+
+    def line(self, idx: int) -> int:
+        if self.line_starts is None:
+            line_starts = [0]
+            find = self.text.find
+            newline_idx = find("\n")
+            while newline_idx >= 0:
+                line_starts.append(newline_idx + 1)
+                newline_idx = find("\n", newline_idx + 1)
+            self.line_starts = line_starts
+
+        return bisect_right(self.line_starts, idx) - 1
+
+    def line_start(self, ln: int) -> int:
+        return self.line_starts[ln]
+
 class Position:
-    def __init__(self, idx: int, ln: int, col: int, fn: str, ftxt: str):
+    # Only an offset in its source, the line and column are worked out when an error shows them
+    __slots__ = ("idx", "source")
+
+    def __init__(self, idx: int, source: Source):
         self.idx = idx
-        self.ln = ln
-        self.col = col
-        self.fn = fn
-        self.ftxt = ftxt
+        self.source = source
 
-    def advance(self, current_char=None):
-        self.idx += 1
-        self.col += 1
+    @property
+    def ln(self) -> int:
+        return self.source.line(self.idx)
+
+    @property
+    def col(self) -> int:
+        ln = self.ln
+        return self.idx - self.source.line_start(ln)
+
+    @property
+    def fn(self) -> str:
+        return self.source.fn
 
-        if current_char == "\n":
-            self.ln += 1
-            self.col = 0
+    @property
+    def ftxt(self) -> str:
+        return self.source.text
 
+    def advance(self):
+        self.idx += 1
         return self
 
     def copy(self):
-        return Position(self.idx, self.ln, self.col, self.fn, self.ftxt)
+        return self.__class__(self.idx, self.source)
+
+class LineEndPosition(Position):
+    # Right after a newline, but still on the newline's line, where the lexer ends newline tokens
+    __slots__ = ()
+
+    @property
+    def ln(self) -> int:
+        return self.source.line(self.idx - 1)
+
+def position_on_line(idx: int, ln: int, source: Source) -> Position:
+    # Rebuilds a position stored with its line, one right after a newline can be on the newline's line
+    return Position(idx, source) if source.line(idx) == ln else LineEndPosition(idx, source)
@@ -0,0 +1,172 @@
+from .node import (Node, NumberNode, StringNode, ClassNode, ObjectNode,
+                   ListNode, BlockNode, VarAccessNode, VarAssignNode, VarReassignNode,
+                   BinOpNode, LogicalOpNode, UnaryOpNode, IfNode, ForNode, ForEachNode, WhileNode,
+                   FuncDefNode, CallNode, ReturnNode, YieldNode, ContinueNode, BreakNode)
+from .symbol_table import SymbolTable
+from .token import TokenType
+from .utils.strings_template import NO_METHOD_DEFINED_ERROR
+
+# Gives every variable bound in a scope (program, function or class body) a slot index,
+# then annotates the nodes that read or write those variables with a (depth, slot) address.
+# Function contexts are rebound where the function is accessed, so only the scope's own
+# variables (depth 0) have a stable address, every other name stays on the dynamic lookup.
+
+class Scope:
+    def __init__(self, layout: dict[str, int]):
+        self.layout = layout
+        self.pending_nodes: list[VarAccessNode] = []
+
+    def bind(self, name: str):
+        if name not in self.layout:
+            self.layout[name] = len(self.layout)
+        return (0, self.layout[name])
+
+class Resolver:
+    def __init__(self):
+        self.scopes: list[Scope] = []
+
+    def resolve(self, node: Node, symbol_table: SymbolTable):
+        self.enter_scope(symbol_table.layout)
+        self.visit(node)
+        self.exit_scope()
+        symbol_table.sync_frame()
+        return node
+
+    def enter_scope(self, layout: dict[str, int] = None):
+        scope = Scope({} if layout is None else layout)
+        self.scopes.append(scope)
+        return scope
+
+    def exit_scope(self):
+        scope = self.scopes.pop()
+
+        # Reads are addressed once the whole scope is known, a variable can be bound after it's read
+        for node in scope.pending_nodes:
+            slot = scope.layout.get(node.var_name_tok.value)
+            node.address = (0, slot) if slot is not None else None
+
+        return scope.layout
+
+    def visit(self, node: Node):
+        method_name = f'visit_{type(node).__name__}'
+        method = getattr(self, method_name, self.no_visit_method)
+
+        return method(node)
+
+    def no_visit_method(self, node: Node):
+        raise Exception(NO_METHOD_DEFINED_ERROR.format(f"visit_{type(node).__name__}"))
+
+    ###################################
+
+    def visit_NumberNode(self, node: NumberNode):
+        pass
+
+    def visit_StringNode(self, node: StringNode):
+        pass
+
+    def visit_ListNode(self, node: ListNode):
+        for element_node in node.element_nodes:
+            self.visit(element_node)
+
+    def visit_BlockNode(self, node: BlockNode):
+        for statement_node in node.statement_nodes:
+            self.visit(statement_node)
+
+    def visit_ObjectNode(self, node: ObjectNode):
+        for element_node in node.element_nodes:
+            self.visit(element_node)
+
+    def visit_VarAccessNode(self, node: VarAccessNode):
+        self.scopes[-1].pending_nodes.append(node)
+
+    def visit_VarAssignNode(self, node: VarAssignNode):
+        self.visit(node.value_node)
+        node.address = self.scopes[-1].bind(node.var_name_tok.value)
+
+    def visit_VarReassignNode(self, node: VarReassignNode):
+        self.visit(node.value_node)
+        node.address = self.scopes[-1].bind(node.var_name_tok.value)
+
+    def visit_BinOpNode(self, node: BinOpNode):
+        # Operations nest as deep as the expression is long, their operands are walked on a stack
+        stack = [node]
+
+        while stack:
+            node = stack.pop()
+            node_type = type(node)
+
+            if node_type is BinOpNode or node_type is LogicalOpNode:
+                # The right side of a dot is looked up by name in the class, not in this scope
+                if node.op_tok.type != TokenType.DOT:
+                    stack.append(node.right_node)
+                stack.append(node.left_node)
+            elif node_type is UnaryOpNode:
+                stack.append(node.node)
+            else:
+                self.visit(node)
+
+    visit_LogicalOpNode = visit_UnaryOpNode = visit_BinOpNode
+
+    def visit_IfNode(self, node: IfNode):
+        for condition, expr, _ in node.cases:
+            self.visit(condition)
+            self.visit(expr)
+
+        if node.else_case:
+            self.visit(node.else_case[0])
+
+    def visit_ForNode(self, node: ForNode):
+        self.visit(node.start_value_node)
+        self.visit(node.end_value_node)
+        if node.step_value_node:
+            self.visit(node.step_value_node)
+
+        node.var_address = self.scopes[-1].bind(node.var_name_tok.value)
+        self.visit(node.body_node)
+
+    def visit_ForEachNode(self, node: ForEachNode):
+        self.visit(node.iterable_node)
+
+        node.var_address = self.scopes[-1].bind(node.var_name_tok.value)
+        self.visit(node.body_node)
+
+    def visit_WhileNode(self, node: WhileNode):
+        self.visit(node.condition_node)
+        self.visit(node.body_node)
+
+    def visit_ClassNode(self, node: ClassNode):
+        self.scopes[-1].bind(node.class_name_tok.value)
+
+        self.enter_scope()
+        self.visit(node.body_node)
+        node.layout = self.exit_scope()
+
+    def visit_FuncDefNode(self, node: FuncDefNode):
+        if node.func_name_tok:
+            self.scopes[-1].bind(node.func_name_tok.value)
+
+        scope = self.enter_scope()
+        for arg_name_tok in node.arg_name_toks:
+            scope.bind(arg_name_tok.value)
+
+        self.visit(node.body_node)
+        node.layout = self.exit_scope()
+
+    def visit_CallNode(self, node: CallNode):
+        self.visit(node.node_to_call)
+        for arg_node in node.arg_nodes:
+            self.visit(arg_node)
+
+    def visit_ReturnNode(self, node: ReturnNode):
+        if node.node_to_return:
+            self.visit(node.node_to_return)
+
+    def visit_YieldNode(self, node: YieldNode):
+        if node.node_to_yield:
+            self.visit(node.node_to_yield)
+
+    def visit_ContinueNode(self, node: ContinueNode):
+        pass
+
+    def visit_BreakNode(self, node: BreakNode):
+        pass
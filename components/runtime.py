@@ -1,3 +1,5 @@
+from abc import abstractmethod
+
 class RunTimeResult:
     def __init__(self):
         self.reset()
@@ -49,5 +51,52 @@ class RunTimeResult:
             self.loop_should_break
         )
     
+    def unwrap(self):
+        # Value of the result, or the signal it should return with raised
+        if self.should_return(): self.raise_signal()
+        return self.value
+
+    def raise_signal(self):
+        # Turns a result that should return into the signal the engines returning values unwind with
+        if self.error: raise ErrorSignal(self.error)
+        if self.func_return_value: raise ReturnSignal(self.func_return_value)
+        if self.loop_should_continue: raise ContinueSignal()
+        if self.loop_should_break: raise BreakSignal()
+    
     def __repr__(self) -> str:
-        return f"<RunTimeResult:{self.value}:{self.error}>"
\ No newline at end of file
+        return f"<RunTimeResult:{self.value}:{self.error}>"
+
+
+# The tree walker and the engines returning values directly raise these instead of passing a RunTimeResult around
+class RunTimeSignal(Exception):
+    # Exceptions don't enforce abstract methods, a signal class without as_result fails when it's defined instead
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if getattr(cls.as_result, "__isabstractmethod__", False):
+            raise TypeError(f"Signal '{cls.__qualname__}' doesn't define as_result")
+
+    @abstractmethod
+    def as_result(self) -> RunTimeResult:
+        pass
+
+class ErrorSignal(RunTimeSignal):
+    def __init__(self, error):
+        self.error = error
+
+    def as_result(self):
+        return RunTimeResult().failure(self.error)
+
+class ReturnSignal(RunTimeSignal):
+    def __init__(self, value):
+        self.value = value
+
+    def as_result(self):
+        return RunTimeResult().success_return(self.value)
+
+class ContinueSignal(RunTimeSignal):
+    def as_result(self):
+        return RunTimeResult().success_continue()
+
+class BreakSignal(RunTimeSignal):
+    def as_result(self):
+        return RunTimeResult().success_break()
@@ -5,178 +5,319 @@ from .datatypes.Value import Value
 debug_message = DebugMessage("").set_auto_display(True)
 symbol_table_count = 0
 
+PROTECTED_SYMBOLS = ("immutable_symbols", "builtin_symbols")
+
+# A name can be set as several kinds of symbols in the same scope, the one found first is the
+# one read and the others are kept behind it until it's removed
+SYMBOLS_PRIORITIES = {"symbols": 0, "immutable_symbols": 1, "temporary_symbols": 2, "scoped_symbols": 3, "builtin_symbols": 4}
+
+# Bumped every time a name is bound or unbound in any symbol table, the lookups cached for a
+# name are only used while its version is the one they were cached with. Whether a name is
+# protected only changes with its immutable and built-in symbols, which have their own versions.
+binding_versions: dict[str, int] = {}
+protection_versions: dict[str, int] = {}
+
 class SymbolTable:
-    def __init__(self, parent = None):
+    def __init__(self, parent = None, layout: dict[str, int] = None):
         global symbol_table_count
         self.id = symbol_table_count
-        
-        self.symbols: dict[str, (Value, Value)] = {}
-        self.immutable_symbols: dict[str, (Value, Value)] = {}
-        self.temporary_symbols: dict[str, (Value, Value, int)] = {}
-        self.scoped_symbols: dict[str, (Value, Value)] = {}
-        
-        self.builtin_symbols: dict[str, (Value, Value)] = {}
-        
+
+        # Every symbol of this scope, tagged with the symbols name it was set as
+        self.entries: dict[str, (Value, Value, str, int)] = {}
+        # {name: {symbols name: entry}} of the symbols behind the one in entries
+        self.shadowed: dict[str, dict[str, tuple]] = {}
+
+        # Slot indexes given by the Resolver, the frame holds the entries of those names
+        self.layout: dict[str, int] = {} if layout is None else layout
+        self.frame: list = [None] * len(self.layout)
+
         self.parent: SymbolTable = parent
-        
+
+        # {name: (version, owning symbol table)} and {name: (version, protected)} found past this
+        # table, so a lookup from deep in a call chain doesn't walk every caller's scope again
+        self.resolved: dict[str, tuple] = {}
+        self.protected: dict[str, tuple] = {}
+
         symbol_table_count += 1
-        debug_message.set_message(f"ST {self.id}: CREATED")
-        
+        if debug_message.enabled: debug_message.set_message("ST {}: CREATED", self.id)
+
+    def items(self, *symbols_names: str):
+        items = [(name, entry) for name, entry in self.entries.items() if entry[2] in symbols_names]
+        for name, shadowed in self.shadowed.items():
+            items.extend((name, entry) for entry in shadowed.values() if entry[2] in symbols_names)
+        return items
+
+    def _entry_of(self, name: str, symbols_name: str):
+        # The entry of name set as symbols_name in this scope, even behind another kind of symbol
+        entry = self.entries.get(name)
+        if entry is not None and entry[2] == symbols_name:
+            return entry
+
+        shadowed = self.shadowed.get(name)
+        return shadowed.get(symbols_name) if shadowed else None
+
+    def _is_protected_here(self, name: str):
+        entry = self.entries.get(name)
+        if entry is not None and entry[2] in PROTECTED_SYMBOLS:
+            return True
+
+        shadowed = self.shadowed.get(name)
+        return shadowed is not None and any(symbols_name in shadowed for symbols_name in PROTECTED_SYMBOLS)
+
     def merge(self, other):
-        symbols_list = [
-            "symbols",
-            "immutable_symbols"
-        ]
-        
-        for symbols in symbols_list:
-            for k, v in getattr(other, symbols).items():
-                getattr(self, symbols)[k] = v
+        for name, entry in other.items("symbols", "immutable_symbols"):
+            self._bind(name, entry)
+
+    def _bind(self, name: str, entry: tuple):
+        binding_versions[name] = binding_versions.get(name, 0) + 1
+        current_entry = self.entries.get(name)
+        if entry[2] in PROTECTED_SYMBOLS or current_entry is not None and current_entry[2] in PROTECTED_SYMBOLS:
+            protection_versions[name] = protection_versions.get(name, 0) + 1
+
+        if current_entry is not None and current_entry[2] != entry[2]:
+            shadowed = self.shadowed.setdefault(name, {})
+            if SYMBOLS_PRIORITIES[entry[2]] > SYMBOLS_PRIORITIES[current_entry[2]]:
+                shadowed[entry[2]] = entry
+                return
+            shadowed[current_entry[2]] = current_entry
+
+        self.entries[name] = entry
+        slot = self.layout.get(name)
+        if slot is not None:
+            self.frame[slot] = entry
+
+    def _unbind(self, name: str, symbols_name: str = None):
+        # Removes the entry of name set as symbols_name, the one in entries by default
+        binding_versions[name] = binding_versions.get(name, 0) + 1
+        entry = self.entries[name]
+        shadowed = self.shadowed.get(name)
+
+        if symbols_name is not None and entry[2] != symbols_name:
+            entry = shadowed.pop(symbols_name)
+            if not shadowed: del self.shadowed[name]
+            if entry[2] in PROTECTED_SYMBOLS:
+                protection_versions[name] = protection_versions.get(name, 0) + 1
+            return
+
+        if entry[2] in PROTECTED_SYMBOLS:
+            protection_versions[name] = protection_versions.get(name, 0) + 1
+
+        if shadowed:
+            # The symbol that was behind it is found from now on
+            entry = shadowed.pop(min(shadowed, key=SYMBOLS_PRIORITIES.get))
+            if not shadowed: del self.shadowed[name]
+            self.entries[name] = entry
+        else:
+            entry = None
+            del self.entries[name]
+
+        slot = self.layout.get(name)
+        if slot is not None:
+            self.frame[slot] = entry
+
+    def sync_frame(self):
+        # Grows the frame after the Resolver added new slots to the layout
+        for name in list(self.layout)[len(self.frame):]:
+            self.frame.append(self.entries.get(name))
+
+    def frame_entry(self, depth: int, slot: int):
+        symbol_table = self
+        while depth:
+            symbol_table = symbol_table.parent
+            depth -= 1
+        return symbol_table.frame[slot]
+
+    def lookup_slot(self, depth: int, slot: int, name: str):
+        # Slot fast path, missing and temporary symbols go through the lookup by name
+        entry = self.frame_entry(depth, slot)
+
+        if entry is None or entry[2] == "temporary_symbols":
+            return self.lookup(name)
+
+        return entry[0]
+
+    def set_slot(self, depth: int, slot: int, name: str, value: Value, type: Value):
+        # Slot fast path for overwriting a variable of the same type, anything else goes through set
+        entry = self.frame_entry(depth, slot)
+
+        if depth == 0 and entry is not None and entry[2] == "symbols" and entry[1] == type and name not in self.shadowed:
+            entry = (value, type, "symbols", None)
+            self.entries[name] = entry
+            self.frame[slot] = entry
+            return True, "const"
+
+        return self.set(name, value, type)
 
     def copy_symbol(self, name: str):
-        symbol_type_id = self.exists_in(name)
-        
-        if not symbol_type_id or symbol_type_id in {"temporary_symbols", "scoped_symbols"}: 
+        value, type, symbol_type_id, _ = self.resolve(name)
+
+        if not symbol_type_id or symbol_type_id in {"temporary_symbols", "scoped_symbols"}:
             # I don't know how to handle this situation properly
             return None
-        
-        return (self.get(name).copy(), self.get_type(name))
+
+        return (value.copy(), type)
 
     def _exists(self, name: str, symbols_name: str, extra_condition: bool = True):
-        return name in getattr(self, symbols_name) and extra_condition
+        entry = self.entries.get(name)
+        return entry is not None and entry[2] == symbols_name and extra_condition
+
+    def lookup_entry(self, name: str, calling_from_parent: bool = False):
+        # One probe per scope level, returns (entry, owning symbol table) or (None, None) on a miss
+        version = binding_versions.get(name)
+        symbol_table = self
+
+        while symbol_table is not None:
+            entry = symbol_table.entries.get(name)
+
+            # Scoped symbols are only visible from their own scope
+            if entry is not None and not (calling_from_parent and entry[2] == "scoped_symbols"):
+                break
+
+            cached = symbol_table.resolved.get(name)
+            if cached is not None and cached[0] == version:
+                symbol_table = cached[1]
+                entry = symbol_table.entries[name] if symbol_table is not None else None
+                break
+
+            symbol_table = symbol_table.parent
+            calling_from_parent = True
+        else:
+            entry = None
+
+        if symbol_table is not self:
+            self.resolved[name] = (version, symbol_table)
+
+        return entry, symbol_table
+
+    def resolve(self, name: str, calling_from_parent: bool = False):
+        # Walks the parent chain once, returns (value, type, symbols name, owning symbol table)
+        entry, symbol_table = self.lookup_entry(name, calling_from_parent)
+
+        if entry is None:
+            return None, None, None, None
+
+        return entry[0], entry[1], entry[2], symbol_table
 
     def exists_in(self, name: str, calling_from_parent: bool = False):
-        debug_message.set_message(f"ST {self.id}: SYMBOL '{name}': CHECKING SYMBOL TYPE")
-        symbol_type_name = None
-        symbol_table_inst = self
-        
-        if name in self.symbols:
-            symbol_type_name = "symbols"
-            
-        elif name in self.immutable_symbols:
-            symbol_type_name = "immutable_symbols"
-            
-        elif name in self.temporary_symbols and not calling_from_parent:
-            symbol_type_name = "temporary_symbols"
-            
-        elif name in self.scoped_symbols and not calling_from_parent:
-            symbol_type_name = "scoped_symbols"
-            
-        elif name in self.builtin_symbols:
-            symbol_type_name = "builtin_symbols"
-            
-        if symbol_type_name is None and self.parent:
-            symbol_type_name, symbol_table_inst = self.parent.exists_in(name, True)
-            
-        return symbol_type_name, symbol_table_inst
-            
+        if debug_message.enabled: debug_message.set_message("ST {}: SYMBOL '{}': CHECKING SYMBOL TYPE", self.id, name)
+        entry, symbol_table = self.lookup_entry(name, calling_from_parent)
+
+        # Unlike a read, temporary symbols are only found from their own scope, like scoped ones
+        while entry is not None and entry[2] == "temporary_symbols" and (symbol_table is not self or calling_from_parent):
+            if symbol_table.parent is None:
+                return None, None
+            entry, symbol_table = symbol_table.parent.lookup_entry(name, True)
+
+        if entry is None:
+            return None, None
+
+        return entry[2], symbol_table
+
     def exists(self, name: str, calling_from_parent: bool = False) -> bool:
-        exists = False
-        if not calling_from_parent: debug_message.set_message(f"ST {self.id}: SYMBOL '{name}': EXISTS: CHECKING")
-
-        symbols_list = [
-            ("symbols", 1),
-            ("immutable_symbols", 1),
-            ("temporary_symbols", 1),
-            ("scoped_symbols", not calling_from_parent),
-            ("builtin_symbols", 1)
-        ]
-        
-        for symbols in symbols_list:
-            exists = self._exists(name, symbols[0], symbols[1])
-            if exists: break
-            
-        if not exists and self.parent:
-            debug_message.set_message(f"ST {self.id}: SYMBOL '{name}': EXISTS: CHECKING IN PARENT ST {self.parent.id}")
-            exists = self.parent.exists(name, True)
-        
-        if not calling_from_parent: debug_message.set_message(f"ST {self.id}: SYMBOL '{name}': EXISTS: {exists}")
+        exists = self.lookup_entry(name, calling_from_parent)[0] is not None
+        if debug_message.enabled and not calling_from_parent: debug_message.set_message("ST {}: SYMBOL '{}': EXISTS: {}", self.id, name, exists)
         return exists
 
     def _is_immutable_or_builtin_check(self, name: str):
-        exists = self._exists(name, "immutable_symbols") or self._exists(name, "builtin_symbols")
-        
-        if not exists and self.parent:
-            exists = self.parent._is_immutable_or_builtin_check(name)
-        
-        return exists
-    
+        version = protection_versions.get(name)
+        symbol_table = self
+        protected = False
+
+        while symbol_table is not None:
+            if symbol_table._is_protected_here(name):
+                if symbol_table is self:
+                    return True
+                protected = True
+                break
+
+            cached = symbol_table.protected.get(name)
+            if cached is not None and cached[0] == version:
+                protected = cached[1]
+                break
+
+            symbol_table = symbol_table.parent
+
+        self.protected[name] = (version, protected)
+        return protected
+
+    def _consume_temporary(self, name: str, entry: tuple):
+        # Returns if the temporary symbol still exists after being referenced
+        new_lifetime = entry[3] - 1 or 0
+        self.set_as_temporary(name, entry[0], entry[1], new_lifetime)
+        return new_lifetime > 0
+
+    def lookup(self, name: str):
+        # Lookup-or-miss, returns the value or None when the symbol doesn't exist
+        entry, symbol_table = self.lookup_entry(name)
+
+        if entry is None:
+            return None
+
+        if entry[2] == "temporary_symbols" and not symbol_table._consume_temporary(name, entry):
+            return None
+
+        return entry[0]
+
     def _get(self, name: str, calling_from_parent: bool = False):
-        if not calling_from_parent: debug_message.set_message(f"ST {self.id}: SYMBOL '{name}': GET: CHECKING")
-        value = self.symbols.get(name, [None])[0]
-        type = self.symbols.get(name, [None, None])[1]
-        
-        if value is None:
-            if name in self.immutable_symbols:
-                value = self.immutable_symbols.get(name, [None])[0]
-                type = self.immutable_symbols.get(name, [None, None])[1]
-            
-            elif name in self.temporary_symbols:
-                value = self.temporary_symbols.get(name, [None])[0]
-                type = self.temporary_symbols.get(name, [None, None])[1]
-                
-                if value is not None:
-                    new_lifetime = self.temporary_symbols[name][2] - 1 or 0
-                    self.set_as_temporary(name, value, type, new_lifetime)
-                    
-            elif name in self.scoped_symbols and not calling_from_parent:
-                value = self.scoped_symbols.get(name, [None])[0]
-                type = self.scoped_symbols.get(name, [None, None])[1]
-
-            elif name in self.builtin_symbols:
-                value = self.builtin_symbols.get(name, [None])[0]
-                type = self.builtin_symbols.get(name, [None, None])[1]
-                
-            if value is None and self.parent:
-                debug_message.set_message(f"ST {self.id}: SYMBOL '{name}': GET: CHECKING IN PARENT ST {self.parent.id}")
-                value = self.parent._get(name, True)[0]
-                type = self.parent._get(name, True)[1]
-                
-        return value, type
+        if debug_message.enabled and not calling_from_parent: debug_message.set_message("ST {}: SYMBOL '{}': GET: CHECKING", self.id, name)
+        entry, symbol_table = self.lookup_entry(name, calling_from_parent)
+
+        if entry is None:
+            return None, None
+
+        if entry[2] == "temporary_symbols":
+            symbol_table._consume_temporary(name, entry)
+
+        return entry[0], entry[1]
 
     def get(self, name: str, calling_from_parent: bool = False) -> Value:
         return self._get(name, calling_from_parent)[0]
-    
+
     def get_type(self, name: str, calling_from_parent: bool = False) -> Value:
         return self._get(name, calling_from_parent)[1]
-    
-    def _set_symbol(self, name: str, value: Value, type: Value, symbols_name: str, **kwargs):
+
+    def _write_symbol(self, name: str, value: Value, type: Value, symbols_name: str, lifetime: int):
         success = False
         fail_type = "const"
-        debug_message.set_message(f"ST {self.id}: SYMBOL '{name}': SET: CHECKING")
-        
-        if self._exists(name, symbols_name):
-            current_type = getattr(self, symbols_name)[name][1]
-            if type != current_type:
+
+        current_entry = self._entry_of(name, symbols_name)
+
+        if current_entry is not None:
+            if type != current_entry[1]:
                 fail_type = "type"
-        
+
         if not self._is_immutable_or_builtin_check(name) and fail_type == "const":
-            if symbols_name.startswith("temp"):
-                lifetime = kwargs.get("lifetime", 0)
-                if not self._exists(name, symbols_name):
+            if symbols_name == "temporary_symbols":
+                if current_entry is None:
                     if lifetime > 0:
-                        getattr(self, symbols_name)[name] = (value, type, lifetime+1)
+                        self._bind(name, (value, type, symbols_name, lifetime+1))
                         success =  True
                 else:
-                    if lifetime <= 0: self.remove(name)
+                    if lifetime <= 0: self._unbind(name, symbols_name)
                     else:
-                        getattr(self, symbols_name)[name] = (value, type, lifetime)
+                        self._bind(name, (value, type, symbols_name, lifetime))
                         success = True
             else:
-                getattr(self, symbols_name)[name] = (value, type)
+                self._bind(name, (value, type, symbols_name, None))
                 success = True
-                
-        debug_message.set_message(f"ST {self.id}: SYMBOL '{name}': SET: SUCCESSFUL: {success}")
+
         return success, fail_type
-   
+
+    def _set_symbol(self, name: str, value: Value, type: Value, symbols_name: str, **kwargs):
+        if debug_message.enabled: debug_message.set_message("ST {}: SYMBOL '{}': SET: CHECKING", self.id, name)
+        success, fail_type = self._write_symbol(name, value, type, symbols_name, kwargs.get("lifetime", 0))
+        if debug_message.enabled: debug_message.set_message("ST {}: SYMBOL '{}': SET: SUCCESSFUL: {}", self.id, name, success)
+        return success, fail_type
+
     def set(self, name: str, value: Value, type: Value):
         return self._set_symbol(name, value, type, "symbols")
 
     def set_as_immutable(self, name: str, value: Value, type: Value):
         return self._set_symbol(name, value, type, "immutable_symbols")
-        
+
     def set_as_temporary(self, name: str, value: Value, type: Value, lifetime: int):
         return self._set_symbol(name, value, type, "temporary_symbols", lifetime = lifetime)
-        
+
     def set_as_scoped(self, name: str, value: Value, type: Value):
         return self._set_symbol(name, value, type, "scoped_symbols")
 
@@ -184,67 +325,26 @@ class SymbolTable:
         return self._set_symbol(name, value, type, "builtin_symbols")
 
     def _reset_symbol(self, name: str, value: Value, type: Value, symbols_name: str, **kwargs):
-        success = False
-        fail_type = "const"
-        debug_message.set_message(f"ST {self.id}: SYMBOL '{name}': RESET: CHECKING")
-        
-        if self._exists(name, symbols_name):
-            current_type = getattr(self, symbols_name)[name][1]
-            if type != current_type:
-                fail_type = "type"
-        
-        if not self._is_immutable_or_builtin_check(name) and fail_type == "const":
-            if symbols_name.startswith("temp"):
-                lifetime = kwargs.get("lifetime", 0)
-                if not self._exists(name, symbols_name):
-                    if lifetime > 0:
-                        getattr(self, symbols_name)[name] = (value, type, lifetime+1)
-                        success =  True
-                else:
-                    if lifetime <= 0: self.remove(name)
-                    else:
-                        getattr(self, symbols_name)[name] = (value, type, lifetime)
-                        success = True
-            else:
-                getattr(self, symbols_name)[name] = (value, type)
-                success = True
-                
-        debug_message.set_message(f"ST {self.id}: SYMBOL '{name}': RESET: SUCCESSFUL: {success}")
+        if debug_message.enabled: debug_message.set_message("ST {}: SYMBOL '{}': RESET: CHECKING", self.id, name)
+        success, fail_type = self._write_symbol(name, value, type, symbols_name, kwargs.get("lifetime", 0))
+        if debug_message.enabled: debug_message.set_message("ST {}: SYMBOL '{}': RESET: SUCCESSFUL: {}", self.id, name, success)
         return success, fail_type
-        
-        # else:
-        #     status = None
-            
-        #     if self.parent:
-        #         status = self.parent._reset_symbol(name, value, type, symbols_name, **kwargs)
-        #     else:
-        #         status = self._reset_symbol(name, value, type, symbols_name, **kwargs)
-            
-        #     return status
-    
+
     def reset(self, name: str, value: Value, type: Value):
         return self._reset_symbol(name, value, type, "symbols")
-        
+
     def reset_temporary(self, name: str, value: Value, type: Value, lifetime: int):
         return self._reset_symbol(name, value, type, "temporary_symbols", lifetime = lifetime)
-        
+
     def reset_scoped(self, name: str, value: Value, type: Value):
         return self._reset_symbol(name, value, type, "scoped_symbols")
-    
+
     def remove(self, name: str):
-        debug_message.set_message(f"ST {self.id}: SYMBOL '{name}': DELETE")
-        if name in self.symbols:
-            del self.symbols[name]
-        elif name in self.immutable_symbols:
-            del self.immutable_symbols[name]
-        elif name in self.temporary_symbols:
-            del self.temporary_symbols[name]
-        elif name in self.scoped_symbols:
-            del self.scoped_symbols[name]
-            
+        if debug_message.enabled: debug_message.set_message("ST {}: SYMBOL '{}': DELETE", self.id, name)
+        entry = self.entries.get(name)
+        if entry is not None and entry[2] != "builtin_symbols":
+            self._unbind(name)
+
     def copy(self):
-        copy = SymbolTable(self, self.context)
-        copy.symbols = self.symbols
-        copy.immutable_symbols = self.immutable_symbols
-        return copy
-            
\ No newline at end of file
+        return SymbolTable(self)
+
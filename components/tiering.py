@@ -0,0 +1,103 @@
+from .transpiler import Transpiler
+from .transpiled_runtime import run_compiled
+from .datatypes.all import Number
+from .utils.debug import DebugMessage
+
+# Function bodies start in the tree walker, which counts their calls and loop iterations and
+# whether every call passed only Numbers. Once a body is hot it's transpiled to Python and
+# compiled. A body only ever called with Numbers is specialized to them, its arithmetic and
+# comparisons are computed inline on two Numbers, and a call passing anything else deopts and
+# runs in the tree walker. A body deopting too often tiers up again to the generic transpiled
+# body --compile writes, which runs every call. --no-tiering keeps every body in the tree walker.
+
+debug_message = DebugMessage("")
+
+CALL_THRESHOLD = 100
+LOOP_THRESHOLD = 2000
+MAX_DEOPTS = 20
+
+enabled = True
+stats = {"tier_ups": 0, "deopts": 0}
+
+def set_enabled(_enabled: bool):
+    global enabled
+    enabled = _enabled
+
+class Profile:
+    def __init__(self):
+        self.calls = 0
+        self.loop_iterations = 0
+        # Whether every profiled call passed only Numbers, the compiled body is then specialized to them
+        self.numbers_only = True
+        self.compiled = None
+        self.specialized = False
+        self.deopts = 0
+        # Set when the body can't be compiled, it stays in the tree walker
+        self.given_up = False
+
+    def is_hot(self) -> bool:
+        return self.calls >= CALL_THRESHOLD or self.loop_iterations >= LOOP_THRESHOLD
+
+def get_profile(body_node) -> Profile:
+    # Kept on the body node, so it's shared by every copy of the function
+    profile = getattr(body_node, "profile", None)
+    if profile is None:
+        profile = body_node.profile = Profile()
+    return profile
+
+def only_numbers(arg_values: list) -> bool:
+    for arg_value in arg_values:
+        if type(arg_value) is not Number:
+            return False
+    return True
+
+def body_runner(body_node, arg_values: list, context, interpreter):
+    # Returns what runs the body for this call, loops run by the tree walker count into the context's profile
+    profile = get_profile(body_node)
+
+    if profile.compiled is not None:
+        if not profile.specialized or only_numbers(arg_values):
+            return profile.compiled
+        deopt(profile, body_node)
+        return interpreter.visit
+
+    if not profile.given_up:
+        profile.calls += 1
+        profile.numbers_only = profile.numbers_only and only_numbers(arg_values)
+        context.profile = profile
+
+        if profile.is_hot():
+            tier_up(profile, body_node, profile.numbers_only)
+
+    return interpreter.visit
+
+def tier_up(profile: Profile, body_node, specialized: bool):
+    pos = body_node.pos_start
+
+    try:
+        source = Transpiler(number_fast_paths=specialized).transpile(body_node, pos.fn, in_program_scope=False)
+        code = compile(source, f"<tiered {pos.fn}:{pos.ln + 1}>", "exec")
+    except Exception as e:
+        # A body the Transpiler can't handle is a bug of the Transpiler, not of the script
+        if debug_message.enabled: debug_message.set_message("TIER UP FAILED: {}:{}: {!r}", pos.fn, pos.ln + 1, e).display()
+        profile.compiled = None
+        profile.given_up = True
+        return
+
+    module = {}
+    exec(code, module)
+    module["load"](pos.fn, pos.ftxt)
+    main = module["main"]
+
+    profile.compiled = lambda node, context: run_compiled(main, context)
+    profile.specialized = specialized
+    stats["tier_ups"] += 1
+    if debug_message.enabled: debug_message.set_message("TIER UP: {}:{}: {} calls, {} loop iterations, specialized to Numbers: {}", pos.fn, pos.ln + 1, profile.calls, profile.loop_iterations, specialized).display()
+
+def deopt(profile: Profile, body_node):
+    profile.deopts += 1
+    stats["deopts"] += 1
+
+    if profile.deopts >= MAX_DEOPTS:
+        # It isn't only called with Numbers after all, the generic body runs every call from now on
+        tier_up(profile, body_node, False)
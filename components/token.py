@@ -1,6 +1,8 @@
 from enum import Enum
 from typing import Any
-from .position import Position
+from types import SimpleNamespace
+from array import array
+from .position import Source, Position, LineEndPosition
 from .utils.debug import DebugMessage
 
 debug_message = DebugMessage("")
@@ -63,20 +65,26 @@ class TokenType(Enum):
     
     EOF = "EOF"
 
+# Small int code of every token type, what a TokenStream stores and the parser compares
+TOKEN_TYPES = tuple(TokenType)
+KINDS = {token_type: kind for kind, token_type in enumerate(TOKEN_TYPES)}
+Kind = SimpleNamespace(**{token_type.name: kind for token_type, kind in KINDS.items()})
+
 class Token:
     def __init__(self, type_: TokenType, value: Any = None, pos_start: Position = None, pos_end: Position = None):
         self.type = type_
         self.value = value
 
+        # The positions are kept as given, the token stream makes new ones for every token
         if pos_start:
-            self.pos_start = pos_start.copy()
-            self.pos_end = pos_start.copy()
-            self.pos_end.advance()
+            self.pos_start = pos_start
+            if not pos_end:
+                self.pos_end = pos_start.copy().advance()
 
         if pos_end:
             self.pos_end = pos_end
             
-        debug_message.set_message(f"TOKEN: CREATED: {self}").display()
+        if debug_message.enabled: debug_message.set_message("TOKEN: CREATED: {}", self).display()
 
     def matches(self, type_: TokenType, value: Any = None):
         return (self.type == type_ and self.value == value) if value else (self.type == type_)
@@ -90,3 +98,65 @@ class Token:
         else:
             strRepr += ">"
         return strRepr
+
+class TokenStream:
+    # The lexer's tokens as parallel arrays of kinds, values and start and end offsets. A Token
+    # is only made when the parser reaches it, and only the ones kept by nodes outlive parsing.
+    LEXER_END = -1
+
+    def __init__(self, source: Source, end: Position):
+        self.source = source
+        # Shared by every token ending where the lexer stopped, its end is LEXER_END
+        self.end = end
+
+        self.kinds = bytearray()
+        self.values: list[Any] = []
+        self.starts = array("q")
+        self.ends = array("q")
+
+        # A streamed script is lexed by feed as tokens are reached, the error stops it with an EOF
+        self.feed = None
+        self.error = None
+
+    def reaches(self, idx: int) -> bool:
+        if idx >= len(self.kinds) and self.feed is not None:
+            for _ in self.feed:
+                if idx < len(self.kinds): break
+            else:
+                self.feed = None
+
+        return idx < len(self.kinds)
+
+    def drop(self, count: int):
+        # Lets go of streamed tokens already parsed, the ones after them move to the front
+        del self.kinds[:count]
+        del self.values[:count]
+        del self.starts[:count]
+        del self.ends[:count]
+
+    def append(self, kind: int, value: Any, start: int, end: int = LEXER_END):
+        self.kinds.append(kind)
+        self.values.append(value)
+        self.starts.append(start)
+        self.ends.append(end)
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def __getitem__(self, idx: int) -> Token:
+        kind, end = self.kinds[idx], self.ends[idx]
+
+        if end == TokenStream.LEXER_END:
+            pos_end = self.end
+        elif kind == Kind.NEWLINE:
+            pos_end = LineEndPosition(end, self.source)
+        else:
+            pos_end = Position(end, self.source)
+
+        return Token(TOKEN_TYPES[kind], self.values[idx], Position(self.starts[idx], self.source), pos_end)
+
+    def __iter__(self):
+        return (self[idx] for idx in range(len(self)))
+
+    def __repr__(self):
+        return repr(list(self))
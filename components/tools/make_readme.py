@@ -1,6 +1,7 @@
 from ..keyword import Keyword
-from ..utils.syntax_template import (WHILE_SYNTAX, FOR_SYNTAX, IF_ELSEIF_ELSE_SYNTAX, FUNC_SYNTAX, LOCAL_SYNTAX,
-                                             VAR_SYNTAX, CONST_SYNTAX, TEMP_SYNTAX, VALUE_EXPRESSION, FUNC_SYNTAX_IN_LINE)
+from ..utils.syntax_template import (WHILE_SYNTAX, FOR_SYNTAX, FOR_EACH_SYNTAX, IF_ELSEIF_ELSE_SYNTAX, FUNC_SYNTAX, LOCAL_SYNTAX,
+                                             VAR_SYNTAX, CONST_SYNTAX, TEMP_SYNTAX, VALUE_EXPRESSION, FUNC_SYNTAX_IN_LINE,
+                                             GENERATOR_SYNTAX)
 from ..wrapper import run
 
 def generate_md_file(content):
@@ -61,6 +62,14 @@ python3 nakathon.py ./file_name.nkt # Linux, Mac
 
 ```
 
+### Cache
+
+When Nakathon runs a .nkt file it keeps the parsed script in a ``__nktcache__`` folder next to it,
+so running the same script again skips parsing it. ``--compile`` also writes the Python module made
+from the script there. Every file is named after the script and the hash of its source, an edited
+script is parsed again and the files of its older versions are removed by ``clear_cache``
+(``components/cache.py``). The folder can be deleted at any time and is ignored by git.
+
 ### Data Types
 
 ```py
@@ -100,6 +109,18 @@ The Variable/Function name can be in ``snake_case``, ``camelCase`` or ``PascalCa
 
 {FUNC_SYNTAX}
 
+# A function with 'yield' in it is a generator function, calling it gives a generator and its body
+# only runs as far as the values it yields are used, by a For Each Loop or ToList
+# 'yield' is a keyword since generator functions were added, it can't be used as a name anymore
+{GENERATOR_SYNTAX}
+
+func Numbers(n) {{
+    for i = 0 ; n {{
+        yield i
+    }}
+}}
+ToList(Numbers(3)) # -> [0, 1, 2]
+
 ```
 
 ### Built-in functions
@@ -117,8 +138,9 @@ InputNumber(prompt: String = "> ")
 # Clear, used to clear the terminal
 Clear()
 
-# To Functions, used to convert a value into a string
+# To Functions, used to convert a value into a string, or the elements of a list, a Range or a generator into a list
 ToString(value: Any)
+ToList(value: List | Range | Generator)
 
 # Is Functions, used to know if the inputed value is that data type
 IsNumber(value: Any)
@@ -131,7 +153,7 @@ IsNull(value: Any)
 # List Functions, used to alter a list type (examples are down below)
 ListAppend(list: List, value: Any)
 ListPop(list: List, index: Number)
-ListExtend(list: List, list: List)
+ListExtend(list: List, elements: List | Range | Generator)
 ListLen(list: List)
 
 # Random Functions
@@ -139,6 +161,9 @@ Random()
 RandomInt(min: Number, max: Number)
 RandomFloat(min: Number, max: Number)
 
+# Range, the numbers from start up to end, without end, made one at a time as a loop goes through them
+Range(start: Number, end: Number, step: Number = 1)
+
 # Misc Functions
 Import(filename: String, namespace: String)
 Run(filename: String)
@@ -275,6 +300,13 @@ Exit(code_number: Number = 0)
 # To use the For Loop follow the syntax below
 {FOR_SYNTAX}
 
+# To go through every element of a list, a Range or a generator use the For Each Loop
+# 'in' is a keyword since For Each Loops were added, it can't be used as a name anymore
+{FOR_EACH_SYNTAX}
+for i in Range(0, 10, 2) {{
+    Print(i)
+}}
+
 # To use the While Loop follow the syntax below
 {WHILE_SYNTAX}
 
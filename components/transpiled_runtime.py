@@ -0,0 +1,153 @@
+from .node import (Node, NumberNode, StringNode, ClassNode, ObjectNode,
+                   ListNode, BlockNode, VarAccessNode, VarAssignNode, VarReassignNode,
+                   BinOpNode, LogicalOpNode, UnaryOpNode, IfNode, ForNode, ForEachNode, WhileNode,
+                   FuncDefNode, CallNode, ReturnNode, YieldNode, ContinueNode, BreakNode)
+from .datatypes.all import Value, Number, Boolean, String, List, Null, Function, Class, make_value, make_value_type
+from .context import Context
+from .symbol_table import SymbolTable
+from .position import Source, Position, position_on_line
+from .token import Token, TokenType
+from .keyword import Keyword
+from .interpreter import Interpreter, binary_operation, located, call_value, iterate
+from .runtime import RunTimeResult, RunTimeSignal, ErrorSignal, ReturnSignal, ContinueSignal, BreakSignal
+from .error import RunTimeError
+from .utils.strings_template import IS_NOT_DEFINED_ERROR
+
+# What the modules written by the Transpiler run against. Every helper does what the tree
+# walker does for the same node, through the same Interpreter methods where there is one,
+# so a transpiled program gives the same values and errors as the script it came from.
+
+interpreter = Interpreter()
+
+def positions(fn: str, source: str, flat_positions: tuple[int]) -> list[Position]:
+    # Positions are stored as flat (idx, ln, col) triples and rebuilt against the source
+    source = Source(fn, source)
+    return [position_on_line(flat_positions[i], flat_positions[i + 1], source) for i in range(0, len(flat_positions), 3)]
+
+def rebuild(cls: type, attributes: dict):
+    # Tokens and nodes are rebuilt without their constructors, which expect the parser's state
+    instance = cls.__new__(cls)
+    instance.__dict__.update(attributes)
+    return instance
+
+def run_compiled(body, context: Context) -> RunTimeResult:
+    try:
+        return body(context)
+    except RunTimeSignal as signal:
+        return signal.as_result()
+
+def success(value) -> RunTimeResult:
+    return RunTimeResult().success(value)
+
+def returned(value) -> RunTimeResult:
+    return RunTimeResult().success_return(value)
+
+class CompiledFunction(Function):
+    # A Function whose body is a Python function written by the Transpiler, it's shown and named
+    # in errors as a Function like the one the tree walker makes
+    __qualname__ = "Function"
+
+    def call(self, arg_values: list, context: Context, pos_start: Position, pos_end: Position, run_body = None):
+        return super().call(arg_values, context, pos_start, pos_end, run_compiled)
+
+    def copy(self):
+        copy = CompiledFunction(self.name, self.body_node,
+                                self.arg_names, self.arg_types, self.arg_default_values, self.should_auto_return, self.layout)
+        copy.set_pos(self.pos_start, self.pos_end)
+        copy.set_context(self.context)
+        return copy
+
+###################################
+
+def not_defined(name: str, pos_start: Position, pos_end: Position, context: Context):
+    raise ErrorSignal(RunTimeError(
+        pos_start, pos_end,
+        IS_NOT_DEFINED_ERROR.format(name),
+        context
+    ))
+
+def load_name(context: Context, name: str, pos_start: Position, pos_end: Position):
+    value = context.symbol_table.lookup(name)
+    if value is None: not_defined(name, pos_start, pos_end, context)
+
+    return value
+
+def load_slot(context: Context, slot: int, name: str, pos_start: Position, pos_end: Position):
+    symbol_table = context.symbol_table
+    entry = symbol_table.frame[slot]
+    if entry is None or entry[2] == "temporary_symbols":
+        value = symbol_table.lookup(name)
+        if value is None: not_defined(name, pos_start, pos_end, context)
+    else:
+        value = entry[0]
+
+    return value
+
+def assign(context: Context, node: VarAssignNode, value):
+    res = interpreter._var_assign(node, context, value)
+    if res.error: raise ErrorSignal(res.error)
+    return res.value
+
+def reassign_target(context: Context, node: VarReassignNode):
+    res = interpreter._var_reassign_target(node, context)
+    if res.error: raise ErrorSignal(res.error)
+    return res.value
+
+def reassign(context: Context, node: VarReassignNode, target: tuple, value):
+    res = interpreter._var_reassign(node, context, target, value)
+    if res.error: raise ErrorSignal(res.error)
+    return res.value
+
+def binary(context: Context, left, right, method_name: str, node: BinOpNode):
+    result, error = binary_operation(left, right, method_name, node.left_node, node.right_node, context)
+    if error: raise ErrorSignal(error)
+    return result.set_pos(node.pos_start, node.pos_end)
+
+def dot(context: Context, left, node: BinOpNode):
+    result, error = located(left, node.left_node, context).dotted(node.right_node)
+    if error: raise ErrorSignal(error)
+    return result.set_pos(node.pos_start, node.pos_end)
+
+def unary(context: Context, operand, node: UnaryOpNode):
+    result, error = interpreter._unary_operation(node, operand, context)
+    if error: raise ErrorSignal(error)
+    return result.set_pos(node.pos_start, node.pos_end)
+
+def for_each(context: Context, iterable, node: ForEachNode):
+    iterator, error = iterate(iterable, node, context)
+    if error: raise ErrorSignal(error)
+    return iterator
+
+def call(context: Context, value_to_call, args: list, node: CallNode):
+    return call_value(value_to_call, args, node, context).unwrap()
+
+def define_function(context: Context, node: FuncDefNode, body):
+    func_name = node.func_name_tok.value if node.func_name_tok else None
+
+    arg_names = [arg_name.value for arg_name in node.arg_name_toks]
+    arg_types = [make_value_type(arg_type.value) for arg_type in node.arg_type_toks]
+    arg_default_values = [make_value(arg_default_value.value) for arg_default_value in node.arg_default_value_toks]
+
+    if node.is_generator:
+        func_value = Function(func_name, node.body_node, arg_names, arg_types, arg_default_values, node.should_auto_return, node.layout, True)
+    else:
+        func_value = CompiledFunction(func_name, body, arg_names, arg_types, arg_default_values, node.should_auto_return, node.layout)
+    func_value.set_context(context).set_pos(node.pos_start, node.pos_end)
+
+    if node.func_name_tok:
+        context.symbol_table.set(func_name, func_value, Function)
+
+    return func_value
+
+def define_class(context: Context, node: ClassNode, body):
+    class_name = node.class_name_tok.value
+
+    ctx = Context(class_name, context, node.pos_start)
+    ctx.symbol_table = SymbolTable(context.symbol_table, node.layout)
+
+    res = body(ctx)
+    if res.should_return(): res.raise_signal()
+
+    class_value = Class(class_name, None, ctx.symbol_table).set_context(context).set_pos(node.pos_start, node.pos_end)
+    context.symbol_table.set_as_immutable(class_name, class_value, Class)
+    return class_value
@@ -0,0 +1,395 @@
+from enum import Enum
+from .node import (Node, NumberNode, StringNode, ClassNode,
+                   ListNode, BlockNode, VarAccessNode, VarAssignNode, VarReassignNode,
+                   BinOpNode, LogicalOpNode, UnaryOpNode, IfNode, ForNode, ForEachNode, WhileNode,
+                   FuncDefNode, CallNode, ReturnNode, ContinueNode, BreakNode)
+from .position import Position
+from .token import Token, TokenType
+from .keyword import Keyword
+from .interpreter import SHORT_CIRCUITS, binary_operation_name
+from .utils.strings_template import NO_METHOD_DEFINED_ERROR
+
+# Writes a resolved AST as the source of a Python module running against transpiled_runtime.
+# Every node becomes straight-line statements storing its value in a local, so values are
+# made in the same order as the tree walker makes them. Loops become Python loops, Nakathon
+# functions and class bodies become nested Python functions returning a RunTimeResult.
+# Nodes still needed at runtime (assignments, dots, definitions) are rebuilt in load().
+
+# Operators computed inline on two Numbers when the Transpiler is asked for number fast paths,
+# (Python operator, value class of the result). '/' and '%' go through binary() for their errors.
+NUMBER_FAST_PATHS = {
+    TokenType.PLUS: ("+", "Number"), TokenType.MINUS: ("-", "Number"),
+    TokenType.MUL: ("*", "Number"), TokenType.POWER: ("**", "Number"),
+    TokenType.EE: ("==", "Boolean"), TokenType.NE: ("!=", "Boolean"),
+    TokenType.LT: ("<", "Boolean"), TokenType.GT: (">", "Boolean"),
+    TokenType.LTE: ("<=", "Boolean"), TokenType.GTE: (">=", "Boolean"),
+}
+
+class Transpiler:
+    def __init__(self, number_fast_paths: bool = False):
+        self.lines: list[str] = []
+        self.indent = 0
+        self.temp_count = 0
+
+        self.positions: dict[tuple[int, int, int], int] = {}
+        self.nodes: list[str] = []
+
+        # True while the innermost Python loop is the body of a Nakathon loop of this function,
+        # a continue or break there is a plain Python one, anywhere else it's raised
+        self.loops: list[bool] = []
+        self.in_program_scope = True
+
+        # Set for the bodies tiering specializes to Number arguments, the temps in numbers are known
+        # to hold a Number and skip the type check of a fast path
+        self.number_fast_paths = number_fast_paths
+        self.numbers: set[str] = set()
+
+    def transpile(self, node: Node, fn: str, in_program_scope: bool = True) -> str:
+        # A function body is transpiled on its own when it tiers up, its slots are fixed
+        self.in_program_scope = in_program_scope
+        self.indent = 1
+        value = self.value(node)
+        self.line(f"return success({value})")
+        body = self.lines
+
+        flat_positions = ", ".join(f"{idx}, {ln}, {col}" for idx, ln, col in self.positions)
+
+        return "\n".join([
+            f"# Transpiled from {fn!r} by nakathon.py --compile, do not edit",
+            "from components.transpiled_runtime import *",
+            "",
+            f"POSITIONS = ({flat_positions}{',' if len(self.positions) == 1 else ''})",
+            "",
+            "def load(fn, source):",
+            "    global P, N",
+            "    P = positions(fn, source, POSITIONS)",
+            "    N = [",
+            *[f"        {node}," for node in self.nodes],
+            "    ]",
+            "",
+            "def main(context):",
+            *body,
+            "",
+        ])
+
+    def line(self, code: str):
+        self.lines.append("    " * self.indent + code)
+
+    def temp(self) -> str:
+        self.temp_count += 1
+        return f"_{self.temp_count}"
+
+    def assign_temp(self, code: str) -> str:
+        temp = self.temp()
+        self.line(f"{temp} = {code}")
+        return temp
+
+    def pos(self, position: Position) -> str:
+        key = (position.idx, position.ln, position.col)
+        if key not in self.positions:
+            self.positions[key] = len(self.positions)
+        return f"P[{self.positions[key]}]"
+
+    def node(self, node: Node, depth: int = 0, **overrides) -> str:
+        # Registers a node rebuilt in load() with depth levels of child nodes, all of them if None
+        attributes = {**node.__dict__, **overrides}
+        self.nodes.append(self.literal(node.__class__, attributes, depth))
+        return f"N[{len(self.nodes) - 1}]"
+
+    def literal(self, cls: type, attributes: dict, depth: int) -> str:
+        items = []
+
+        for name, value in attributes.items():
+            # Engine caches and profiles aren't part of the node, the display is only used by its repr
+            if name in ("bytecode", "closure", "profile"):
+                continue
+            if name == "display":
+                value = None
+            items.append(f"{name!r}: {self.value_literal(value, depth)}")
+
+        return f"rebuild({cls.__name__}, {{{', '.join(items)}}})"
+
+    def value_literal(self, value, depth: int) -> str:
+        if isinstance(value, Node):
+            if depth is None: return self.literal(value.__class__, value.__dict__, None)
+            return self.literal(value.__class__, value.__dict__, depth - 1) if depth > 0 else "None"
+        if isinstance(value, Token):
+            return self.literal(Token, value.__dict__, depth)
+        if isinstance(value, Position):
+            return self.pos(value)
+        if isinstance(value, Enum):
+            return f"{value.__class__.__name__}.{value.name}"
+        if isinstance(value, (list, tuple)):
+            items = [self.value_literal(item, depth) for item in value]
+            return f"[{', '.join(items)}]" if isinstance(value, list) else f"({', '.join(items)}{',' if len(items) == 1 else ''})"
+        if isinstance(value, dict):
+            return "{" + ", ".join(f"{key!r}: {self.value_literal(item, depth)}" for key, item in value.items()) + "}"
+        if value is None or isinstance(value, (bool, int, float, str)):
+            return repr(value)
+
+        raise Exception(f"Can't transpile the value {value!r}")
+
+    def slot(self, address: tuple[int, int]):
+        # The program scope is shared with the scripts run before, only function and class scopes have fixed slots
+        if self.in_program_scope or address is None or address[0] != 0:
+            return None
+        return address[1]
+
+    def address_override(self, node: Node):
+        return {"address": None} if self.slot(node.address) is None else {}
+
+    ###################################
+
+    def value(self, node: Node) -> str:
+        method_name = f'transpile_{type(node).__name__}'
+        method = getattr(self, method_name, self.no_transpile_method)
+
+        return method(node)
+
+    def no_transpile_method(self, node: Node):
+        raise Exception(NO_METHOD_DEFINED_ERROR.format(f"transpile_{type(node).__name__}"))
+
+    def transpile_NumberNode(self, node: NumberNode):
+        temp = self.assign_temp(f"Number({node.tok.value!r}).set_context(context).set_pos({self.pos(node.pos_start)}, {self.pos(node.pos_end)})")
+        self.numbers.add(temp)
+        return temp
+
+    def transpile_StringNode(self, node: StringNode):
+        return self.assign_temp(f"String({node.tok.value!r}).set_context(context).set_pos({self.pos(node.pos_start)}, {self.pos(node.pos_end)})")
+
+    def transpile_ListNode(self, node: ListNode):
+        elements = [self.value(element_node) for element_node in node.element_nodes]
+        return self.assign_temp(f"List([{', '.join(elements)}]).set_context(context).set_pos({self.pos(node.pos_start)}, {self.pos(node.pos_end)})")
+
+    def transpile_BlockNode(self, node: BlockNode):
+        statements = [self.value(statement_node) for statement_node in node.statement_nodes]
+        if node.should_return_null:
+            return "Null.null"
+        return self.assign_temp(f"List([{', '.join(statements)}]).set_context(context).set_pos({self.pos(node.pos_start)}, {self.pos(node.pos_end)})")
+
+    def transpile_VarAccessNode(self, node: VarAccessNode):
+        name, pos_start, pos_end = repr(node.var_name_tok.value), self.pos(node.pos_start), self.pos(node.pos_end)
+        slot = self.slot(node.address)
+
+        if slot is not None:
+            return self.assign_temp(f"load_slot(context, {slot}, {name}, {pos_start}, {pos_end})")
+        return self.assign_temp(f"load_name(context, {name}, {pos_start}, {pos_end})")
+
+    def transpile_VarAssignNode(self, node: VarAssignNode):
+        value = self.value(node.value_node)
+        return self.assign_temp(f"assign(context, {self.node(node, **self.address_override(node))}, {value})")
+
+    def transpile_VarReassignNode(self, node: VarReassignNode):
+        site = self.node(node, 1, **self.address_override(node))
+        target = self.assign_temp(f"reassign_target(context, {site})")
+        value = self.value(node.value_node)
+        return self.assign_temp(f"reassign(context, {site}, {target}, {value})")
+
+    def transpile_BinOpNode(self, node: BinOpNode):
+        # The operands' nodes are kept for the positions of an error, the dot's right side for the lookup
+        left = self.value(node.left_node)
+
+        if node.op_tok.type == TokenType.DOT:
+            return self.assign_temp(f"dot(context, {left}, {self.node(node, None)})")
+
+        right = self.value(node.right_node)
+        binary = f"binary(context, {left}, {right}, {binary_operation_name(node.op_tok)!r}, {self.node(node, 1)})"
+
+        fast_path = NUMBER_FAST_PATHS.get(node.op_tok.type) if self.number_fast_paths else None
+        if fast_path is None:
+            return self.assign_temp(binary)
+
+        # What Number's own method makes, without the method calls and the error tuple
+        operator, value_class = fast_path
+        fast = f"{value_class}({left}.value {operator} {right}.value).set_context({left}.context).set_pos({self.pos(node.pos_start)}, {self.pos(node.pos_end)})"
+        checks = [f"type({operand}) is Number" for operand in (left, right) if operand not in self.numbers]
+        if not checks:
+            return self.assign_temp(fast)
+
+        result = self.temp()
+        self.line(f"if {' and '.join(checks)}:")
+        self.line(f"    {result} = {fast}")
+        self.line("else:")
+        self.line(f"    {result} = {binary}")
+        return result
+
+    def transpile_LogicalOpNode(self, node: LogicalOpNode):
+        # The right side is only run inside the if, when the left value doesn't decide the result
+        left = self.value(node.left_node)
+        result = self.assign_temp(f"{left}.{SHORT_CIRCUITS[node.op_tok.value]}()")
+
+        self.line(f"if {result} is None:")
+        self.indent += 1
+        right = self.value(node.right_node)
+        self.line(f"{result} = binary(context, {left}, {right}, {binary_operation_name(node.op_tok)!r}, {self.node(node, 1)})")
+        self.indent -= 1
+        self.line("else:")
+        self.line(f"    {result} = {result}.set_pos({self.pos(node.pos_start)}, {self.pos(node.pos_end)})")
+        return result
+
+    def transpile_UnaryOpNode(self, node: UnaryOpNode):
+        operand = self.value(node.node)
+        return self.assign_temp(f"unary(context, {operand}, {self.node(node, 1)})")
+
+    def _case(self, target: str, expr: Node, should_return_null: bool):
+        self.indent += 1
+        value = self.value(expr)
+        self.line(f"{target} = {'Null.null' if should_return_null else value}")
+        self.indent -= 1
+
+    def _cases(self, target: str, cases: list, else_case: tuple):
+        condition, expr, should_return_null = cases[0]
+        condition_value = self.value(condition)
+        self.line(f"if {condition_value}.is_true():")
+        self._case(target, expr, should_return_null)
+        self.line("else:")
+
+        if len(cases) > 1:
+            self.indent += 1
+            self._cases(target, cases[1:], else_case)
+            self.indent -= 1
+        elif else_case:
+            self._case(target, *else_case)
+        else:
+            self.indent += 1
+            self.line(f"{target} = Null.null")
+            self.indent -= 1
+
+    def transpile_IfNode(self, node: IfNode):
+        target = self.temp()
+        self._cases(target, node.cases, node.else_case)
+        return target
+
+    def _loop_body(self, node: ForNode | ForEachNode | WhileNode, elements: str):
+        self.line("try:")
+        self.indent += 1
+        self.loops.append(True)
+        value = self.value(node.body_node)
+        self.loops.pop()
+        self.indent -= 1
+        self.line("except ContinueSignal:")
+        self.line("    continue")
+        self.line("except BreakSignal:")
+        self.line("    break")
+        # The values of the iterations are only kept when the loop's value is used
+        if not node.should_return_null:
+            self.line(f"{elements}.append({value})")
+
+    def _loop_result(self, node: ForNode | ForEachNode | WhileNode, elements: str):
+        if node.should_return_null:
+            return self.assign_temp("Null.null")
+        return self.assign_temp(f"List({elements}).set_context(context).set_pos({self.pos(node.pos_start)}, {self.pos(node.pos_end)})")
+
+    def transpile_ForNode(self, node: ForNode):
+        start = self.value(node.start_value_node)
+        end = self.value(node.end_value_node)
+        step = self.value(node.step_value_node) if node.step_value_node else None
+
+        i, end_value, step_value, elements = self.temp(), self.temp(), self.temp(), self.temp()
+        self.line(f"{i} = {start}.value")
+        self.line(f"{end_value} = {end}.value")
+        self.line(f"{step_value} = {f'{step}.value' if step else '1'}")
+        if not node.should_return_null:
+            self.line(f"{elements} = []")
+
+        self.line(f"while ({i} < {end_value}) if {step_value} >= 0 else ({i} > {end_value}):")
+        self.indent += 1
+
+        var_name, slot = repr(node.var_name_tok.value), self.slot(node.var_address)
+        if slot is not None:
+            self.line(f"context.symbol_table.set_slot(0, {slot}, {var_name}, Number({i}), Number)")
+        else:
+            self.line(f"context.symbol_table.set({var_name}, Number({i}), Number)")
+        self.line(f"{i} += {step_value}")
+
+        self._loop_body(node, elements)
+        self.indent -= 1
+
+        return self._loop_result(node, elements)
+
+    def transpile_ForEachNode(self, node: ForEachNode):
+        # Only the iterable's positions are needed, for the error of a value that can't be iterated
+        iterable = self.value(node.iterable_node)
+        iterator = self.assign_temp(f"for_each(context, {iterable}, {self.node(node, 1, body_node=None)})")
+        elements = None if node.should_return_null else self.assign_temp("[]")
+
+        element = self.temp()
+        self.line(f"for {element} in {iterator}:")
+        self.indent += 1
+
+        var_name, slot = repr(node.var_name_tok.value), self.slot(node.var_address)
+        if slot is not None:
+            self.line(f"context.symbol_table.set_slot(0, {slot}, {var_name}, {element}, Value)")
+        else:
+            self.line(f"context.symbol_table.set({var_name}, {element}, Value)")
+
+        self._loop_body(node, elements)
+        self.indent -= 1
+
+        return self._loop_result(node, elements)
+
+    def transpile_WhileNode(self, node: WhileNode):
+        elements = None if node.should_return_null else self.assign_temp("[]")
+
+        self.line("while True:")
+        self.indent += 1
+
+        # A continue or break in the condition belongs to the loop around this one
+        self.loops.append(False)
+        condition = self.value(node.condition_node)
+        self.loops.pop()
+        self.line(f"if not {condition}.is_true():")
+        self.line("    break")
+
+        self._loop_body(node, elements)
+        self.indent -= 1
+
+        return self._loop_result(node, elements)
+
+    def _body_function(self, name: str, body_node: Node):
+        # Nested Python function for a function or class body, with its own loops and slots
+        loops, in_program_scope = self.loops, self.in_program_scope
+        self.loops, self.in_program_scope = [], False
+
+        self.line(f"def {name}(context):")
+        self.indent += 1
+        value = self.value(body_node)
+        self.line(f"return success({value})")
+        self.indent -= 1
+
+        self.loops, self.in_program_scope = loops, in_program_scope
+
+    def transpile_ClassNode(self, node: ClassNode):
+        body = self.temp()
+        self._body_function(body, node.body_node)
+        return self.assign_temp(f"define_class(context, {self.node(node)}, {body})")
+
+    def transpile_FuncDefNode(self, node: FuncDefNode):
+        # A generator's body is stepped through by the tree walker, it's kept as nodes
+        if node.is_generator:
+            return self.assign_temp(f"define_function(context, {self.node(node, None)}, None)")
+
+        body = self.temp()
+        self._body_function(body, node.body_node)
+        return self.assign_temp(f"define_function(context, {self.node(node)}, {body})")
+
+    def transpile_CallNode(self, node: CallNode):
+        value_to_call = self.value(node.node_to_call)
+        args = [self.value(arg_node) for arg_node in node.arg_nodes]
+        return self.assign_temp(f"call(context, {value_to_call}, [{', '.join(args)}], {self.node(node)})")
+
+    def transpile_ReturnNode(self, node: ReturnNode):
+        value = self.value(node.node_to_return) if node.node_to_return else "Null.null"
+
+        # Like the tree walker, a falsy return value doesn't stop the function
+        self.line(f"if {value}:")
+        self.line(f"    return returned({value})")
+        return "None"
+
+    def transpile_ContinueNode(self, node: ContinueNode):
+        self.line("continue" if self.loops and self.loops[-1] else "raise ContinueSignal()")
+        return "None"
+
+    def transpile_BreakNode(self, node: BreakNode):
+        self.line("break" if self.loops and self.loops[-1] else "raise BreakSignal()")
+        return "None"
@@ -1,5 +1,6 @@
 from logging import basicConfig, log, DEBUG
 from inspect import currentframe as i_currentframe, getouterframes as i_getouterframes
+from weakref import WeakSet
 
 basicConfig(format = "[%(levelname)s]: %(message)s", level = DEBUG, encoding = "utf-8")
 
@@ -13,43 +14,66 @@ COMPONENTS_ENABLED = {
     "parser.py": 0,
     "symbol_table.py": 0,
     "token.py": 0,
+    "tiering.py": 0,
     "wrapper.py": 0,
-    
+
     "function.py": 0,
     "value.py": 0
 }
 
+# Every DebugMessage made, so the components shown can be changed at runtime with --debug
+debug_messages = WeakSet()
+
+def set_enabled_components(components: list[str]):
+    # Shows the messages of these components only, "all" shows every one
+    show_all = "all" in components
+    file_names = {component if component.endswith(".py") else f"{component}.py" for component in components}
+
+    for debug_message in debug_messages:
+        debug_message.set_enabled(show_all or debug_message.caller in file_names)
+
 class DebugMessage:
+    # Messages are only built when shown, a message is either a callable or a template
+    # formatted with the arguments given along with it. Hot code checks .enabled first,
+    # so a disabled message costs one attribute test.
     def __init__(self, message: str, auto_display_on_message_set: bool = False):
         curframe = i_currentframe()
         calframe = i_getouterframes(curframe, 2)
         self.caller = calframe[1][1].replace("\\", "/").split("/")[-1].lower()
-        
+
         self.set_auto_display(auto_display_on_message_set)
         self.set_enabled(COMPONENTS_ENABLED.get(self.caller, DEFAULT_ENABLED) if not ALL_USES_DEFAULT else DEFAULT_ENABLED)
         self.set_message(message)
-        
+        debug_messages.add(self)
+
     def display(self):
         if not self.enabled: return
         curframe = i_currentframe()
         calframe = i_getouterframes(curframe, 2)
- 
-        log(DEBUG, f"[{self.caller}]: [{calframe[2][3]}]: {self.message}")
+
+        message = self.get_message()
+        log(DEBUG, f"[{self.caller}]: [{calframe[2][3]}]: {message}")
+        return message
+
+    def get_message(self) -> str:
+        if callable(self.message): return self.message()
+        if self.args: return self.message.format(*self.args)
         return self.message
-        
-    def set_message(self, message):
+
+    def set_message(self, message, *args):
         self.message = message
+        self.args = args
         if self.auto_display: self.display()
         return self
-    
+
     def set_enabled(self, enabled):
         self.enabled = enabled
         return self
-    
+
     def set_auto_display(self, enabled):
         self.auto_display = enabled
         return self
-    
+
 def qd(message: str = "duck"):
     _dm = DebugMessage(message, 1)
     del _dm
@@ -6,6 +6,7 @@ START_VALUE = "<start-value>"
 END_VALUE = "<end-value>"
 STEP_VALUE = "<step-value>"
 VARIABLE = "<variable>"
+ITERABLE = "<iterable>"
 VALUE_EXPRESSION = "<value> or <expression>"
 VALUE_OF = "<value-of-type-{}>"
 
@@ -22,6 +23,10 @@ CANNOT_OVERWRITE_IMMUTABLE_BUILTIN_VAR_FUNC_ERROR = "Cannot overwrite '{}', as i
 IS_NOT_DEFINED_ERROR = "'{}' Is not defined"
 WAS_NOT_INITIALIZED_ERROR = "'{}' Is not initialized"
 NO_METHOD_DEFINED_ERROR = "No '{}' method defined"
+MAX_CALL_DEPTH_ERROR = "Maximum call depth of {} exceeded"
+MAX_RECURSION_DEPTH_ERROR = "Maximum recursion depth exceeded, calls nested deeper than this need the --vm engine"
+NOT_ITERABLE_ERROR = "Cannot iterate over a '{}' value"
+CANNOT_YIELD_HERE_ERROR = "Cannot yield from inside an expression"
 VAR_ALREADY_INITIALIZED_ERROR = "Variable '{}' is already initialized"
 VAR_TYPE_DECLARED_BUT_VALUE_TYPE_IS_NOT_SAME_ERROR = "Variable '{}' was declared as a '{}' type value, but the assigned value is different, got '{}' instead"
 VAR_TYPE_ALREADY_DECLARED_CANNOT_CHANGE_ERROR = "Cannot change variable '{}' value type once initialized"
@@ -1,6 +1,6 @@
 from ..token import TokenType
 from ..keyword import Keyword
-from .strings_template import (CONDITION, EXPRESSION, VARIABLE,
+from .strings_template import (CONDITION, EXPRESSION, VARIABLE, ITERABLE,
                       START_VALUE, END_VALUE, STEP_VALUE,
                       VAR_NAME_EXAMPLE, FUNC_NAME_EXAMPLE,
                       VALUE_EXPRESSION, VALUE_OF)
@@ -20,6 +20,10 @@ FUNC_SYNTAX = f"""{key('SETFUNCTION')} {FUNC_NAME_EXAMPLE}() {{
     {EXPRESSION}
 }}"""
 
+GENERATOR_SYNTAX = f"""{key('SETFUNCTION')} {FUNC_NAME_EXAMPLE}() {{
+    {key('YIELD')} {EXPRESSION}
+}}"""
+
 
 # If 
 IF_ELSEIF_ELSE_SYNTAX = f"""if {CONDITION} {{
@@ -37,6 +41,12 @@ FOR_SYNTAX = f"""for {VARIABLE} = {START_VALUE} ; {END_VALUE} ; {STEP_VALUE} {{
 }}"""
 
 
+# For Each
+FOR_EACH_SYNTAX = f"""for {VARIABLE} {key('IN')} {ITERABLE} {{
+    {EXPRESSION}
+}}"""
+
+
 # While
 WHILE_SYNTAX = f"""while {CONDITION} {{
     {EXPRESSION}
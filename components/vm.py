@@ -0,0 +1,330 @@
+from .compiler import (
+    Bytecode, compile_body,
+    NUMBER, STRING, NULL, POP,
+    LOAD_SLOT, LOAD_NAME, STORE, REASSIGN_TARGET, REASSIGN,
+    BINARY, DOT, UNARY, BUILD_LIST,
+    JUMP, JUMP_IF_FALSE, JUMP_AND, JUMP_OR,
+    FOR_SETUP, FOR_ITER, FOR_EACH_SETUP, FOR_EACH_ITER, WHILE_SETUP, WHILE_TEST, LOOP_APPEND, LOOP_END,
+    CONTINUE, BREAK, RETURN,
+    CALL, INTERPRET, END
+)
+from .datatypes.all import Value, Number, String, List, Null, Function
+from .context import Context
+from .node import Node
+from .interpreter import Interpreter, binary_operation, located, call_value, iterate
+from .runtime import RunTimeResult, RunTimeSignal
+from .error import RunTimeError
+from .utils.strings_template import IS_NOT_DEFINED_ERROR, MAX_CALL_DEPTH_ERROR
+
+# Runs the Compiler's opcode stream on a value stack. Values, assignments and errors go
+# through the same code as the tree walker so both engines give the same results, the VM
+# only replaces the node visits and the RunTimeResult passed back by every one of them.
+
+# Calls deeper than this fail like any other runtime error instead of running out of memory
+MAX_CALL_DEPTH = 200000
+
+class VM:
+    def __init__(self):
+        self.interpreter = Interpreter()
+
+    def run_body(self, node: Node, context: Context):
+        return self.run(compile_body(node), context)
+
+    def run(self, bytecode: Bytecode, context: Context):
+        instructions = bytecode.instructions
+        constants = bytecode.constants
+        interpreter = self.interpreter
+        symbol_table = context.symbol_table
+        frame = symbol_table.frame
+
+        stack = []
+        push = stack.append
+        pop = stack.pop
+
+        # [loop, stack size, elements], for loops add [i, end, step] and for-each loops [iterator]
+        loops = []
+        pc = 0
+
+        # Every caller of the function running now, as (function, instructions, constants, pc, stack, loops, context).
+        # Nakathon functions are called in this loop instead of a new run, so the call depth isn't Python's.
+        calls = []
+
+        while True:
+            while True:
+                opcode = instructions[pc]
+                arg = instructions[pc + 1]
+                pc += 2
+
+                if opcode == LOAD_SLOT:
+                    node, slot = constants[arg]
+                    entry = frame[slot]
+                    if entry is None or entry[2] == "temporary_symbols":
+                        value = symbol_table.lookup(node.var_name_tok.value)
+                    else:
+                        value = entry[0]
+
+                    if value is None:
+                        res = self._not_defined(node, context)
+                        break
+
+                    push(value)
+
+                elif opcode == NUMBER:
+                    node = constants[arg]
+                    push(Number(node.tok.value).set_context(context).set_pos(node.pos_start, node.pos_end))
+
+                elif opcode == BINARY:
+                    node, method_name = constants[arg]
+                    right = pop()
+                    result, error = binary_operation(pop(), right, method_name, node.left_node, node.right_node, context)
+                    if error:
+                        res = RunTimeResult().failure(error)
+                        break
+                    push(result.set_pos(node.pos_start, node.pos_end))
+
+                elif opcode == JUMP_IF_FALSE:
+                    if not pop().is_true():
+                        pc = arg
+
+                elif opcode == JUMP:
+                    pc = arg
+
+                elif opcode == JUMP_AND or opcode == JUMP_OR:
+                    # The left value stays for the operation unless it's the result on its own
+                    left = stack[-1]
+                    result = left.anded_by_any() if opcode == JUMP_AND else left.ored_by_any()
+                    if result is not None:
+                        short_circuit = constants[arg]
+                        node = short_circuit.node
+                        stack[-1] = result.set_pos(node.pos_start, node.pos_end)
+                        pc = short_circuit.end
+
+                elif opcode == FOR_ITER:
+                    state = loops[-1]
+                    i = state[3]
+                    if (i < state[4]) if state[5] >= 0 else (i > state[4]):
+                        node = state[0].node
+                        if node.var_address is not None:
+                            symbol_table.set_slot(*node.var_address, node.var_name_tok.value, Number(i), Number)
+                        else:
+                            symbol_table.set(node.var_name_tok.value, Number(i), Number)
+                        state[3] = i + state[5]
+                    else:
+                        pc = state[0].end
+
+                elif opcode == FOR_EACH_ITER:
+                    state = loops[-1]
+                    try:
+                        element = next(state[3])
+                    except StopIteration:
+                        pc = state[0].end
+                    except RunTimeSignal as signal:
+                        # A generator's body failed while giving the next element
+                        res = signal.as_result()
+                        break
+                    else:
+                        node = state[0].node
+                        if node.var_address is not None:
+                            symbol_table.set_slot(*node.var_address, node.var_name_tok.value, element, Value)
+                        else:
+                            symbol_table.set(node.var_name_tok.value, element, Value)
+
+                elif opcode == LOOP_APPEND:
+                    loops[-1][2].append(pop())
+
+                elif opcode == STORE:
+                    res = interpreter._var_assign(constants[arg], context, pop())
+                    if res.error:
+                        break
+                    push(res.value)
+
+                elif opcode == REASSIGN_TARGET:
+                    res = interpreter._var_reassign_target(constants[arg], context)
+                    if res.error:
+                        break
+                    push(res.value)
+
+                elif opcode == REASSIGN:
+                    value = pop()
+                    res = interpreter._var_reassign(constants[arg], context, pop(), value)
+                    if res.error:
+                        break
+                    push(res.value)
+
+                elif opcode == CALL:
+                    node = constants[arg]
+                    argc = len(node.arg_nodes)
+                    args = stack[-argc:] if argc else []
+                    if argc:
+                        del stack[-argc:]
+                    value_to_call = pop()
+
+                    if type(value_to_call) is not Function or value_to_call.is_generator:
+                        res = call_value(value_to_call, args, node, context, self.run_body)
+                    elif len(calls) == MAX_CALL_DEPTH:
+                        res = RunTimeResult().failure(RunTimeError(
+                            node.pos_start, node.pos_end, MAX_CALL_DEPTH_ERROR.format(MAX_CALL_DEPTH), context))
+                    else:
+                        exec_ctx = value_to_call.generate_new_context(context, node.pos_start)
+                        res = value_to_call.enter(args, exec_ctx, context, node.pos_start, node.pos_end)
+
+                        if not res.should_return():
+                            # The caller goes on from here with the value of the call once its body is done
+                            calls.append((value_to_call, instructions, constants, pc, stack, loops, context))
+
+                            bytecode = compile_body(value_to_call.body_node)
+                            instructions = bytecode.instructions
+                            constants = bytecode.constants
+                            context = exec_ctx
+                            symbol_table = context.symbol_table
+                            frame = symbol_table.frame
+                            stack = []
+                            push = stack.append
+                            pop = stack.pop
+                            loops = []
+                            pc = 0
+                            continue
+
+                    if res.should_return():
+                        pc = self._unwind(res, loops, stack)
+                        if pc is None:
+                            break
+                        continue
+
+                    push(res.value)
+
+                elif opcode == STRING:
+                    node = constants[arg]
+                    push(String(node.tok.value).set_context(context).set_pos(node.pos_start, node.pos_end))
+
+                elif opcode == LOAD_NAME:
+                    node = constants[arg]
+                    value = symbol_table.lookup(node.var_name_tok.value)
+                    if value is None:
+                        res = self._not_defined(node, context)
+                        break
+
+                    push(value)
+
+                elif opcode == BUILD_LIST:
+                    node, size = constants[arg]
+                    elements = stack[-size:] if size else []
+                    if size:
+                        del stack[-size:]
+                    push(List(elements).set_context(context).set_pos(node.pos_start, node.pos_end))
+
+                elif opcode == NULL:
+                    push(Null.null)
+
+                elif opcode == POP:
+                    pop()
+
+                elif opcode == DOT:
+                    node = constants[arg]
+                    result, error = located(pop(), node.left_node, context).dotted(node.right_node)
+                    if error:
+                        res = RunTimeResult().failure(error)
+                        break
+                    push(result.set_pos(node.pos_start, node.pos_end))
+
+                elif opcode == UNARY:
+                    node = constants[arg]
+                    result, error = interpreter._unary_operation(node, pop(), context)
+                    if error:
+                        res = RunTimeResult().failure(error)
+                        break
+                    push(result.set_pos(node.pos_start, node.pos_end))
+
+                elif opcode == FOR_SETUP:
+                    loop = constants[arg]
+                    step = pop().value if loop.node.step_value_node else 1
+                    end = pop().value
+                    start = pop().value
+                    loops.append([loop, len(stack), [], start, end, step])
+
+                elif opcode == FOR_EACH_SETUP:
+                    loop = constants[arg]
+                    iterator, error = iterate(pop(), loop.node, context)
+                    if error:
+                        res = RunTimeResult().failure(error)
+                        break
+                    loops.append([loop, len(stack), [], iterator])
+
+                elif opcode == WHILE_SETUP:
+                    loops.append([constants[arg], len(stack), []])
+
+                elif opcode == WHILE_TEST:
+                    if not pop().is_true():
+                        pc = constants[arg].end
+
+                elif opcode == LOOP_END:
+                    state = loops.pop()
+                    node = state[0].node
+                    push(
+                        Null.null if node.should_return_null else
+                        List(state[2]).set_context(context).set_pos(node.pos_start, node.pos_end)
+                    )
+
+                elif opcode == CONTINUE or opcode == BREAK:
+                    res = RunTimeResult().success_continue() if opcode == CONTINUE else RunTimeResult().success_break()
+                    pc = self._unwind(res, loops, stack)
+                    if pc is None:
+                        break
+
+                elif opcode == RETURN:
+                    value = pop()
+
+                    # Like the tree walker, a falsy return value doesn't stop the function
+                    if value:
+                        res = RunTimeResult().success_return(value)
+                        break
+                    push(None)
+
+                elif opcode == INTERPRET:
+                    res = interpreter.visit(constants[arg], context)
+                    if res.should_return():
+                        pc = self._unwind(res, loops, stack)
+                        if pc is None:
+                            break
+                        continue
+                    push(res.value)
+
+                elif opcode == END:
+                    res = RunTimeResult().success(stack[-1] if stack else None)
+                    break
+
+            # The frame left with res, its caller gets the value of the call or goes on leaving with it
+            while calls:
+                function, instructions, constants, pc, stack, loops, context = calls.pop()
+                res = function.returned(res)
+
+                if not res.should_return():
+                    stack.append(res.value)
+                    break
+
+                pc = self._unwind(res, loops, stack)
+                if pc is not None:
+                    break
+            else:
+                return res
+
+            symbol_table = context.symbol_table
+            frame = symbol_table.frame
+            push = stack.append
+            pop = stack.pop
+
+    def _unwind(self, res: RunTimeResult, loops: list, stack: list):
+        # A continue or break jumps in the innermost loop of this frame, anything else leaves the frame
+        if res.error or res.func_return_value or not loops:
+            return None
+
+        state = loops[-1]
+        del stack[state[1]:]
+        return state[0].start if res.loop_should_continue else state[0].end
+
+    def _not_defined(self, node: Node, context: Context):
+        return RunTimeResult().failure(RunTimeError(
+            node.pos_start, node.pos_end,
+            IS_NOT_DEFINED_ERROR.format(node.var_name_tok.value),
+            context
+        ))
@@ -1,7 +1,17 @@
 from os import getcwd
+from os.path import basename, join, getmtime, abspath
+from marshal import dumps as marshal_dumps, loads as marshal_loads
+from pickle import dumps as pickle_dumps, loads as pickle_loads, HIGHEST_PROTOCOL
 from components.lexer import Lexer
 from components.parser import Parser
+from components.resolver import Resolver
 from components.interpreter import Interpreter
+from components.compiler import Compiler
+from components.vm import VM
+from components.closure_compiler import ClosureCompiler, run_closure
+from components.transpiler import Transpiler
+from components.transpiled_runtime import run_compiled
+from components.cache import cache_file, read_cache, write_cache, clear_cache
 from components.context import Context
 from components.symbol_table import SymbolTable
 from components.datatypes.all import Value, Boolean, Null, String
@@ -20,30 +30,214 @@ set_builtin("false", Boolean.false, Boolean)
 set_builtin("true", Boolean.true, Boolean)
 define_builtin_functions(global_symbol_table)
 
-def run(fn: str, text: str, context_name: str, calling_external_code: bool = False, isolated_symbol_table: bool = False, **kwargs):
-    _cwd = getcwd()
-    if "cwd" in kwargs:
-        _cwd = kwargs["cwd"]
-        
-    set_builtin("NAKATHON_CWD", String(_cwd.replace("\\", "/")), String)
-        
+# Part of every cached AST, bumped whenever the nodes change so older ASTs aren't loaded
+AST_CACHE_VERSION = 6
+
+# Part of every transpiled script cached, bumped whenever the Transpiler's output or the helpers of
+# transpiled_runtime change so code written for older helpers isn't run
+TRANSPILED_CACHE_VERSION = 1
+
+class Module:
+    # A script run from a file, its AST is reused while its text and file name are the same and
+    # the context of an import is bound again while the file's mtime is unchanged
+    def __init__(self, fn: str, text: str, node):
+        self.fn = fn
+        self.text = text
+        self.node = node
+        self.mtime: float = None
+        self.context: Context = None
+
+# Every script run from a file in this process, by absolute path
+modules: dict[str, Module] = {}
+
+# Engine used when run isn't given one, "tree" walks the AST, "vm" runs it as bytecode
+# and "closure" runs it as nested Python closures
+default_engine = "tree"
+
+def set_default_engine(engine: str):
+    global default_engine
+    default_engine = engine
+
+def execute(node, context: Context, engine: str):
+    if engine == "tree":
+        return Interpreter().visit(node, context)
+    if engine == "vm":
+        return VM().run(Compiler().compile(node), context)
+    if engine == "closure":
+        return run_closure(ClosureCompiler().compile(node), context)
+    raise Exception(f"Unknown engine '{engine}'")
+
+def parse(fn: str, text: str, calling_external_code: bool = False):
     # Generate tokens
     lexer = Lexer(fn, text, calling_external_code)
     tokens, error = lexer.make_tokens()
-    debug_message.set_message(f"Lexer generated:\n\tTokens: {tokens}\n\tError: {error}\n")
-    if error: return None, error, None
+    if debug_message.enabled: debug_message.set_message("Lexer generated:\n\tTokens: {}\n\tError: {}\n", tokens, error)
+    if error: return None, error
 
     # Generate AST
     parser = Parser(tokens)
     ast = parser.parse()
-    debug_message.set_message(f"Parser generated:\n\tNode: {ast.node}\n\tError: {ast.error}\n")
-    if ast.error: return None, ast.error, None
+    if debug_message.enabled: debug_message.set_message("Parser generated:\n\tNode: {}\n\tError: {}\n", ast.node, ast.error)
+    if ast.error: return None, ast.error
+
+    return ast.node, None
+
+def load_ast(path: str, fn: str, text: str):
+    # Positions hold the file name the script was run with, an AST parsed under another name is parsed again
+    data = read_cache(cache_file(path, text, "ast"))
+    if data is None: return None
+
+    try:
+        version, cached_fn, node = pickle_loads(data)
+    except Exception:
+        return None
+
+    return node if version == AST_CACHE_VERSION and cached_fn == fn else None
+
+def save_ast(path: str, fn: str, text: str, node):
+    try:
+        data = pickle_dumps((AST_CACHE_VERSION, fn, node), HIGHEST_PROTOCOL)
+        script_mtime = getmtime(path)
+    except (RecursionError, OSError):
+        return
+
+    # A script is cached both stripped and as it is, only the entries of its older versions go
+    clear_cache(path, "ast", older_than=script_mtime)
+    write_cache(cache_file(path, text, "ast"), data)
+
+def cached_ast(path: str, fn: str, text: str):
+    # Parsed once per process, and once per version of the script thanks to the cache on disk
+    module = modules.get(path)
+    if module is not None and module.node is not None and module.fn == fn and module.text == text:
+        return module.node, None
+
+    node = load_ast(path, fn, text)
+    if node is None:
+        node, error = parse(fn, text, True)
+        if error: return None, error
+        save_ast(path, fn, text, node)
+
+    modules[path] = Module(fn, text, node)
+    return node, None
+
+def imported_context(path: str, mtime: float, cwd: str):
+    module = modules.get(abspath(path))
+    if module is None or module.context is None or module.mtime != mtime:
+        return None
+
+    # Left on the module's directory, as running it again would
+    set_builtin("NAKATHON_CWD", String(cwd.replace("\\", "/")), String)
+    return module.context
+
+def set_imported_context(path: str, mtime: float, context: Context):
+    path = abspath(path)
+    module = modules.get(path)
+    if module is None:
+        module = modules[path] = Module(None, None, None)
+
+    module.mtime = mtime
+    module.context = context
+
+def transpile(path: str, texts: list[str]):
+    # Writes the Python module of a script and caches its code object for each text it can be run with
+    modules = []
+
+    for text in dict.fromkeys(texts):
+        node, error = parse(path, text, True)
+        if error: return None, error
+
+        Resolver().resolve(node, SymbolTable())
+        modules.append((text, Transpiler().transpile(node, path)))
+
+    clear_cache(path, "nktc")
+    clear_cache(path, "py")
+    for text, source in modules:
+        write_cache(cache_file(path, text, "nktc"), marshal_dumps((TRANSPILED_CACHE_VERSION, compile(source, path, "exec"))))
+
+    module_path = cache_file(path, texts[0], "py")
+    with open(module_path, "w", encoding="utf-8") as f:
+        f.write(modules[0][1])
+
+    return module_path, None
+
+def load_transpiled(path: str, text: str):
+    data = read_cache(cache_file(path, text, "nktc"))
+    if data is None: return None
+
+    try:
+        version, code = marshal_loads(data)
+    except Exception:
+        return None
+
+    return code if version == TRANSPILED_CACHE_VERSION else None
+
+def run_transpiled(code, fn: str, text: str, context: Context):
+    module = {}
+    exec(code, module)
+    module["load"](fn, text)
+    return run_compiled(module["main"], context)
+
+def run(fn: str, text: str, context_name: str, calling_external_code: bool = False, isolated_symbol_table: bool = False, engine: str = None, **kwargs):
+    _cwd = getcwd()
+    if "cwd" in kwargs:
+        _cwd = kwargs["cwd"]
+        
+    set_builtin("NAKATHON_CWD", String(_cwd.replace("\\", "/")), String)
+    
+    engine = engine or default_engine
+    
+    # Scripts transpiled with --compile skip lexing, parsing and the tree walker while they're unchanged,
+    # the AST of any other script is cached on disk after it's first parsed
+    path = abspath(join(_cwd, basename(fn)))
+    code = load_transpiled(path, text) if calling_external_code and engine == "tree" else None
+    
+    if code is None:
+        if calling_external_code:
+            # A reused AST is resolved again below, its slots depend on the symbol table it's run with
+            node, error = cached_ast(path, fn, text)
+        else:
+            node, error = parse(fn, text)
+        if error: return None, error, None
     
     # Run Program
-    interpreter = Interpreter()
     context = Context(context_name)
     context.symbol_table = global_symbol_table.copy() if isolated_symbol_table else global_symbol_table
-    result = interpreter.visit(ast.node, context)
-    debug_message.set_message(f"Interpreter generated:\n\tValue: {result.value}\n\tError: {result.error}\n")
+    
+    if code is not None:
+        result = run_transpiled(code, fn, text, context)
+    else:
+        Resolver().resolve(node, context.symbol_table)
+        result = execute(node, context, engine)
+    
+    if debug_message.enabled: debug_message.set_message("Interpreter generated:\n\tValue: {}\n\tError: {}\n", result.value, result.error)
 
     return result.value, result.error, context
+
+def run_streamed(fn: str, text: str, context_name: str, calling_external_code: bool = False, isolated_symbol_table: bool = False, engine: str = None, **kwargs):
+    # Every top-level statement is run as soon as it's parsed and then let go of, along with its tokens,
+    # so a long script is never held whole as tokens or as an AST. Statements before a syntax error
+    # have already run when it's reported, and the values of statements aren't collected.
+    _cwd = getcwd()
+    if "cwd" in kwargs:
+        _cwd = kwargs["cwd"]
+        
+    set_builtin("NAKATHON_CWD", String(_cwd.replace("\\", "/")), String)
+    
+    engine = engine or default_engine
+    
+    tokens, error = Lexer(fn, text, calling_external_code).stream_tokens()
+    if error: return None, error, None
+    
+    context = Context(context_name)
+    context.symbol_table = global_symbol_table.copy() if isolated_symbol_table else global_symbol_table
+    
+    for node, error in Parser(tokens).statement_stream():
+        if error: return None, error, context
+        
+        Resolver().resolve(node, context.symbol_table)
+        result = execute(node, context, engine)
+        if debug_message.enabled: debug_message.set_message("Interpreter generated:\n\tValue: {}\n\tError: {}\n", result.value, result.error)
+        
+        if result.should_return(): return None, result.error, context
+    
+    return None, None, context
@@ -1,13 +1,41 @@
 from sys import argv
 from components.utils.misc import get_abs_path, set_console_title
-from components.wrapper import run, set_builtin
+from components.wrapper import run, run_streamed, transpile, set_builtin, set_default_engine
 from components.datatypes.all import String
+from components import tiering
+from components.utils.debug import set_enabled_components
 
 __version__ = [1, 6, 0]
 
 def start():
-    theres_args = len(argv) > 1
-    is_running_a_script = theres_args and not argv[1].startswith("--")
+    options = [arg for arg in argv[1:] if arg.startswith("--")]
+    scripts = [arg for arg in argv[1:] if not arg.startswith("--")]
+    
+    # Engine options can go along with a script or the shell
+    for engine in ("vm", "closure"):
+        if f"--{engine}" in options:
+            set_default_engine(engine)
+            options.remove(f"--{engine}")
+            
+    # --no-tiering keeps hot function bodies in the tree walker instead of compiling them to Python
+    if "--no-tiering" in options:
+        tiering.set_enabled(False)
+        options.remove("--no-tiering")
+    
+    # --debug=value,symbol_table,... shows the debug messages of those components, --debug=all of every one
+    for option in [option for option in options if option.startswith("--debug=")]:
+        set_enabled_components(option.removeprefix("--debug=").split(","))
+        options.remove(option)
+    
+    show_tier_stats = "--tier-stats" in options
+    if show_tier_stats: options.remove("--tier-stats")
+    
+    # --stream runs a script a statement at a time as it's parsed, without caching it
+    stream = "--stream" in options
+    if stream: options.remove("--stream")
+    
+    theres_args = len(options) > 0 or len(scripts) > 0
+    is_running_a_script = len(scripts) > 0
     _version = ".".join([str(x) for x in __version__])
     
     set_builtin("NAKATHON_VERSION", String(f"v{_version}"))
@@ -34,27 +62,39 @@ def start():
                 break
                     
     elif is_running_a_script:
-        fn = argv[1]
+        fn = scripts[0]
         try:
             with open(fn, "r", encoding="utf-8") as f:
-                script = f.read().strip()
+                source = f.read()
+                script = source.strip()
         except Exception as e:
             raise Exception(
                 f"Failed to load script \"{fn}\"\n" + str(e)
             )
             
         if not script: return
+        
+        # Scripts are run stripped, Import() and Run() load them as they are
+        if "--compile" in options:
+            module_path, error = transpile(fn, [script, source])
+            
+            if error: print(error.as_string())
+            else: print(f"Compiled \"{fn}\" to \"{module_path}\"")
+            return
 
         try:
-            _, error, _ = run(fn, script, "<Script>", True, cwd=get_abs_path(fn))
+            _, error, _ = (run_streamed if stream else run)(fn, script, "<Script>", True, cwd=get_abs_path(fn))
             
             if error: print(error.as_string())
             
         except KeyboardInterrupt:
             print("\nExiting...")
+            
+        if show_tier_stats:
+            print(f"Tier ups: {tiering.stats['tier_ups']}, Deopts: {tiering.stats['deopts']}")
         
     elif not is_running_a_script and theres_args:
-        if argv[1] == "--version":
+        if options[0] == "--version":
             print(f"v{_version}")
 
 if __name__ == "__main__":
@@ -0,0 +1,34 @@
+from pytest import fixture
+from components import tiering
+from components.wrapper import run, transpile, load_transpiled
+
+# Every way a script can be run, "tree" is the tree walker without tiering, "transpiled" runs what
+# --compile writes and "tiered" is the tree walker compiling hot function bodies
+ENGINES = ["tree", "vm", "closure", "transpiled", "tiered"]
+
+@fixture(params=ENGINES)
+def run_script(request, tmp_path, monkeypatch):
+    # Runs a script on the engine and returns the value of its last statement,
+    # pick engines with @mark.parametrize("run_script", [...], indirect=True)
+    engine = request.param
+
+    monkeypatch.setattr(tiering, "enabled", engine == "tiered")
+    monkeypatch.setitem(tiering.stats, "tier_ups", 0)
+    monkeypatch.setitem(tiering.stats, "deopts", 0)
+
+    def run_script(script: str):
+        if engine == "transpiled":
+            path = tmp_path / "script.nkt"
+            path.write_text(script, encoding="utf-8")
+            _, error = transpile(str(path), [script])
+            assert error is None, error.as_string()
+            assert load_transpiled(str(path), script) is not None
+
+            value, error, _ = run(path.name, script, "<Test>", True, isolated_symbol_table=True, cwd=str(tmp_path))
+        else:
+            value, error, _ = run("<test>", script, "<Test>", isolated_symbol_table=True, engine="tree" if engine == "tiered" else engine)
+
+        assert error is None, error.as_string()
+        return value.elements[-1]
+
+    return run_script
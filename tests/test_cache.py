@@ -0,0 +1,26 @@
+from marshal import dumps as marshal_dumps
+from components import wrapper
+from components.cache import cache_file, write_cache
+from components.wrapper import transpile, load_transpiled
+
+SCRIPT = "func Add(a, b) -> a + b\nAdd(1, 2)"
+
+def test_transpiled_scripts_are_loaded_back(tmp_path):
+    path = str(tmp_path / "script.nkt")
+    _, error = transpile(path, [SCRIPT])
+
+    assert error is None
+    assert load_transpiled(path, SCRIPT) is not None
+
+def test_transpiled_scripts_of_another_version_are_a_miss(tmp_path, monkeypatch):
+    path = str(tmp_path / "script.nkt")
+    transpile(path, [SCRIPT])
+
+    monkeypatch.setattr(wrapper, "TRANSPILED_CACHE_VERSION", wrapper.TRANSPILED_CACHE_VERSION + 1)
+    assert load_transpiled(path, SCRIPT) is None
+
+def test_transpiled_scripts_without_a_version_are_a_miss(tmp_path):
+    path = str(tmp_path / "script.nkt")
+    write_cache(cache_file(path, SCRIPT, "nktc"), marshal_dumps(compile("main = None", path, "exec")))
+
+    assert load_transpiled(path, SCRIPT) is None
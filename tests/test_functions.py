@@ -0,0 +1,30 @@
+from pytest import mark
+from components.wrapper import run
+from components.error import RunTimeError
+from components.utils.strings_template import MAX_RECURSION_DEPTH_ERROR
+
+DEEP_RECURSION = """
+func Depth(n) {
+    if n == 0 { return 0 }
+    return Depth(n - 1) + 1
+}
+Depth(5000)
+"""
+
+def test_anonymous_function_repr(run_script, capsys):
+    run_script("var f = func (a) -> a + 1\nPrint(f)")
+    assert capsys.readouterr().out == "<Function:<anonymous>>\n"
+
+def test_named_function_repr(run_script, capsys):
+    run_script("func Add(a) -> a + 1\nPrint(Add)")
+    assert capsys.readouterr().out == "<Function:Add>\n"
+
+@mark.parametrize("engine", ["tree", "closure"])
+def test_too_deep_recursion_is_a_runtime_error(engine):
+    _, error, _ = run("<test>", DEEP_RECURSION, "<Test>", isolated_symbol_table=True, engine=engine)
+    assert isinstance(error, RunTimeError)
+    assert error.details == MAX_RECURSION_DEPTH_ERROR
+
+@mark.parametrize("run_script", ["vm"], indirect=True)
+def test_the_vm_runs_deep_recursion(run_script):
+    assert run_script(DEEP_RECURSION).value == 5000
@@ -0,0 +1,59 @@
+from components.wrapper import parse
+
+def values(list_):
+    return [element.value for element in list_.elements]
+
+def test_generator_bodies_only_run_as_far_as_their_values_are_used(run_script):
+    script = """
+var events = []
+func Numbers() {
+    for i = 0 ; 3 {
+        ListAppend(events, "yield")
+        yield i
+    }
+}
+for n in Numbers() {
+    ListAppend(events, n)
+}
+events
+"""
+    assert values(run_script(script)) == ["yield", 0, "yield", 1, "yield", 2]
+
+def test_return_ends_a_generator(run_script):
+    script = """
+func UpTo(n) {
+    var i = 0
+    while true {
+        if i == n { return 0 }
+        yield i
+        i += 1
+    }
+}
+ToList(UpTo(4))
+"""
+    assert values(run_script(script)) == [0, 1, 2, 3]
+
+def test_to_list_and_list_extend_take_any_iterable(run_script):
+    script = """
+func Pair() {
+    yield "a"
+    yield "b"
+}
+var out = ToList(Range(0, 2))
+ListExtend(out, Pair())
+ListExtend(out, [true])
+out
+"""
+    out = run_script(script)
+    assert values(out)[:4] == [0, 1, "a", "b"] and len(out.elements) == 5
+
+def test_yield_outside_of_a_function_is_a_syntax_error():
+    _, error = parse("<test>", "yield 1")
+    assert error.details == "'yield' outside of a function"
+
+def test_yield_is_only_expected_in_a_function_body():
+    _, error = parse("<test>", "if x 1")
+    assert error.details.startswith("Expected return, continue")
+
+    _, error = parse("<test>", "func F() {\n    if x 1\n}")
+    assert error.details.startswith("Expected return, yield, continue")
@@ -0,0 +1,32 @@
+from components.wrapper import run, parse
+from components.error import RunTimeError
+
+def test_for_each_goes_through_a_list(run_script):
+    out = run_script("var out = []\nfor x in [1, 2, 3] {\n    ListAppend(out, x * 2)\n}\nout")
+    assert [element.value for element in out.elements] == [2, 4, 6]
+
+def test_for_each_goes_through_a_range(run_script):
+    assert run_script("var total = 0\nfor i in Range(10, 0, -3) {\n    total += i\n}\ntotal").value == 10 + 7 + 4 + 1
+
+def test_for_each_continues_and_breaks(run_script):
+    script = """
+var total = 0
+for i in Range(0, 100) {
+    if i % 2 == 0 { continue }
+    if i > 7 { break }
+    total += i
+}
+total
+"""
+    assert run_script(script).value == 1 + 3 + 5 + 7
+
+def test_ranges_are_indexed_like_lists(run_script):
+    assert run_script("Range(0, 10, 2) / 3").value == 6
+
+def test_for_each_over_a_number_is_a_runtime_error():
+    _, error, _ = run("<test>", "for x in 1 { x }", "<Test>", isolated_symbol_table=True)
+    assert isinstance(error, RunTimeError)
+
+def test_in_is_a_keyword():
+    _, error = parse("<test>", "var in = 1")
+    assert error is not None
@@ -0,0 +1,27 @@
+from pytest import mark
+from components.wrapper import parse
+from components.lexer import Lexer
+from components.parser import Parser
+
+# (script, line and column the syntax error is reported at, both counted from 0)
+MULTI_STATEMENT_ERRORS = [
+    ("func f(a) { return a }\nwhile x* < 3 { x += 1 }", 1, 9),
+    ("var x = 1\nvar y = 2\nx +* y", 2, 3),
+    ("var x = 1; var y = (2\nPrint(x)", 0, 21),
+    ("func f(a) {\n    var b = a\n    return b +\n}\nf(1)", 2, 14),
+    ("Print(1)\n\n\n1 2", 3, 2),
+]
+
+def streamed_error(script: str):
+    tokens, _ = Lexer("<test>", script, False).stream_tokens()
+    return [error for _, error in Parser(tokens).statement_stream() if error][0]
+
+@mark.parametrize("script, ln, col", MULTI_STATEMENT_ERRORS)
+def test_syntax_errors_are_reported_at_the_failing_statement(script, ln, col):
+    _, error = parse("<test>", script)
+    assert (error.pos_start.ln, error.pos_start.col) == (ln, col)
+
+@mark.parametrize("script, ln, col", MULTI_STATEMENT_ERRORS)
+def test_streamed_syntax_errors_are_reported_at_the_same_place(script, ln, col):
+    error = streamed_error(script)
+    assert (error.pos_start.ln, error.pos_start.col) == (ln, col)
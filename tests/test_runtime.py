@@ -0,0 +1,13 @@
+import pytest
+from components.runtime import RunTimeSignal, ErrorSignal, ReturnSignal, ContinueSignal, BreakSignal
+
+def test_signals_give_their_result():
+    assert ErrorSignal("error").as_result().error == "error"
+    assert ReturnSignal(1).as_result().func_return_value == 1
+    assert ContinueSignal().as_result().loop_should_continue
+    assert BreakSignal().as_result().loop_should_break
+
+def test_signal_without_result_fails_when_defined():
+    with pytest.raises(TypeError):
+        class UnfinishedSignal(RunTimeSignal):
+            pass
@@ -0,0 +1,31 @@
+from pytest import mark
+from components import tiering
+
+# F records every call it gets, the counted calls show whether the right operand was evaluated
+SCRIPT = """
+var calls = []
+func F() {{
+    ListAppend(calls, 1)
+    return true
+}}
+func Check() {{
+    return {}
+}}
+for i = 0 ; 300 {{
+    Check()
+}}
+ListLen(calls)
+"""
+
+CASES = [
+    ("false && F()", 0),
+    ("true || F()", 0),
+    ("true && F()", 300),
+    ("false || F()", 300),
+]
+
+@mark.parametrize("expression, calls", CASES)
+def test_right_operand_is_only_evaluated_when_needed(run_script, expression, calls):
+    assert run_script(SCRIPT.format(expression)).value == calls
+    # Check is hot enough to run compiled when tiering is on
+    assert tiering.stats["tier_ups"] > 0 or not tiering.enabled
@@ -0,0 +1,57 @@
+from components.symbol_table import SymbolTable
+from components.datatypes.all import Number
+
+def test_exists_in_finds_symbols_of_parent_scopes():
+    parent = SymbolTable()
+    parent.set("x", Number(1), Number)
+    child = SymbolTable(SymbolTable(parent))
+
+    assert child.exists_in("x") == ("symbols", parent)
+
+def test_exists_in_skips_temporary_symbols_of_parent_scopes():
+    root = SymbolTable()
+    root.set("x", Number(1), Number)
+    parent = SymbolTable(root)
+    parent.set_as_temporary("x", Number(2), Number, 3)
+    child = SymbolTable(parent)
+
+    assert parent.exists_in("x") == ("temporary_symbols", parent)
+    assert child.exists_in("x") == ("symbols", root)
+
+    parent.set_as_temporary("y", Number(2), Number, 3)
+    assert child.exists_in("y") == (None, None)
+
+def test_temporary_symbols_of_parent_scopes_are_still_read():
+    parent = SymbolTable()
+    parent.set_as_temporary("x", Number(2), Number, 3)
+    child = SymbolTable(parent)
+
+    assert child.get("x").value == 2
+
+def test_a_variable_is_kept_behind_a_temporary_symbol_of_the_same_name():
+    symbol_table = SymbolTable()
+    symbol_table.set("z", Number(1), Number)
+    symbol_table.set_as_temporary("z", Number(7), Number, 1)
+
+    assert symbol_table.get("z").value == 1
+    assert symbol_table.get("z").value == 1
+    assert symbol_table.exists_in("z") == ("symbols", symbol_table)
+
+def test_a_variable_is_read_before_a_constant_of_the_same_name():
+    symbol_table = SymbolTable()
+    symbol_table.set("x", Number(1), Number)
+    symbol_table.set_as_immutable("x", Number(2), Number)
+
+    assert symbol_table.get("x").value == 1
+    # The constant still protects the name
+    assert symbol_table.set("x", Number(3), Number) == (False, "const")
+
+def test_a_temporary_symbol_behind_a_variable_comes_back_when_the_variable_is_removed():
+    symbol_table = SymbolTable()
+    symbol_table.set_as_temporary("t", Number(7), Number, 2)
+    symbol_table.set("t", Number(1), Number)
+
+    assert symbol_table.get("t").value == 1
+    symbol_table.remove("t")
+    assert symbol_table.get("t").value == 7
+    assert symbol_table.exists_in("t") == ("temporary_symbols", symbol_table)
@@ -0,0 +1,64 @@
+from pytest import mark
+from components import tiering
+from components.transpiler import Transpiler
+from components.wrapper import run
+
+HOT_SCRIPT = """
+func Add(a, b) {
+    return a + b
+}
+var total = 0
+for i = 0 ; 300 {
+    total = Add(total, i)
+}
+total
+"""
+
+DEOPT_SCRIPT = """
+func Add(a, b) {
+    return a + b
+}
+var total = 0
+for i = 0 ; 150 {
+    total = Add(total, i)
+}
+var text = ""
+for i = 0 ; 30 {
+    text = Add(text, "a")
+}
+ListLen(ToList(Range(0, total))) + Add(1, 1)
+"""
+
+def test_tiering_is_on_by_default():
+    assert tiering.enabled
+
+@mark.parametrize("run_script", ["tiered"], indirect=True)
+def test_hot_functions_tier_up_and_give_the_same_results(run_script):
+    assert run_script(HOT_SCRIPT).value == sum(range(300))
+    assert tiering.stats == {"tier_ups": 1, "deopts": 0}
+
+@mark.parametrize("run_script", ["tiered"], indirect=True)
+def test_calls_not_passing_numbers_deopt_then_run_the_generic_body(run_script):
+    assert run_script(DEOPT_SCRIPT).value == sum(range(150)) + 2
+
+    # Specialized to Numbers after 100 calls, then 20 deopts tier it up again to the generic body
+    assert tiering.stats == {"tier_ups": 2, "deopts": tiering.MAX_DEOPTS}
+
+def test_specialized_bodies_compute_numbers_inline():
+    def transpiled(number_fast_paths: bool):
+        script = "func Add(a, b) -> a + b * 2"
+        value, error, _ = run("<test>", script, "<Test>", isolated_symbol_table=True, engine="tree")
+        body_node = value.elements[0].body_node
+        return Transpiler(number_fast_paths).transpile(body_node, "<test>", in_program_scope=False)
+
+    assert "binary(" in transpiled(False) and ".value * " not in transpiled(False)
+    assert ".value * " in transpiled(True) and ".value + " in transpiled(True)
+
+@mark.parametrize("run_script", ["tiered"], indirect=True)
+def test_bodies_that_cant_be_transpiled_stay_in_the_tree_walker(run_script, monkeypatch):
+    def fail(*args, **kwargs):
+        raise Exception("Can't transpile")
+
+    monkeypatch.setattr(Transpiler, "transpile", fail)
+    assert run_script(HOT_SCRIPT).value == sum(range(300))
+    assert tiering.stats["tier_ups"] == 0